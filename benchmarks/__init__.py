@@ -0,0 +1 @@
+"""End-to-end benchmarks with local stand-ins for X, MCP and OpenRouter."""
@@ -0,0 +1,40 @@
+"""Fake stdio MCP server exposing ``search`` and ``fetch`` tools.
+
+Latency and result size are controlled with FAKE_MCP_LATENCY (seconds) and
+FAKE_MCP_RESULT_BYTES.
+"""
+from __future__ import annotations
+
+import os
+import time
+
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("fake-research", log_level="WARNING")
+
+_LATENCY = float(os.getenv("FAKE_MCP_LATENCY", "0"))
+_RESULT_BYTES = int(os.getenv("FAKE_MCP_RESULT_BYTES", "4000"))
+
+
+def _payload(prefix: str) -> str:
+    line = f"{prefix} https://example.com/{prefix.replace(' ', '-')} lorem ipsum dolor sit amet. "
+    repeats = max(1, _RESULT_BYTES // len(line))
+    return (line * repeats)[:_RESULT_BYTES]
+
+
+@mcp.tool()
+def search(query: str) -> str:
+    """Search the web and return result snippets."""
+    time.sleep(_LATENCY)
+    return _payload(f"result for {query}")
+
+
+@mcp.tool()
+def fetch(url: str) -> str:
+    """Fetch a web page and return its text."""
+    time.sleep(_LATENCY)
+    return _payload(f"page {url}")
+
+
+if __name__ == "__main__":
+    mcp.run()
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import json
+import re
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+FAKE_USER_ID = "4242"
+STRUCTURED_OUTPUT_TOOL = "research_output"
+
+
+@dataclass
+class FakeXConfig:
+    total_bookmarks: int
+    latency_seconds: float = 0.0
+
+
+def fake_x_transport(config: FakeXConfig) -> httpx.MockTransport:
+    """X API v2 stand-in serving /2/users/me and paginated bookmarks."""
+    base_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def _tweet(index: int, with_entities: bool) -> Dict[str, Any]:
+        text = f"Bookmark {index}: notes on model release {index % 97} https://t.co/x{index}"
+        tweet = {
+            "id": str(10_000_000 + index),
+            "text": text,
+            "author_id": str(index % 50),
+            "created_at": (base_time - timedelta(minutes=index)).isoformat(),
+        }
+        if with_entities:
+            short = f"https://t.co/x{index}"
+            tweet["entities"] = {
+                "urls": [
+                    {
+                        "start": text.index(short),
+                        "end": len(text),
+                        "url": short,
+                        "expanded_url": f"https://example.com/release-{index % 97}",
+                    }
+                ]
+            }
+        return tweet
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if config.latency_seconds:
+            time.sleep(config.latency_seconds)
+        if request.url.path == "/2/users/me":
+            return httpx.Response(200, json={"data": {"id": FAKE_USER_ID, "username": "bench"}})
+        if request.url.path == f"/2/users/{FAKE_USER_ID}/bookmarks":
+            page_size = int(request.url.params.get("max_results", "100"))
+            start = int(request.url.params.get("pagination_token", "0"))
+            end = min(start + page_size, config.total_bookmarks)
+            with_entities = "entities" in request.url.params.get("tweet.fields", "")
+            data = [_tweet(i, with_entities) for i in range(start, end)]
+            payload: Dict[str, Any] = {
+                "data": data,
+                "includes": {
+                    "users": [
+                        {"id": str(i), "username": f"user{i}", "name": f"User {i}"}
+                        for i in range(50)
+                    ]
+                },
+                "meta": {"result_count": len(data)},
+            }
+            if end < config.total_bookmarks:
+                payload["meta"]["next_token"] = str(end)
+            return httpx.Response(200, json=payload)
+        return httpx.Response(404, json={"title": "Not Found"})
+
+    return httpx.MockTransport(handler)
+
+
+def fake_link_transport() -> httpx.MockTransport:
+    """Shortlink stand-in: every t.co link redirects to an example.com page."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "t.co":
+            target = f"https://example.com/expanded{request.url.path}"
+            return httpx.Response(301, headers={"location": target})
+        return httpx.Response(200)
+
+    return httpx.MockTransport(handler)
+
+
+def fake_sites_transport(items: int = 10) -> httpx.MockTransport:
+    """Daily-site stand-in: a front page of headlines that honours If-None-Match."""
+    etag = f'"front-{items}"'
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"etag": etag})
+        links = "".join(
+            f'<h2><a href="/post-{i}">Headline {i}</a></h2>' for i in range(items)
+        )
+        return httpx.Response(
+            200,
+            headers={"etag": etag, "content-type": "text/html"},
+            text=f"<html><body>{links}</body></html>",
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@dataclass
+class FakeLLMConfig:
+    tool_calls: int
+    tokens_per_second: float = 0.0
+    tool_name: str = "search"
+    # json | fenced | truncated | prose (unparseable until asked to re-emit)
+    research_format: str = "json"
+
+
+def _research_json(tool_calls: int) -> str:
+    sources = [
+        {
+            "url": f"https://example.com/story-{i}",
+            "title": f"Story {i}",
+            "publisher": "Example",
+            "published_at": "2026-01-01",
+            "snippet": f"Snippet for story {i}.",
+        }
+        for i in range(max(1, min(tool_calls, 20)))
+    ]
+    findings = [
+        {
+            "claim": f"Claim {i}",
+            "evidence": f"Evidence {i}",
+            "confidence": "medium",
+            "sources": [source["url"]],
+        }
+        for i, source in enumerate(sources)
+    ]
+    payload = {
+        "findings": findings,
+        "sources": sources,
+        "memo_markdown": "# Memo\n\nBenchmark research memo.",
+        "missing_info": [],
+    }
+    return json.dumps(payload)
+
+
+def _research_output(config: FakeLLMConfig, messages: List[Dict[str, Any]]) -> str:
+    payload = _research_json(config.tool_calls)
+    reemit = any("Previous answer:" in str(m.get("content")) for m in messages)
+    if config.research_format == "fenced":
+        return f"Here is the research.\n```json\n{payload}\n```\nDone."
+    if config.research_format == "truncated":
+        return payload[: int(len(payload) * 0.7)]
+    if config.research_format == "prose" and not reemit:
+        return "I found several relevant stories; see the memo for details."
+    return payload
+
+
+def _verdict(messages: List[Dict[str, Any]]) -> str:
+    # Every fourth benchmark claim is reported as unsupported.
+    match = re.search(r"Claim: Claim (\d+)", json.dumps(messages))
+    index = int(match.group(1)) if match else 0
+    verdict = "unsupported" if index % 4 == 3 else "supported"
+    return json.dumps({"verdict": verdict, "rationale": "Benchmark verdict."})
+
+
+def _article() -> str:
+    return "# Benchmark Article\n\n## Summary\n\nText.\n\n## References\n\n- https://example.com/story-0\n"
+
+
+def _system_text(messages: List[Dict[str, Any]]) -> str:
+    parts = []
+    for message in messages:
+        if message.get("role") not in ("system", "developer"):
+            continue
+        content = message.get("content")
+        parts.append(content if isinstance(content, str) else json.dumps(content))
+    return "\n".join(parts)
+
+
+def fake_llm_transport(config: FakeLLMConfig) -> httpx.MockTransport:
+    """OpenAI-compatible /chat/completions stand-in.
+
+    The researcher calls ``tool_name`` until ``tool_calls`` tool results are in
+    its history, then returns research JSON; everything else gets an article.
+    Responses are delayed to emulate ``tokens_per_second`` generation speed.
+    """
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        messages = body.get("messages", [])
+        system = _system_text(messages)
+        tool_results = sum(1 for m in messages if m.get("role") == "tool")
+        tool_names = {t.get("function", {}).get("name") for t in body.get("tools", []) or []}
+
+        message: Dict[str, Any] = {"role": "assistant", "content": None}
+        research_tool_pending = (
+            "Researcher agent" in system
+            and config.tool_name in tool_names
+            and tool_results < config.tool_calls
+        )
+        if research_tool_pending or (
+            "Researcher agent" in system and STRUCTURED_OUTPUT_TOOL in tool_names
+        ):
+            # Structured-output mode "tool": the answer is a call to the schema tool.
+            name = config.tool_name if research_tool_pending else STRUCTURED_OUTPUT_TOOL
+            arguments = (
+                json.dumps({"query": f"bench query {tool_results}"})
+                if research_tool_pending
+                else _research_json(config.tool_calls)
+            )
+            message["tool_calls"] = [
+                {
+                    "id": f"call_{tool_results}",
+                    "type": "function",
+                    "function": {"name": name, "arguments": arguments},
+                }
+            ]
+            finish_reason = "tool_calls"
+            completion_text = arguments
+        else:
+            if "Researcher agent" in system:
+                content = _research_output(config, messages)
+            elif "Verifier agent" in system:
+                content = _verdict(messages)
+            else:
+                content = _article()
+            message["content"] = content
+            finish_reason = "stop"
+            completion_text = content
+
+        prompt_tokens = len(request.content) // 4
+        completion_tokens = max(1, len(completion_text) // 4)
+        if config.tokens_per_second > 0:
+            await asyncio.sleep(completion_tokens / config.tokens_per_second)
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "bench"),
+                "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+    return httpx.MockTransport(handler)
@@ -0,0 +1,153 @@
+"""Shared helpers for the benchmark and load-test drivers."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+import json
+import os
+from pathlib import Path
+import resource
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from benchmarks.fakes import (
+    FakeLLMConfig,
+    FakeXConfig,
+    fake_link_transport,
+    fake_llm_transport,
+    fake_sites_transport,
+    fake_x_transport,
+)
+from daily_research_agent.config import AgentConfig, LoadedPreset, load_config, resolve_preset
+from daily_research_agent.integrations.cassette import Cassette
+from daily_research_agent.orchestrator import HttpTransports, run_orchestrator
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(__file__).resolve().parent
+BENCH_DATE = date(2026, 1, 1)
+PRESET = "bench"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    bookmarks: int
+    tool_calls: int
+    quick: bool = False
+
+
+@dataclass(frozen=True)
+class FakeOptions:
+    x_latency: float
+    mcp_latency: float
+    mcp_result_bytes: int
+    tokens_per_second: float
+
+
+def write_bench_config(
+    workdir: Path, scenario: Scenario, options: FakeOptions, extra_toml: str = ""
+) -> Path:
+    """Write an agent config pointing at the fake MCP server under ``workdir``."""
+    mcp_args = json.dumps([str(BENCH_DIR / "fake_mcp_server.py")])
+    mcp_env = (
+        f'{{ FAKE_MCP_LATENCY = "{options.mcp_latency}", '
+        f'FAKE_MCP_RESULT_BYTES = "{options.mcp_result_bytes}" }}'
+    )
+    config_path = workdir / "agent.toml"
+    config_path.write_text(
+        f"""
+[run]
+output_dir = "./outputs"
+state_dir = "./state"
+timezone = "UTC"
+max_web_queries = {scenario.tool_calls + 5}
+
+[models]
+main = "bench/main"
+writer = "bench/writer"
+
+[prompts]
+language = "en"
+source_priority = "- Prefer primary sources."
+
+[prompts.presets.{PRESET}]
+prompt = "Write a benchmark article for {{date}}."
+
+[presets.{PRESET}]
+template = "{(REPO_ROOT / 'templates' / 'article_default.toml').as_posix()}"
+prompt_id = "{PRESET}"
+
+[sources]
+daily_sites = []
+
+[logging]
+to_stdout = false
+
+[x]
+enabled = {str(scenario.bookmarks > 0).lower()}
+bookmarks_count = {scenario.bookmarks}
+
+[x.cache]
+path = "./state/x_bookmarks_cache.sqlite"
+max_cached_posts = 20000
+
+[mcp]
+servers = [
+  {{ name = "fake", transport = "stdio", command = "{Path(sys.executable).as_posix()}", args = {mcp_args}, env = {mcp_env} }},
+]
+{extra_toml}
+""",
+        encoding="utf-8",
+    )
+    return config_path
+
+
+def bench_environment() -> None:
+    os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+    os.environ.setdefault("X_USER_ACCESS_TOKEN", "bench")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def load_bench(
+    workdir: Path, scenario: Scenario, options: FakeOptions, extra_toml: str = ""
+) -> Tuple[AgentConfig, LoadedPreset]:
+    config = load_config(write_bench_config(workdir, scenario, options, extra_toml))
+    return config, resolve_preset(config, PRESET, BENCH_DATE)
+
+
+async def run_once(
+    config: AgentConfig,
+    preset: LoadedPreset,
+    scenario: Scenario,
+    options: FakeOptions,
+    cassette: Optional[Cassette] = None,
+) -> Dict[str, Any]:
+    """Run the orchestrator once against the fakes and pull timings from run.json."""
+    transports = HttpTransports(
+        x=fake_x_transport(FakeXConfig(scenario.bookmarks, options.x_latency)),
+        llm=fake_llm_transport(FakeLLMConfig(scenario.tool_calls, options.tokens_per_second)),
+        links=fake_link_transport(),
+        sites=fake_sites_transport(),
+    )
+    started = time.perf_counter()
+    run_paths = await run_orchestrator(
+        config, preset, BENCH_DATE, cassette=cassette, transports=transports
+    )
+    wall = time.perf_counter() - started
+    metadata = json.loads(run_paths.run_json.read_text(encoding="utf-8"))
+    budgets = metadata.get("budgets", {})
+    return {
+        "wall_seconds": wall,
+        "research_seconds": budgets.get("researcher", {}).get("elapsed_seconds"),
+        "writer_seconds": budgets.get("writer", {}).get("elapsed_seconds"),
+        "researcher_tool_calls": budgets.get("researcher", {}).get("tool_calls"),
+        "input_tokens": budgets.get("researcher", {}).get("input_tokens"),
+        "bookmarks_count": metadata.get("bookmarks_count"),
+        "run_dir": str(run_paths.run_dir),
+    }
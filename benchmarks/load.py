@@ -0,0 +1,207 @@
+"""Load-test many concurrent orchestrator runs in one process.
+
+Ramps the number of concurrent ``run_orchestrator`` calls and reports, per
+level, throughput, latency percentiles, peak RSS and event-loop lag. All runs
+of a level share one config, so they contend on the same bookmark cache,
+logger and state directory the way a multi-preset process would.
+
+    uv run python -m benchmarks.load --levels 1,2,4,8,16
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from benchmarks.harness import (
+    BENCH_DIR,
+    FakeOptions,
+    Scenario,
+    bench_environment,
+    load_bench,
+    peak_rss_mb,
+    run_once,
+)
+
+DEFAULT_LEVELS = (1, 2, 4, 8, 16)
+QUICK_LEVELS = (1, 4)
+LOAD_SCENARIO = Scenario("load", bookmarks=200, tool_calls=3)
+DEFAULT_OUTPUT = BENCH_DIR / "results" / "load.json"
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def current_rss_mb() -> float:
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return peak_rss_mb()
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class LoopMonitor:
+    """Samples event-loop lag and resident memory while a level runs.
+
+    Lag is how late a ``sleep(interval)`` wakes up; anything that blocks the
+    loop (sync HTTP, SQLite, file I/O, CPU-bound parsing) shows up here.
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.lags: List[float] = []
+        self.peak_rss_mb = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+            self.peak_rss_mb = max(self.peak_rss_mb, current_rss_mb())
+
+    def summary(self) -> Dict[str, Any]:
+        def _ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            "samples": len(self.lags),
+            "p50_ms": _ms(percentile(self.lags, 0.5)),
+            "p99_ms": _ms(percentile(self.lags, 0.99)),
+            "max_ms": _ms(max(self.lags) if self.lags else None),
+        }
+
+
+async def run_level(
+    workdir: Path,
+    concurrency: int,
+    scenario: Scenario,
+    options: FakeOptions,
+    extra_toml: str = "",
+) -> Dict[str, Any]:
+    config, preset = load_bench(workdir, scenario, options, extra_toml)
+    monitor = LoopMonitor()
+    monitor.start()
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(run_once(config, preset, scenario, options) for _ in range(concurrency)),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+
+    latencies = [o["wall_seconds"] for o in outcomes if isinstance(o, dict)]
+    errors = [f"{type(o).__name__}: {o}" for o in outcomes if isinstance(o, BaseException)]
+    return {
+        "concurrency": concurrency,
+        "wall_seconds": elapsed,
+        "completed": len(latencies),
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "throughput_runs_per_minute": round(len(latencies) / elapsed * 60, 2) if elapsed else None,
+        "latency_seconds": {
+            "p50": percentile(latencies, 0.5),
+            "p90": percentile(latencies, 0.9),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies) if latencies else None,
+        },
+        "loop_lag": monitor.summary(),
+        "peak_rss_mb": round(monitor.peak_rss_mb, 1),
+    }
+
+
+def run_load(
+    levels: Sequence[int],
+    options: FakeOptions,
+    scenario: Scenario = LOAD_SCENARIO,
+    extra_toml: str = "",
+) -> Dict[str, Dict[str, Any]]:
+    """Run each concurrency level in a fresh working directory."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for concurrency in levels:
+        with tempfile.TemporaryDirectory(prefix=f"bench-load-{concurrency}-") as workdir:
+            result = asyncio.run(
+                run_level(Path(workdir), concurrency, scenario, options, extra_toml)
+            )
+        results[f"load-n{concurrency}"] = {**asdict(scenario), **result}
+        lag = result["loop_lag"]
+        print(
+            f"load-n{concurrency}: {result['wall_seconds']:.2f}s, "
+            f"{result['throughput_runs_per_minute']} runs/min, "
+            f"p50 {result['latency_seconds']['p50'] or 0:.2f}s, "
+            f"loop lag max {lag['max_ms']}ms, rss {result['peak_rss_mb']}MB, "
+            f"errors {result['errors']}",
+            flush=True,
+        )
+    return results
+
+
+def parse_levels(raw: str) -> List[int]:
+    return [int(part) for part in raw.split(",") if part.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--levels", default=",".join(str(n) for n in DEFAULT_LEVELS), help="Comma-separated N values"
+    )
+    parser.add_argument("--bookmarks", type=int, default=LOAD_SCENARIO.bookmarks)
+    parser.add_argument("--tool-calls", type=int, default=LOAD_SCENARIO.tool_calls)
+    parser.add_argument("--x-latency", type=float, default=0.0)
+    parser.add_argument("--mcp-latency", type=float, default=0.0)
+    parser.add_argument("--mcp-result-bytes", type=int, default=4000)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument(
+        "--offload-blocking",
+        action="store_true",
+        help="Set event_loop.offload_blocking so blocking work runs in a thread pool",
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    bench_environment()
+    options = FakeOptions(
+        x_latency=args.x_latency,
+        mcp_latency=args.mcp_latency,
+        mcp_result_bytes=args.mcp_result_bytes,
+        tokens_per_second=args.tokens_per_second,
+    )
+    scenario = Scenario("load", bookmarks=args.bookmarks, tool_calls=args.tool_calls)
+    extra_toml = "[event_loop]\noffload_blocking = true\n" if args.offload_blocking else ""
+    results = run_load(parse_levels(args.levels), options, scenario, extra_toml)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps({"options": asdict(options), "levels": results}, indent=2), encoding="utf-8"
+    )
+    print(f"Results written to {args.output}")
+    return 1 if any(result["errors"] for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Run the end-to-end benchmark suite and compare it with the stored baseline.
+
+Usage (from the repository root):
+
+    uv run python -m benchmarks.run                 # full matrix
+    uv run python -m benchmarks.run --quick         # smallest scenarios only
+    uv run python -m benchmarks.run --update-baseline
+
+The concurrency scaling curve from ``benchmarks.load`` is part of the suite;
+its levels are compared on batch wall time like the other scenarios.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.harness import (
+    BENCH_DATE,
+    BENCH_DIR,
+    PRESET,
+    FakeOptions,
+    Scenario,
+    bench_environment,
+    load_bench,
+    peak_rss_mb,
+    run_once,
+    write_bench_config,
+)
+from benchmarks.load import DEFAULT_LEVELS, QUICK_LEVELS, parse_levels, run_load
+from daily_research_agent.integrations.cassette import CASSETTE_FILENAME, Cassette
+
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_OUTPUT = BENCH_DIR / "results" / "latest.json"
+
+SCENARIOS = [
+    Scenario("x10-tools1", bookmarks=10, tool_calls=1, quick=True),
+    Scenario("x10-tools50", bookmarks=10, tool_calls=50, quick=True),
+    Scenario("x1k-tools10", bookmarks=1_000, tool_calls=10),
+    Scenario("x20k-tools1", bookmarks=20_000, tool_calls=1),
+    Scenario("x20k-tools50", bookmarks=20_000, tool_calls=50),
+]
+
+
+def _summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    walls = [sample["wall_seconds"] for sample in samples]
+    last = samples[-1]
+    return {
+        "wall_seconds": statistics.median(walls),
+        "wall_seconds_min": min(walls),
+        "wall_seconds_max": max(walls),
+        "research_seconds": last["research_seconds"],
+        "writer_seconds": last["writer_seconds"],
+        "researcher_tool_calls": last["researcher_tool_calls"],
+        "input_tokens": last["input_tokens"],
+        "bookmarks_count": last["bookmarks_count"],
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "repeats": len(samples),
+    }
+
+
+def run_cli_replay(scenario: Scenario, options: FakeOptions) -> Dict[str, Any]:
+    """Record one run in-process, then time the CLI replaying it in a subprocess."""
+    with tempfile.TemporaryDirectory(prefix="bench-record-") as record_dir:
+        cassette = Cassette.recorder(preset=PRESET, date=BENCH_DATE.isoformat())
+        result = asyncio.run(
+            run_once(*load_bench(Path(record_dir), scenario, options), scenario, options, cassette)
+        )
+        cassette_path = Path(result["run_dir"]) / CASSETTE_FILENAME
+
+        with tempfile.TemporaryDirectory(prefix="bench-replay-") as replay_dir:
+            config_path = write_bench_config(Path(replay_dir), scenario, options)
+            command = [
+                sys.executable,
+                "-m",
+                "daily_research_agent.cli",
+                "run",
+                "--preset",
+                PRESET,
+                "--date",
+                BENCH_DATE.isoformat(),
+                "--config",
+                str(config_path),
+                "--replay",
+                str(cassette_path),
+            ]
+            started = time.perf_counter()
+            completed = subprocess.run(command, capture_output=True, text=True, cwd=replay_dir)
+            wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"CLI replay failed: {completed.stderr.strip()}")
+    return {"wall_seconds": wall, "repeats": 1}
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], tolerance: float
+) -> List[Dict[str, Any]]:
+    comparisons = []
+    for name, result in results.items():
+        expected = baseline.get("scenarios", {}).get(name, {}).get("wall_seconds")
+        if expected is None:
+            comparisons.append({"scenario": name, "status": "new"})
+            continue
+        ratio = result["wall_seconds"] / expected if expected else float("inf")
+        comparisons.append(
+            {
+                "scenario": name,
+                "baseline_seconds": expected,
+                "current_seconds": result["wall_seconds"],
+                "ratio": round(ratio, 3),
+                "status": "regression" if ratio > 1 + tolerance else "ok",
+            }
+        )
+    return comparisons
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="Run only the smallest scenarios")
+    parser.add_argument("--scenario", action="append", help="Run only the named scenario(s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per scenario")
+    parser.add_argument("--skip-cli", action="store_true", help="Skip the CLI replay scenario")
+    parser.add_argument("--skip-load", action="store_true", help="Skip the concurrency scaling curve")
+    parser.add_argument("--load-levels", help="Comma-separated concurrency levels for the load curve")
+    parser.add_argument("--x-latency", type=float, default=0.0, help="Fake X latency per request (s)")
+    parser.add_argument("--mcp-latency", type=float, default=0.0, help="Fake MCP latency per call (s)")
+    parser.add_argument("--mcp-result-bytes", type=int, default=4000, help="Fake MCP result size")
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=0.0, help="Fake LLM speed (0 = instant)"
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown ratio")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    bench_environment()
+    options = FakeOptions(
+        x_latency=args.x_latency,
+        mcp_latency=args.mcp_latency,
+        mcp_result_bytes=args.mcp_result_bytes,
+        tokens_per_second=args.tokens_per_second,
+    )
+    scenarios = [s for s in SCENARIOS if not args.quick or s.quick]
+    if args.scenario:
+        scenarios = [s for s in SCENARIOS if s.name in args.scenario]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for scenario in scenarios:
+        samples = []
+        for _ in range(max(1, args.repeat)):
+            with tempfile.TemporaryDirectory(prefix=f"bench-{scenario.name}-") as workdir:
+                config, preset = load_bench(Path(workdir), scenario, options)
+                samples.append(asyncio.run(run_once(config, preset, scenario, options)))
+        results[scenario.name] = {**asdict(scenario), **_summarize(samples)}
+        print(f"{scenario.name}: {results[scenario.name]['wall_seconds']:.3f}s", flush=True)
+
+    if not args.skip_cli and not args.scenario:
+        results["cli-replay"] = run_cli_replay(SCENARIOS[0], options)
+        print(f"cli-replay: {results['cli-replay']['wall_seconds']:.3f}s", flush=True)
+
+    if not args.skip_load and not args.scenario:
+        if args.load_levels:
+            levels = parse_levels(args.load_levels)
+        else:
+            levels = QUICK_LEVELS if args.quick else DEFAULT_LEVELS
+        results.update(run_load(levels, options))
+
+    baseline: Dict[str, Any] = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    comparisons = compare(results, baseline, args.tolerance)
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": asdict(options),
+        "scenarios": results,
+        "comparison": comparisons,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {args.output}")
+
+    for item in comparisons:
+        if item["status"] == "new":
+            print(f"  {item['scenario']}: no baseline")
+        else:
+            print(
+                f"  {item['scenario']}: {item['current_seconds']:.3f}s vs "
+                f"{item['baseline_seconds']:.3f}s (x{item['ratio']}) {item['status']}"
+            )
+
+    if args.update_baseline:
+        merged = {**baseline.get("scenarios", {}), **results}
+        args.baseline.write_text(
+            json.dumps(
+                {"generated_at": report["generated_at"], "platform": report["platform"], "scenarios": merged},
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        print(f"Baseline updated: {args.baseline}")
+
+    regressions = [item for item in comparisons if item["status"] == "regression"]
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+SNIPPET_TOKENS = 16
+# The trigram tokenizer can't match terms shorter than three characters.
+MIN_MATCH_CHARS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    preset TEXT,
+    date TEXT,
+    article_path TEXT,
+    run_json_mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    preset TEXT,
+    date TEXT,
+    kind TEXT NOT NULL,
+    url TEXT,
+    title TEXT,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_run ON documents (run_id);
+CREATE INDEX IF NOT EXISTS documents_preset_date ON documents (preset, date);
+CREATE INDEX IF NOT EXISTS documents_date ON documents (date);
+CREATE TABLE IF NOT EXISTS document_domains (
+    document_id INTEGER NOT NULL,
+    domain TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS document_domains_domain ON document_domains (domain);
+CREATE INDEX IF NOT EXISTS document_domains_document ON document_domains (document_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body, content='documents', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, body)
+    VALUES ('delete', old.id, old.title, old.body);
+    DELETE FROM document_domains WHERE document_id = old.id;
+END;
+"""
+
+
+def url_domain(url: str) -> Optional[str]:
+    host = (urlsplit(url).hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host or None
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    run_id: str
+    preset: Optional[str]
+    date: Optional[str]
+    kind: str
+    url: Optional[str]
+    title: str
+    snippet: str
+
+
+class ResearchIndex:
+    """Full-text index over past runs' sources, findings and research memos.
+
+    Each run directory is ingested as a unit; re-ingesting a run replaces its
+    documents, and ``reindex`` skips runs whose run.json hasn't changed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def ingest_run(self, run_dir: Path) -> int:
+        """Index one run directory; returns the number of documents written."""
+        conn = self._connect()
+        try:
+            with conn:
+                return self._ingest(conn, run_dir)
+        finally:
+            conn.close()
+
+    def reindex(self, output_dir: Path, full: bool = False) -> Dict[str, int]:
+        stats = {"runs": 0, "skipped": 0, "documents": 0}
+        conn = self._connect()
+        try:
+            if full:
+                with conn:
+                    conn.execute("DELETE FROM documents")
+                    conn.execute("DELETE FROM runs")
+            known = dict(conn.execute("SELECT run_id, run_json_mtime FROM runs"))
+            for run_json in sorted((output_dir / "runs").glob("*/run.json")):
+                run_dir = run_json.parent
+                if known.get(run_dir.name) == run_json.stat().st_mtime:
+                    stats["skipped"] += 1
+                    continue
+                with conn:
+                    stats["documents"] += self._ingest(conn, run_dir)
+                stats["runs"] += 1
+        finally:
+            conn.close()
+        return stats
+
+    def _ingest(self, conn: sqlite3.Connection, run_dir: Path) -> int:
+        run_json = run_dir / "run.json"
+        meta = _load_json(run_json) or {}
+        run_id = meta.get("run_id") or run_dir.name
+        preset = meta.get("preset")
+        run_date = meta.get("date")
+
+        conn.execute("DELETE FROM documents WHERE run_id = ?", (run_id,))
+        conn.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)",
+            (run_id, preset, run_date, meta.get("article_path"), run_json.stat().st_mtime),
+        )
+
+        documents: List[Tuple[str, Optional[str], str, str, List[str]]] = []
+        for source in _load_json(run_dir / "sources.json") or []:
+            url = source.get("url")
+            if not url:
+                continue
+            body = " ".join(
+                part for part in (source.get("publisher"), source.get("snippet")) if part
+            )
+            urls = [url, *(source.get("mirrors") or [])]
+            documents.append(("source", url, source.get("title") or url, body, urls))
+        for finding in _load_json(run_dir / "findings.json") or []:
+            refs = list(finding.get("sources") or [])
+            documents.append(
+                (
+                    "finding",
+                    refs[0] if refs else None,
+                    finding.get("claim", ""),
+                    finding.get("evidence") or "",
+                    refs,
+                )
+            )
+        memo_path = run_dir / "research.md"
+        if memo_path.exists():
+            memo = memo_path.read_text(encoding="utf-8")
+            if memo.strip():
+                documents.append(("memo", None, _memo_title(memo, preset, run_date), memo, []))
+
+        for kind, url, title, body, urls in documents:
+            cursor = conn.execute(
+                "INSERT INTO documents (run_id, preset, date, kind, url, title, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, preset, run_date, kind, url, title, body),
+            )
+            domains = {domain for domain in map(url_domain, urls) if domain}
+            conn.executemany(
+                "INSERT INTO document_domains VALUES (?, ?)",
+                [(cursor.lastrowid, domain) for domain in sorted(domains)],
+            )
+        return len(documents)
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        preset: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        domain: Optional[str] = None,
+        kind: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[SearchHit]:
+        """Query the index; every filter is optional and they combine with AND.
+
+        ``since``/``until`` are inclusive ISO dates; ``domain`` also matches
+        subdomains. Results with text are ranked by BM25, otherwise newest first.
+        """
+        if not self.path.exists():
+            return []
+        clauses: List[str] = []
+        params: List[Any] = []
+        match_expr, like_terms = _split_query(text)
+        for term in like_terms:
+            clauses.append("(d.title LIKE ? OR d.body LIKE ?)")
+            params.extend([f"%{term}%", f"%{term}%"])
+        if preset:
+            clauses.append("d.preset = ?")
+            params.append(preset)
+        if since:
+            clauses.append("d.date >= ?")
+            params.append(since)
+        if until:
+            clauses.append("d.date <= ?")
+            params.append(until)
+        if kind:
+            clauses.append("d.kind = ?")
+            params.append(kind)
+        if domain:
+            domain = domain.lower().removeprefix("www.")
+            clauses.append(
+                "d.id IN (SELECT document_id FROM document_domains "
+                "WHERE domain = ? OR domain LIKE ?)"
+            )
+            params.extend([domain, f"%.{domain}"])
+
+        where = " AND ".join(clauses) or "1"
+        if match_expr:
+            sql = (
+                "SELECT d.run_id, d.preset, d.date, d.kind, d.url, d.title, "
+                f"snippet(documents_fts, 1, '[', ']', '…', {SNIPPET_TOKENS}) "
+                "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+                f"WHERE documents_fts MATCH ? AND {where} "
+                "ORDER BY bm25(documents_fts), d.date DESC LIMIT ?"
+            )
+            params = [match_expr, *params, limit]
+        else:
+            sql = (
+                "SELECT d.run_id, d.preset, d.date, d.kind, d.url, d.title, "
+                "substr(d.body, 1, 160) "
+                f"FROM documents d WHERE {where} ORDER BY d.date DESC, d.id DESC LIMIT ?"
+            )
+            params.append(limit)
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        return [SearchHit(*row) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        if not self.path.exists():
+            return {"runs": 0, "documents": 0}
+        conn = self._connect()
+        try:
+            runs = conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+            documents = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        finally:
+            conn.close()
+        return {"runs": runs, "documents": documents}
+
+
+def _split_query(text: Optional[str]) -> Tuple[Optional[str], List[str]]:
+    """FTS5 MATCH expression for long terms, plain LIKE terms for short ones."""
+    if not text or not text.strip():
+        return None, []
+    terms = [term for term in re.split(r"\s+", text.strip()) if term]
+    phrases = [term for term in terms if len(term) >= MIN_MATCH_CHARS]
+    short = [term for term in terms if len(term) < MIN_MATCH_CHARS]
+    match_expr = " AND ".join('"' + term.replace('"', '""') + '"' for term in phrases)
+    return match_expr or None, short
+
+
+def _memo_title(memo: str, preset: Optional[str], run_date: Optional[str]) -> str:
+    for line in memo.splitlines():
+        if line.startswith("#"):
+            return line.lstrip("#").strip()
+    return f"Research memo {preset or ''} {run_date or ''}".strip()
+
+
+def _load_json(path: Path) -> Any:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return None
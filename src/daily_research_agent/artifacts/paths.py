@@ -17,8 +17,10 @@ class RunPaths:
     run_json: Path
     research_md: Path
     sources_json: Path
+    findings_json: Path
     bookmarks_json: Path
     log_file: Path
+    tool_outputs_dir: Path
 
 
 _SLUG_RE = re.compile(r"[^a-z0-9]+")
@@ -55,8 +57,10 @@ def build_run_paths(
         run_json=run_dir / "run.json",
         research_md=run_dir / "research.md",
         sources_json=run_dir / "sources.json",
+        findings_json=run_dir / "findings.json",
         bookmarks_json=run_dir / "bookmarks.json",
         log_file=run_dir / "app.log",
+        tool_outputs_dir=run_dir / "tool_outputs",
     )
 
 
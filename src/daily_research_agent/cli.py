@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from dataclasses import asdict, replace
 import json
 from datetime import date, datetime
 from pathlib import Path
@@ -9,8 +10,13 @@ import sys
 import typer
 from dotenv import load_dotenv
 
+from daily_research_agent.artifacts.index import ResearchIndex
 from daily_research_agent.config import ConfigError, load_config, resolve_preset
+from daily_research_agent.integrations.cassette import Cassette, CassetteError
+from daily_research_agent.integrations.mcp_health import load_health_store
+from daily_research_agent.integrations.x_bookmarks import search_cached_bookmarks
 from daily_research_agent.orchestrator import OrchestratorError, run_orchestrator
+from daily_research_agent.pipeline.profiling import PROFILE_MODES
 from daily_research_agent.tools.x_oauth import (
     XOAuthError,
     build_authorize_url,
@@ -36,17 +42,55 @@ def run(
     config_path: Path = typer.Option(
         Path("./configs/agent.toml"), "--config", help="Path to agent config TOML"
     ),
+    deadline_seconds: float = typer.Option(
+        None,
+        "--deadline-seconds",
+        help="Overall run deadline in seconds (overrides run.deadline_seconds; 0 disables)",
+    ),
+    record: bool = typer.Option(
+        False, "--record", help="Record LLM, MCP and X traffic into the run's cassette"
+    ),
+    replay: Path = typer.Option(
+        None, "--replay", help="Serve LLM, MCP and X traffic from a recorded cassette"
+    ),
+    replay_latency: bool = typer.Option(
+        False, "--replay-latency", help="Sleep for the recorded latency when replaying"
+    ),
+    profile: str = typer.Option(
+        None,
+        "--profile",
+        help="Profile each stage: cpu (cProfile), mem (tracemalloc) or all",
+    ),
 ) -> None:
     load_dotenv()
+    if record and replay:
+        typer.echo("Error: --record and --replay cannot be combined.", err=True)
+        raise typer.Exit(code=1)
+    if profile is not None and profile not in PROFILE_MODES:
+        typer.echo(f"Error: --profile must be one of {', '.join(PROFILE_MODES)}.", err=True)
+        raise typer.Exit(code=1)
     try:
         config = load_config(config_path)
+        if deadline_seconds is not None:
+            config = replace(
+                config, run=replace(config.run, deadline_seconds=deadline_seconds)
+            )
         if run_date:
             article_date = datetime.strptime(run_date, "%Y-%m-%d").date()
         else:
             article_date = date.today()
         preset_loaded = resolve_preset(config, preset, article_date)
-        asyncio.run(run_orchestrator(config, preset_loaded, article_date))
-    except (ConfigError, OrchestratorError, ValueError) as exc:
+        cassette = None
+        if replay:
+            cassette = Cassette.load(replay, simulate_latency=replay_latency)
+        elif record:
+            cassette = Cassette.recorder(preset=preset, date=article_date.isoformat())
+        asyncio.run(
+            run_orchestrator(
+                config, preset_loaded, article_date, cassette=cassette, profile=profile
+            )
+        )
+    except (ConfigError, OrchestratorError, CassetteError, ValueError) as exc:
         typer.echo(f"Error: {exc}", err=True)
         raise typer.Exit(code=1)
 
@@ -179,6 +223,172 @@ def x_refresh(
     typer.echo(str(token_path))
     typer.echo(json.dumps(token_payload, ensure_ascii=False, indent=2))
 
+
+@app.command("mcp-status")
+def mcp_status(
+    config_path: Path = typer.Option(
+        Path("./configs/agent.toml"), "--config", help="Path to agent config TOML"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the raw health state as JSON"),
+) -> None:
+    try:
+        config = load_config(config_path)
+    except ConfigError as exc:
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(code=1)
+
+    store = load_health_store(config.run.state_dir, config.mcp.circuit_breaker)
+    configured = [server.name for server in config.mcp.servers]
+    names = configured + sorted(set(store.servers) - set(configured))
+    if as_json:
+        typer.echo(
+            json.dumps(
+                {name: asdict(store.get(name)) for name in names},
+                ensure_ascii=False,
+                indent=2,
+            )
+        )
+        return
+
+    if not names:
+        typer.echo("No MCP servers configured or recorded.")
+        return
+
+    def _fmt_seconds(value: float | None) -> str:
+        if value is None:
+            return "-"
+        return ">60s" if value == float("inf") else f"<={value:g}s"
+
+    typer.echo(f"Health file: {store.path}")
+    for name in names:
+        health = store.get(name)
+        typer.echo(
+            f"{name}: state={health.state} ok={health.successes} failed={health.failures} "
+            f"consecutive_failures={health.consecutive_failures} "
+            f"connect_p50={_fmt_seconds(health.connect_latency.quantile(0.5))} "
+            f"call_p50={_fmt_seconds(health.call_latency.quantile(0.5))} "
+            f"call_p95={_fmt_seconds(health.call_latency.quantile(0.95))}"
+        )
+        if health.state != "closed" and health.opened_at:
+            reopen_at = datetime.fromtimestamp(health.opened_at + store.cooldown_seconds)
+            typer.echo(f"  circuit half-opens at {reopen_at.isoformat(timespec='seconds')}")
+        if health.last_error:
+            typer.echo(f"  last_error: {health.last_error}")
+
+
+@app.command("reindex")
+def reindex(
+    config_path: Path = typer.Option(
+        Path("./configs/agent.toml"), "--config", help="Path to agent config TOML"
+    ),
+    full: bool = typer.Option(
+        False, "--full", help="Drop the index and rebuild it from every run directory"
+    ),
+) -> None:
+    try:
+        config = load_config(config_path)
+    except ConfigError as exc:
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(code=1)
+
+    index = ResearchIndex(config.index.path)
+    stats = index.reindex(config.run.output_dir, full=full)
+    totals = index.stats()
+    typer.echo(
+        f"Indexed {stats['runs']} runs ({stats['documents']} documents), "
+        f"skipped {stats['skipped']} unchanged. "
+        f"Index now holds {totals['runs']} runs / {totals['documents']} documents: {index.path}"
+    )
+
+
+@app.command("search")
+def search(
+    query: str = typer.Argument(None, help="Full-text query (all terms must match)"),
+    config_path: Path = typer.Option(
+        Path("./configs/agent.toml"), "--config", help="Path to agent config TOML"
+    ),
+    preset: str = typer.Option(None, "--preset", help="Only runs of this preset"),
+    since: str = typer.Option(None, "--since", help="Earliest article date (YYYY-MM-DD)"),
+    until: str = typer.Option(None, "--until", help="Latest article date (YYYY-MM-DD)"),
+    domain: str = typer.Option(None, "--domain", help="Source domain, including subdomains"),
+    kind: str = typer.Option(None, "--kind", help="source, finding or memo"),
+    limit: int = typer.Option(20, "--limit", help="Maximum number of results"),
+    as_json: bool = typer.Option(False, "--json", help="Print results as JSON"),
+) -> None:
+    try:
+        config = load_config(config_path)
+        for value in (since, until):
+            if value:
+                datetime.strptime(value, "%Y-%m-%d")
+    except (ConfigError, ValueError) as exc:
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(code=1)
+
+    hits = ResearchIndex(config.index.path).search(
+        query, preset=preset, since=since, until=until, domain=domain, kind=kind, limit=limit
+    )
+    if as_json:
+        typer.echo(json.dumps([asdict(hit) for hit in hits], ensure_ascii=False, indent=2))
+        return
+    if not hits:
+        typer.echo("No matches.")
+        return
+    for hit in hits:
+        typer.echo(f"{hit.date or '-'}  {hit.preset or '-'}  {hit.kind}  {hit.title}")
+        if hit.url:
+            typer.echo(f"    {hit.url}")
+        snippet = " ".join(hit.snippet.split())
+        if snippet:
+            typer.echo(f"    {snippet}")
+
+
+@app.command("x-search")
+def x_search(
+    query: str = typer.Argument(None, help="Full-text query (all terms must match)"),
+    config_path: Path = typer.Option(
+        Path("./configs/agent.toml"), "--config", help="Path to agent config TOML"
+    ),
+    author: list[str] = typer.Option(
+        None, "--author", help="Author username (repeat for several)"
+    ),
+    since: str = typer.Option(None, "--since", help="Earliest post date (YYYY-MM-DD)"),
+    until: str = typer.Option(None, "--until", help="Latest post date (YYYY-MM-DD)"),
+    limit: int = typer.Option(20, "--limit", help="Maximum number of results"),
+    as_json: bool = typer.Option(False, "--json", help="Print results as JSON"),
+) -> None:
+    try:
+        config = load_config(config_path)
+        for value in (since, until):
+            if value:
+                datetime.strptime(value, "%Y-%m-%d")
+    except (ConfigError, ValueError) as exc:
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(code=1)
+    if not config.x.cache.path.exists():
+        typer.echo(f"Error: bookmark cache not found: {config.x.cache.path}", err=True)
+        raise typer.Exit(code=1)
+
+    posts = search_cached_bookmarks(
+        str(config.x.cache.path),
+        query,
+        authors=author or None,
+        since=since,
+        until=until,
+        limit=limit,
+    )
+    if as_json:
+        typer.echo(json.dumps([asdict(post) for post in posts], ensure_ascii=False, indent=2))
+        return
+    if not posts:
+        typer.echo("No matches.")
+        return
+    for post in posts:
+        typer.echo(f"{post.created_at[:10]}  @{post.author_username}  {post.url}")
+        text = " ".join(post.text.split())
+        if text:
+            typer.echo(f"    {text}")
+
+
 def main() -> None:
     app()
 
@@ -1,12 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 import os
 import tomllib
 
+from daily_research_agent.artifacts.paths import slugify
+
+
+# Fractions of run.deadline_seconds per stage. The researcher gets whatever is
+# left once the finalize and writer shares are reserved.
+DEFAULT_DEADLINE_SHARES: Dict[str, float] = {
+    "x": 0.1,
+    "mcp": 0.1,
+    "finalize": 0.05,
+    "verify": 0.1,
+    "writer": 0.3,
+}
+
+RESEARCH_OUTPUT_MODES = ("text", "auto", "native", "tool")
+
 
 @dataclass(frozen=True)
 class RunSettings:
@@ -15,6 +30,8 @@ class RunSettings:
     max_web_queries: int
     include_run_artifacts: bool
     state_dir: Path
+    deadline_seconds: float
+    deadline_shares: Dict[str, float]
 
 
 @dataclass(frozen=True)
@@ -32,15 +49,40 @@ class PromptsConfig:
     presets: Dict[str, Dict[str, str]]
 
 
+@dataclass(frozen=True)
+class PresetBookmarksConfig:
+    keywords: List[str] = field(default_factory=list)
+    authors: List[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class PresetOutputConfig:
+    name: str
+    template: Optional[Path] = None
+    language: Optional[str] = None
+    writer_model: Optional[str] = None
+
+
 @dataclass(frozen=True)
 class PresetConfig:
     template: Path
     prompt_id: str
+    bookmarks: PresetBookmarksConfig
+    outputs: List[PresetOutputConfig]
+
+
+@dataclass(frozen=True)
+class DailySitesPrefetchConfig:
+    enabled: bool
+    concurrency: int
+    timeout_seconds: float
+    max_items_per_site: int
 
 
 @dataclass(frozen=True)
 class SourcesConfig:
     daily_sites: List[str]
+    prefetch: DailySitesPrefetchConfig
 
 
 @dataclass(frozen=True)
@@ -49,6 +91,9 @@ class LoggingConfig:
     format: str
     to_stdout: bool
     to_file: bool
+    max_bytes: int
+    backup_count: int
+    queue_size: int
 
 
 @dataclass(frozen=True)
@@ -64,6 +109,30 @@ class XQuoteConfig:
     resolve_depth: int
 
 
+@dataclass(frozen=True)
+class XRankingConfig:
+    enabled: bool
+    recency_half_life_days: float
+    recency_weight: float
+    k1: float
+    b: float
+    max_query_terms: int
+
+
+@dataclass(frozen=True)
+class XClusteringConfig:
+    enabled: bool
+    similarity_threshold: float
+    max_posts: int
+
+
+@dataclass(frozen=True)
+class XLinksConfig:
+    resolve: bool
+    concurrency: int
+    timeout_seconds: float
+
+
 @dataclass(frozen=True)
 class XConfig:
     enabled: bool
@@ -71,6 +140,9 @@ class XConfig:
     usage_policy: str
     cache: XCacheConfig
     quote: XQuoteConfig
+    ranking: XRankingConfig
+    clustering: XClusteringConfig
+    links: XLinksConfig
 
 
 @dataclass(frozen=True)
@@ -83,9 +155,21 @@ class MCPServerConfig:
     env: Optional[Dict[str, str]] = None
 
 
+@dataclass(frozen=True)
+class MCPCircuitBreakerConfig:
+    enabled: bool
+    failure_threshold: int
+    cooldown_minutes: float
+
+
 @dataclass(frozen=True)
 class MCPConfig:
     servers: List[MCPServerConfig]
+    connect_timeout_seconds: float
+    tool_cache: bool
+    tool_cache_ttl_hours: float
+    lazy_stdio: bool
+    circuit_breaker: MCPCircuitBreakerConfig
 
 
 @dataclass(frozen=True)
@@ -99,6 +183,92 @@ class ObservabilityConfig:
     langsmith: LangSmithConfig
 
 
+@dataclass(frozen=True)
+class StageBudgetConfig:
+    max_tool_calls: int
+    max_tokens: int
+    max_seconds: float
+
+
+@dataclass(frozen=True)
+class BudgetsConfig:
+    tool_call_timeout_seconds: float
+    researcher: StageBudgetConfig
+    writer: StageBudgetConfig
+    verifier: StageBudgetConfig
+
+
+@dataclass(frozen=True)
+class ToolOutputConfig:
+    max_bytes: int
+    preview_bytes: int
+    spill: bool
+
+
+@dataclass(frozen=True)
+class EventLoopConfig:
+    watchdog: bool
+    lag_threshold_ms: float
+    check_interval_ms: float
+    offload_blocking: bool
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    enabled: bool
+    textfile_path: Optional[Path]
+    http_host: str
+    http_port: int
+    persist: bool
+
+
+@dataclass(frozen=True)
+class ResearchConfig:
+    # text | auto | native | tool
+    output_mode: str
+
+
+@dataclass(frozen=True)
+class DedupConfig:
+    enabled: bool
+    simhash_max_distance: int
+    min_tokens: int
+
+
+@dataclass(frozen=True)
+class NoveltyConfig:
+    enabled: bool
+    window_days: int
+    filter_bookmarks: bool
+    drop_seen_findings: bool
+    max_covered_items: int
+
+
+@dataclass(frozen=True)
+class ReuseConfig:
+    enabled: bool
+    ttl_days: float
+    max_findings: int
+
+
+@dataclass(frozen=True)
+class VerifierConfig:
+    enabled: bool
+    concurrency: int
+    check_timeout_seconds: float
+    cache: bool
+    cache_ttl_days: float
+    max_checks: int
+    drop_unsupported: bool
+    fetch_tool: str
+
+
+@dataclass(frozen=True)
+class IndexConfig:
+    enabled: bool
+    path: Path
+
+
 @dataclass(frozen=True)
 class AgentConfig:
     run: RunSettings
@@ -110,6 +280,16 @@ class AgentConfig:
     x: XConfig
     mcp: MCPConfig
     observability: ObservabilityConfig
+    budgets: BudgetsConfig
+    tool_output: ToolOutputConfig
+    event_loop: EventLoopConfig
+    metrics: MetricsConfig
+    research: ResearchConfig
+    dedup: DedupConfig
+    novelty: NoveltyConfig
+    reuse: ReuseConfig
+    verifier: VerifierConfig
+    index: IndexConfig
 
 
 @dataclass(frozen=True)
@@ -117,6 +297,8 @@ class LoadedPreset:
     name: str
     prompt: str
     template_path: Path
+    bookmarks: PresetBookmarksConfig = field(default_factory=PresetBookmarksConfig)
+    outputs: List[PresetOutputConfig] = field(default_factory=list)
 
 
 class ConfigError(RuntimeError):
@@ -155,6 +337,29 @@ def _parse_mcp_servers(raw: List[Dict[str, Any]]) -> List[MCPServerConfig]:
     return servers
 
 
+def _parse_stage_budget(raw: Dict[str, Any], default_tool_calls: int) -> StageBudgetConfig:
+    return StageBudgetConfig(
+        max_tool_calls=int(raw.get("max_tool_calls", default_tool_calls)),
+        max_tokens=int(raw.get("max_tokens", 0)),
+        max_seconds=float(raw.get("max_seconds", 0)),
+    )
+
+
+def _check_output_names(preset_name: str, output_names: List[str]) -> None:
+    # Output names end up in article file names; two that slugify alike
+    # (including non-ASCII names, which all become "article") would overwrite
+    # each other's article.
+    seen: Dict[str, str] = {}
+    for output_name in output_names:
+        slug = slugify(output_name)
+        if slug in seen:
+            raise ConfigError(
+                f"presets.{preset_name}.outputs: {seen[slug]!r} and {output_name!r} "
+                f"would share the article file name suffix {slug!r}"
+            )
+        seen[slug] = output_name
+
+
 def load_config(path: str | Path) -> AgentConfig:
     config_path = _to_path(path)
     if not config_path.exists():
@@ -171,6 +376,11 @@ def load_config(path: str | Path) -> AgentConfig:
         max_web_queries=int(run.get("max_web_queries", 20)),
         include_run_artifacts=bool(run.get("include_run_artifacts", True)),
         state_dir=_resolve_path(_to_path(run.get("state_dir", "./state")), base_dir),
+        deadline_seconds=float(run.get("deadline_seconds", 0)),
+        deadline_shares={
+            **DEFAULT_DEADLINE_SHARES,
+            **{k: float(v) for k, v in run.get("deadline_shares", {}).items()},
+        },
     )
 
     models = data.get("models", {})
@@ -192,16 +402,44 @@ def load_config(path: str | Path) -> AgentConfig:
     raw_presets = data.get("presets", {})
     presets_config: Dict[str, PresetConfig] = {}
     for name, preset in raw_presets.items():
+        bookmarks_cfg = preset.get("bookmarks", {})
+        _check_output_names(name, list(preset.get("outputs", {})))
         presets_config[name] = PresetConfig(
             template=_resolve_path(
                 _to_path(_require(preset.get("template"), f"presets.{name}.template")),
                 base_dir,
             ),
             prompt_id=_require(preset.get("prompt_id"), f"presets.{name}.prompt_id"),
+            bookmarks=PresetBookmarksConfig(
+                keywords=[str(item) for item in bookmarks_cfg.get("keywords", [])],
+                authors=[str(item) for item in bookmarks_cfg.get("authors", [])],
+            ),
+            outputs=[
+                PresetOutputConfig(
+                    name=output_name,
+                    template=(
+                        _resolve_path(_to_path(output["template"]), base_dir)
+                        if output.get("template")
+                        else None
+                    ),
+                    language=output.get("language"),
+                    writer_model=output.get("writer_model"),
+                )
+                for output_name, output in preset.get("outputs", {}).items()
+            ],
         )
 
     sources = data.get("sources", {})
-    sources_config = SourcesConfig(daily_sites=list(sources.get("daily_sites", [])))
+    prefetch_cfg = sources.get("prefetch", {})
+    sources_config = SourcesConfig(
+        daily_sites=list(sources.get("daily_sites", [])),
+        prefetch=DailySitesPrefetchConfig(
+            enabled=bool(prefetch_cfg.get("enabled", False)),
+            concurrency=int(prefetch_cfg.get("concurrency", 8)),
+            timeout_seconds=float(prefetch_cfg.get("timeout_seconds", 10)),
+            max_items_per_site=int(prefetch_cfg.get("max_items_per_site", 20)),
+        ),
+    )
 
     logging_cfg = data.get("logging", {})
     logging_config = LoggingConfig(
@@ -209,11 +447,17 @@ def load_config(path: str | Path) -> AgentConfig:
         format=logging_cfg.get("format", "json"),
         to_stdout=bool(logging_cfg.get("to_stdout", True)),
         to_file=bool(logging_cfg.get("to_file", True)),
+        max_bytes=int(logging_cfg.get("max_bytes", 10_000_000)),
+        backup_count=int(logging_cfg.get("backup_count", 3)),
+        queue_size=int(logging_cfg.get("queue_size", 10_000)),
     )
 
     x_cfg = data.get("x", {})
     x_cache_cfg = x_cfg.get("cache", {})
     x_quote_cfg = x_cfg.get("quote", {})
+    x_ranking_cfg = x_cfg.get("ranking", {})
+    x_clustering_cfg = x_cfg.get("clustering", {})
+    x_links_cfg = x_cfg.get("links", {})
     x_config = XConfig(
         enabled=bool(x_cfg.get("enabled", False)),
         bookmarks_count=int(x_cfg.get("bookmarks_count", 0)),
@@ -228,10 +472,40 @@ def load_config(path: str | Path) -> AgentConfig:
             max_cached_posts=int(x_cache_cfg.get("max_cached_posts", 20000)),
         ),
         quote=XQuoteConfig(resolve_depth=int(x_quote_cfg.get("resolve_depth", 0))),
+        ranking=XRankingConfig(
+            enabled=bool(x_ranking_cfg.get("enabled", False)),
+            recency_half_life_days=float(x_ranking_cfg.get("recency_half_life_days", 7)),
+            recency_weight=float(x_ranking_cfg.get("recency_weight", 0.3)),
+            k1=float(x_ranking_cfg.get("k1", 1.2)),
+            b=float(x_ranking_cfg.get("b", 0.75)),
+            max_query_terms=int(x_ranking_cfg.get("max_query_terms", 64)),
+        ),
+        clustering=XClusteringConfig(
+            enabled=bool(x_clustering_cfg.get("enabled", False)),
+            similarity_threshold=float(x_clustering_cfg.get("similarity_threshold", 0.4)),
+            max_posts=int(x_clustering_cfg.get("max_posts", 200)),
+        ),
+        links=XLinksConfig(
+            resolve=bool(x_links_cfg.get("resolve", True)),
+            concurrency=int(x_links_cfg.get("concurrency", 8)),
+            timeout_seconds=float(x_links_cfg.get("timeout_seconds", 5)),
+        ),
     )
 
     mcp_cfg = data.get("mcp", {})
-    mcp_config = MCPConfig(servers=_parse_mcp_servers(mcp_cfg.get("servers", [])))
+    breaker_cfg = mcp_cfg.get("circuit_breaker", {})
+    mcp_config = MCPConfig(
+        servers=_parse_mcp_servers(mcp_cfg.get("servers", [])),
+        connect_timeout_seconds=float(mcp_cfg.get("connect_timeout_seconds", 30)),
+        tool_cache=bool(mcp_cfg.get("tool_cache", True)),
+        tool_cache_ttl_hours=float(mcp_cfg.get("tool_cache_ttl_hours", 24)),
+        lazy_stdio=bool(mcp_cfg.get("lazy_stdio", True)),
+        circuit_breaker=MCPCircuitBreakerConfig(
+            enabled=bool(breaker_cfg.get("enabled", True)),
+            failure_threshold=int(breaker_cfg.get("failure_threshold", 3)),
+            cooldown_minutes=float(breaker_cfg.get("cooldown_minutes", 60)),
+        ),
+    )
 
     langsmith_cfg = data.get("observability", {}).get("langsmith", {})
     observability_config = ObservabilityConfig(
@@ -241,6 +515,94 @@ def load_config(path: str | Path) -> AgentConfig:
         )
     )
 
+    budgets_cfg = data.get("budgets", {})
+    budgets_config = BudgetsConfig(
+        tool_call_timeout_seconds=float(budgets_cfg.get("tool_call_timeout_seconds", 60)),
+        # The researcher's tool-call budget defaults to run.max_web_queries.
+        researcher=_parse_stage_budget(
+            budgets_cfg.get("researcher", {}), run_settings.max_web_queries
+        ),
+        writer=_parse_stage_budget(budgets_cfg.get("writer", {}), 0),
+        verifier=_parse_stage_budget(budgets_cfg.get("verifier", {}), 0),
+    )
+
+    tool_output_cfg = data.get("tool_output", {})
+    tool_output_config = ToolOutputConfig(
+        max_bytes=int(tool_output_cfg.get("max_bytes", 8000)),
+        preview_bytes=int(tool_output_cfg.get("preview_bytes", 2000)),
+        spill=bool(tool_output_cfg.get("spill", True)),
+    )
+
+    event_loop_cfg = data.get("event_loop", {})
+    event_loop_config = EventLoopConfig(
+        watchdog=bool(event_loop_cfg.get("watchdog", False)),
+        lag_threshold_ms=float(event_loop_cfg.get("lag_threshold_ms", 200)),
+        check_interval_ms=float(event_loop_cfg.get("check_interval_ms", 50)),
+        offload_blocking=bool(event_loop_cfg.get("offload_blocking", False)),
+    )
+
+    metrics_cfg = data.get("metrics", {})
+    textfile_path = metrics_cfg.get("textfile_path")
+    metrics_config = MetricsConfig(
+        enabled=bool(metrics_cfg.get("enabled", False)),
+        textfile_path=_resolve_path(_to_path(textfile_path), base_dir) if textfile_path else None,
+        http_host=metrics_cfg.get("http_host", "127.0.0.1"),
+        http_port=int(metrics_cfg.get("http_port", 0)),
+        persist=bool(metrics_cfg.get("persist", True)),
+    )
+
+    research_cfg = data.get("research", {})
+    output_mode = research_cfg.get("output_mode", "text")
+    if output_mode not in RESEARCH_OUTPUT_MODES:
+        raise ConfigError(
+            f"research.output_mode must be one of {', '.join(RESEARCH_OUTPUT_MODES)}: {output_mode}"
+        )
+    research_config = ResearchConfig(output_mode=output_mode)
+
+    dedup_cfg = data.get("dedup", {})
+    dedup_config = DedupConfig(
+        enabled=bool(dedup_cfg.get("enabled", True)),
+        simhash_max_distance=int(dedup_cfg.get("simhash_max_distance", 3)),
+        min_tokens=int(dedup_cfg.get("min_tokens", 8)),
+    )
+
+    novelty_cfg = data.get("novelty", {})
+    novelty_config = NoveltyConfig(
+        enabled=bool(novelty_cfg.get("enabled", False)),
+        window_days=int(novelty_cfg.get("window_days", 7)),
+        filter_bookmarks=bool(novelty_cfg.get("filter_bookmarks", True)),
+        drop_seen_findings=bool(novelty_cfg.get("drop_seen_findings", True)),
+        max_covered_items=int(novelty_cfg.get("max_covered_items", 30)),
+    )
+
+    reuse_cfg = data.get("reuse", {})
+    reuse_config = ReuseConfig(
+        enabled=bool(reuse_cfg.get("enabled", False)),
+        ttl_days=float(reuse_cfg.get("ttl_days", 3)),
+        max_findings=int(reuse_cfg.get("max_findings", 40)),
+    )
+
+    verifier_cfg = data.get("verifier", {})
+    verifier_config = VerifierConfig(
+        enabled=bool(verifier_cfg.get("enabled", False)),
+        concurrency=int(verifier_cfg.get("concurrency", 8)),
+        check_timeout_seconds=float(verifier_cfg.get("check_timeout_seconds", 60)),
+        cache=bool(verifier_cfg.get("cache", True)),
+        cache_ttl_days=float(verifier_cfg.get("cache_ttl_days", 30)),
+        max_checks=int(verifier_cfg.get("max_checks", 100)),
+        drop_unsupported=bool(verifier_cfg.get("drop_unsupported", False)),
+        fetch_tool=str(verifier_cfg.get("fetch_tool", "fetch")),
+    )
+
+    index_cfg = data.get("index", {})
+    index_config = IndexConfig(
+        enabled=bool(index_cfg.get("enabled", True)),
+        path=_resolve_path(
+            _to_path(index_cfg.get("path", run_settings.state_dir / "research_index.sqlite")),
+            base_dir,
+        ),
+    )
+
     return AgentConfig(
         run=run_settings,
         models=models_config,
@@ -251,6 +613,16 @@ def load_config(path: str | Path) -> AgentConfig:
         x=x_config,
         mcp=mcp_config,
         observability=observability_config,
+        budgets=budgets_config,
+        tool_output=tool_output_config,
+        event_loop=event_loop_config,
+        metrics=metrics_config,
+        research=research_config,
+        dedup=dedup_config,
+        novelty=novelty_config,
+        reuse=reuse_config,
+        verifier=verifier_config,
+        index=index_config,
     )
 
 
@@ -269,7 +641,13 @@ def resolve_preset(config: AgentConfig, preset_name: str, today: date) -> Loaded
 
     prompt = prompt.format(date=today.isoformat())
 
-    return LoadedPreset(name=preset_name, prompt=prompt, template_path=preset.template)
+    return LoadedPreset(
+        name=preset_name,
+        prompt=prompt,
+        template_path=preset.template,
+        bookmarks=preset.bookmarks,
+        outputs=preset.outputs,
+    )
 
 
 def openrouter_settings() -> dict:
@@ -14,6 +14,8 @@ class BookmarkPost:
     author_name: str
     created_at: str
     referenced_posts: List["BookmarkPost"] = field(default_factory=list)
+    # Where the post's t.co links point, in text order.
+    expanded_urls: List[str] = field(default_factory=list)
 
 
 @dataclass(frozen=True)
@@ -23,6 +25,8 @@ class Source:
     publisher: Optional[str] = None
     published_at: Optional[str] = None
     snippet: Optional[str] = None
+    # Other URLs carrying the same content (syndicated copies, mirrors).
+    mirrors: List[str] = field(default_factory=list)
 
 
 @dataclass(frozen=True)
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
 import tomllib
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 @dataclass(frozen=True)
@@ -63,8 +63,39 @@ def build_research_prompt(
     x_usage_policy: str,
     max_web_queries: int,
     date_value: date,
+    already_covered: Optional[List[str]] = None,
+    fresh_findings: Optional[List[str]] = None,
+    stale_findings: Optional[List[str]] = None,
+    site_updates: Optional[List[str]] = None,
 ) -> str:
     daily_list = "\n".join(f"- {url}" for url in daily_sites)
+    prefetched: List[str] = []
+    if site_updates is not None:
+        # Sites were fetched before research; only what changed is handed over.
+        prefetched = [
+            "New on daily sites since the last run (already fetched; open only the "
+            "items relevant to the preset):",
+            *(site_updates or ["(nothing new)"]),
+        ]
+    previous: List[str] = []
+    if fresh_findings:
+        previous += [
+            "Still-current findings from the previous run (kept automatically; "
+            "do not research them again, only report new developments):",
+            *(f"- {claim}" for claim in fresh_findings),
+        ]
+    if stale_findings:
+        previous += [
+            "Stale findings from the previous run (re-check each one and include it in "
+            "findings only if current sources still support it):",
+            *(f"- {claim}" for claim in stale_findings),
+        ]
+    covered: List[str] = []
+    if already_covered:
+        covered = [
+            "Already covered in recent articles (skip these unless there is new information):",
+            *(f"- {item}" for item in already_covered),
+        ]
     return "\n".join(
         [
             f"Language: {language}",
@@ -73,6 +104,7 @@ def build_research_prompt(
             f"Date: {date_value.isoformat()}",
             "Source priorities:",
             source_priority.strip(),
+            *prefetched,
             "Daily sites to check:",
             daily_list.strip() or "(none)",
             "X usage policy:",
@@ -85,6 +117,8 @@ def build_research_prompt(
             "sources: list of {url, title, publisher, published_at, snippet}",
             "memo_markdown: markdown research notes with accepted/rejected reasoning.",
             "missing_info: list of unanswered questions.",
+            *covered,
+            *previous,
             "Preset prompt:",
             preset_prompt.strip(),
         ]
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+import typing
+from typing import Any, Dict, List, Optional, Tuple
+
+from daily_research_agent.domain.models import Finding, Source
+
+RESEARCH_SCHEMA_NAME = "research_output"
+CONFIDENCE_LEVELS = ("high", "medium", "low")
+# Source fields filled in after research (by dedup), never by the model.
+SOURCE_DERIVED_FIELDS = ("mirrors",)
+# Findings cite entries of the top-level sources list by URL instead of
+# repeating whole Source objects.
+_FINDING_SOURCE_REF: Dict[str, Any] = {"type": "array", "items": {"type": "string"}}
+
+
+def _unwrap_optional(hint: Any) -> Tuple[Any, bool]:
+    args = typing.get_args(hint)
+    if typing.get_origin(hint) is typing.Union and type(None) in args:
+        rest = [arg for arg in args if arg is not type(None)]
+        return rest[0], True
+    return hint, False
+
+
+def _type_schema(hint: Any) -> Dict[str, Any]:
+    if typing.get_origin(hint) in (list, List):
+        (item,) = typing.get_args(hint)
+        return {"type": "array", "items": _type_schema(item)}
+    if hint is str:
+        return {"type": "string"}
+    if hint in (int, float):
+        return {"type": "number"}
+    if hint is bool:
+        return {"type": "boolean"}
+    if isinstance(hint, type) and hasattr(hint, "__dataclass_fields__"):
+        return dataclass_schema(hint)
+    raise TypeError(f"No JSON schema mapping for {hint!r}")
+
+
+def dataclass_schema(
+    cls: type,
+    overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+    exclude: Tuple[str, ...] = (),
+) -> Dict[str, Any]:
+    """JSON schema for a domain dataclass.
+
+    Every property is listed as required and ``Optional`` fields become
+    nullable, which is the shape strict constrained decoding expects.
+    """
+    hints = typing.get_type_hints(cls)
+    properties: Dict[str, Any] = {}
+    for item in fields(cls):
+        if item.name in exclude:
+            continue
+        if overrides and item.name in overrides:
+            properties[item.name] = overrides[item.name]
+            continue
+        hint, nullable = _unwrap_optional(hints[item.name])
+        schema = _type_schema(hint)
+        if nullable:
+            schema = {**schema, "type": [schema["type"], "null"]}
+        properties[item.name] = schema
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def research_output_schema() -> Dict[str, Any]:
+    """JSON schema of the researcher's output contract."""
+    finding = dataclass_schema(
+        Finding,
+        overrides={
+            "sources": _FINDING_SOURCE_REF,
+            "confidence": {"type": "string", "enum": list(CONFIDENCE_LEVELS)},
+        },
+    )
+    return {
+        "title": RESEARCH_SCHEMA_NAME,
+        "description": "Research findings with citations, notes and open questions.",
+        "type": "object",
+        "properties": {
+            "findings": {"type": "array", "items": finding},
+            "sources": {
+                "type": "array",
+                "items": dataclass_schema(Source, exclude=SOURCE_DERIVED_FIELDS),
+            },
+            "memo_markdown": {"type": "string"},
+            "missing_info": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["findings", "sources", "memo_markdown", "missing_info"],
+        "additionalProperties": False,
+    }
+
+
+@dataclass
+class FieldError:
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+@dataclass
+class ResearchValidation:
+    data: Dict[str, Any]
+    errors: List[FieldError] = field(default_factory=list)
+    dropped_items: Dict[str, int] = field(default_factory=dict)
+
+    def summary(self, max_errors: int = 50) -> Dict[str, Any]:
+        return {
+            "error_count": len(self.errors),
+            "errors": [str(error) for error in self.errors[:max_errors]],
+            "dropped_items": self.dropped_items,
+        }
+
+
+class _Validator:
+    def __init__(self) -> None:
+        self.errors: List[FieldError] = []
+        self.dropped: Dict[str, int] = {}
+
+    def error(self, path: str, message: str) -> None:
+        self.errors.append(FieldError(path, message))
+
+    def drop(self, key: str) -> None:
+        self.dropped[key] = self.dropped.get(key, 0) + 1
+
+    def string(self, item: Dict[str, Any], key: str, path: str, nullable: bool) -> Optional[str]:
+        value = item.get(key)
+        if isinstance(value, str):
+            return value
+        if value is None:
+            if not nullable:
+                self.error(f"{path}.{key}", "missing required string")
+                return ""
+            return None
+        self.error(f"{path}.{key}", f"expected string, got {type(value).__name__}")
+        return None if nullable else str(value)
+
+    def source(self, item: Any, path: str) -> Optional[Dict[str, Any]]:
+        if isinstance(item, str):
+            item = {"url": item}
+        if not isinstance(item, dict):
+            self.error(path, f"expected object, got {type(item).__name__}")
+            return None
+        url = item.get("url")
+        if not isinstance(url, str) or not url.strip():
+            self.error(f"{path}.url", "missing required string")
+            return None
+        hints = typing.get_type_hints(Source)
+        cleaned: Dict[str, Any] = {"url": url.strip()}
+        for source_field in fields(Source):
+            if source_field.name == "url" or source_field.name in SOURCE_DERIVED_FIELDS:
+                continue
+            _, nullable = _unwrap_optional(hints[source_field.name])
+            cleaned[source_field.name] = self.string(item, source_field.name, path, nullable)
+        return cleaned
+
+    def finding(self, item: Any, path: str) -> Optional[Dict[str, Any]]:
+        if not isinstance(item, dict):
+            self.error(path, f"expected object, got {type(item).__name__}")
+            return None
+        claim = item.get("claim")
+        if not isinstance(claim, str) or not claim.strip():
+            self.error(f"{path}.claim", "missing required string")
+            return None
+
+        refs: List[str] = []
+        raw_refs = item.get("sources")
+        if not isinstance(raw_refs, list):
+            self.error(f"{path}.sources", "expected array of URLs")
+            raw_refs = []
+        for index, ref in enumerate(raw_refs):
+            if isinstance(ref, dict):
+                ref = ref.get("url")
+            if isinstance(ref, str) and ref.strip():
+                refs.append(ref.strip())
+            else:
+                self.error(f"{path}.sources[{index}]", "expected URL string")
+
+        confidence = item.get("confidence")
+        normalized = confidence.strip().lower() if isinstance(confidence, str) else None
+        if normalized not in CONFIDENCE_LEVELS:
+            self.error(
+                f"{path}.confidence",
+                f"expected one of {', '.join(CONFIDENCE_LEVELS)}, got {confidence!r}; using low",
+            )
+            normalized = "low"
+
+        return {
+            "claim": claim.strip(),
+            "evidence": self.string(item, "evidence", path, nullable=False),
+            "confidence": normalized,
+            "sources": refs,
+        }
+
+
+def validate_research_output(data: Dict[str, Any]) -> ResearchValidation:
+    """Check research output against the schema, field by field.
+
+    Entries without their identifying field (a finding's claim, a source's
+    url) are dropped; other bad fields are coerced to a safe value. Every
+    problem is reported with its path, e.g. ``findings[2].confidence``.
+    """
+    validator = _Validator()
+
+    findings = []
+    raw_findings = data.get("findings")
+    if not isinstance(raw_findings, list):
+        validator.error("findings", "expected array")
+        raw_findings = []
+    for index, item in enumerate(raw_findings):
+        cleaned = validator.finding(item, f"findings[{index}]")
+        if cleaned is None:
+            validator.drop("findings")
+        else:
+            findings.append(cleaned)
+
+    sources = []
+    raw_sources = data.get("sources")
+    if not isinstance(raw_sources, list):
+        validator.error("sources", "expected array")
+        raw_sources = []
+    for index, item in enumerate(raw_sources):
+        cleaned = validator.source(item, f"sources[{index}]")
+        if cleaned is None:
+            validator.drop("sources")
+        else:
+            sources.append(cleaned)
+
+    memo = data.get("memo_markdown")
+    if not isinstance(memo, str):
+        validator.error("memo_markdown", "missing required string")
+        memo = ""
+
+    missing_info = data.get("missing_info")
+    if not isinstance(missing_info, list):
+        if missing_info is not None:
+            validator.error("missing_info", "expected array of strings")
+        missing_info = []
+
+    cleaned_data = {
+        "findings": findings,
+        "sources": sources,
+        "memo_markdown": memo,
+        "missing_info": [str(item) for item in missing_info],
+    }
+    return ResearchValidation(cleaned_data, validator.errors, validator.dropped)
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import math
+import re
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from daily_research_agent.domain.models import BookmarkPost
+from daily_research_agent.integrations.x_bookmarks import (
+    bookmark_filter_sql,
+    init_bookmark_db,
+    load_cached_bookmarks_by_ids,
+)
+
+_URL_RE = re.compile(r"https?://\S+")
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]|[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]+")
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]")
+STOPWORDS = frozenset(
+    """
+    a an and are as at be been but by can do for from has have how i if in into is it its
+    me more my no not of on or our out so that the their them then there these they this
+    to up was we were what when which who will with you your rt amp via just about new
+    """.split()
+)
+INDEX_BATCH = 2000
+
+
+def bm25_tokens(text: str) -> List[str]:
+    """Terms for BM25: lowercase words and overlapping bigrams of CJK runs.
+
+    URLs are dropped (shortlinks carry no topic), as are stopwords and
+    one-character ASCII tokens.
+    """
+    terms: List[str] = []
+    for token in _TOKEN_RE.findall(_URL_RE.sub(" ", text.lower())):
+        if _CJK_RE.match(token):
+            if len(token) == 1:
+                terms.append(token)
+            else:
+                terms.extend(token[i : i + 2] for i in range(len(token) - 1))
+        elif len(token) > 1 and token not in STOPWORDS:
+            terms.append(token)
+    return terms
+
+
+def _post_text(text: str, author_username: str) -> str:
+    return f"{text} {author_username}"
+
+
+@dataclass
+class RankingStats:
+    indexed: int = 0
+    removed: int = 0
+    documents: int = 0
+    query_terms: int = 0
+    matched: int = 0
+    seconds: float = 0.0
+    top: List[Dict[str, object]] = field(default_factory=list)
+
+
+def _ensure_tables(conn: sqlite3.Connection) -> None:
+    init_bookmark_db(conn)
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS bm25_docs (
+            id TEXT PRIMARY KEY,
+            length INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS bm25_postings (
+            term TEXT NOT NULL,
+            id TEXT NOT NULL,
+            tf INTEGER NOT NULL,
+            PRIMARY KEY (term, id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS bm25_postings_id ON bm25_postings (id);
+        CREATE INDEX IF NOT EXISTS idx_bookmarks_created_at ON bookmarks (created_at);
+        CREATE TABLE IF NOT EXISTS bm25_pending (
+            id TEXT PRIMARY KEY,
+            deleted INTEGER NOT NULL
+        );
+        """
+    )
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'bm25_bookmarks_ai'"
+    ).fetchone()
+    if not exists:
+        # First use on this cache: queue whatever the postings don't reflect
+        # yet, then let triggers keep the queue current from here on.
+        with conn:
+            conn.executescript(
+                """
+                CREATE TRIGGER bm25_bookmarks_ai AFTER INSERT ON bookmarks BEGIN
+                    INSERT OR REPLACE INTO bm25_pending VALUES (new.id, 0);
+                END;
+                CREATE TRIGGER bm25_bookmarks_ad AFTER DELETE ON bookmarks BEGIN
+                    INSERT OR REPLACE INTO bm25_pending VALUES (old.id, 1);
+                END;
+                INSERT OR REPLACE INTO bm25_pending
+                    SELECT b.id, 0 FROM bookmarks b
+                    LEFT JOIN bm25_docs d ON d.id = b.id WHERE d.id IS NULL;
+                INSERT OR REPLACE INTO bm25_pending
+                    SELECT d.id, 1 FROM bm25_docs d
+                    LEFT JOIN bookmarks b ON b.id = d.id WHERE b.id IS NULL;
+                """
+            )
+    try:
+        conn.execute("SELECT pow(0.5, 1)")
+    except sqlite3.OperationalError:
+        # SQLite built without math functions.
+        conn.create_function("pow", 2, math.pow, deterministic=True)
+
+
+def sync_index(conn: sqlite3.Connection, stats: RankingStats) -> None:
+    """Apply queued cache changes to the postings.
+
+    Triggers on the bookmarks table queue every insert and eviction, so only
+    posts that changed since the last call are tokenized or removed.
+    """
+    while True:
+        pending = conn.execute(
+            "SELECT p.id, p.deleted, b.text, b.author_username FROM bm25_pending p "
+            "LEFT JOIN bookmarks b ON b.id = p.id LIMIT ?",
+            (INDEX_BATCH,),
+        ).fetchall()
+        if not pending:
+            break
+        ids = [row[0] for row in pending]
+        placeholders = ",".join("?" for _ in ids)
+        docs = []
+        postings = []
+        for post_id, deleted, text, author in pending:
+            if deleted or text is None:
+                stats.removed += 1
+                continue
+            counts = Counter(bm25_tokens(_post_text(text, author)))
+            docs.append((post_id, sum(counts.values())))
+            postings.extend((term, post_id, tf) for term, tf in counts.items())
+        with conn:
+            conn.execute(f"DELETE FROM bm25_postings WHERE id IN ({placeholders})", ids)
+            conn.execute(f"DELETE FROM bm25_docs WHERE id IN ({placeholders})", ids)
+            conn.executemany("INSERT INTO bm25_docs VALUES (?, ?)", docs)
+            conn.executemany("INSERT INTO bm25_postings VALUES (?, ?, ?)", postings)
+            conn.execute(f"DELETE FROM bm25_pending WHERE id IN ({placeholders})", ids)
+        stats.indexed += len(docs)
+
+
+def rank_cached_bookmarks(
+    cache_path: str,
+    query_text: str,
+    limit: int,
+    half_life_days: float = 7.0,
+    recency_weight: float = 0.3,
+    k1: float = 1.2,
+    b: float = 0.75,
+    max_query_terms: int = 64,
+    keywords: Optional[List[str]] = None,
+    authors: Optional[List[str]] = None,
+    now: Optional[datetime] = None,
+) -> Tuple[List[BookmarkPost], RankingStats]:
+    """Top ``limit`` cached posts by BM25 relevance to ``query_text`` plus recency.
+
+    score = bm25 / max(bm25) + recency_weight * 0.5 ** (age_days / half_life_days)
+
+    Only posts passing the ``keywords``/``authors`` filter are candidates.
+
+    Scoring runs inside SQLite over the persisted postings, so only the
+    query's terms are touched and the cost stays flat as the cache grows.
+    """
+    started = time.perf_counter()
+    stats = RankingStats()
+    if limit <= 0:
+        return [], stats
+    now = now or datetime.now(timezone.utc)
+
+    conn = sqlite3.connect(cache_path)
+    try:
+        _ensure_tables(conn)
+        sync_index(conn, stats)
+        total, avg_length = conn.execute(
+            "SELECT COUNT(*), COALESCE(AVG(length), 0) FROM bm25_docs"
+        ).fetchone()
+        stats.documents = total
+
+        query_counts = Counter(bm25_tokens(query_text))
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS bm25_query (term TEXT PRIMARY KEY, weight REAL)")
+        conn.execute("DELETE FROM bm25_query")
+        if query_counts and total:
+            dfs = dict(
+                conn.execute(
+                    "SELECT term, COUNT(*) FROM bm25_postings WHERE term IN "
+                    f"({','.join('?' for _ in query_counts)}) GROUP BY term",
+                    list(query_counts),
+                ).fetchall()
+            )
+            weighted = []
+            for term, qtf in query_counts.items():
+                df = dfs.get(term, 0)
+                if not df:
+                    continue
+                idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                weighted.append((term, idf * (1 + math.log(qtf))))
+            weighted.sort(key=lambda item: item[1], reverse=True)
+            conn.executemany("INSERT INTO bm25_query VALUES (?, ?)", weighted[:max_query_terms])
+            stats.query_terms = min(len(weighted), max_query_terms)
+
+        conn.execute("DROP TABLE IF EXISTS temp.bm25_scores")
+        # CROSS JOIN pins the join order: walk the handful of query terms and
+        # their posting lists instead of letting the planner scan postings.
+        conn.execute(
+            """
+            CREATE TEMP TABLE bm25_scores AS
+            SELECT p.id AS id,
+                   SUM(q.weight * p.tf * (:k1 + 1)
+                       / (p.tf + :k1 * (1 - :b + :b * d.length / :avg_length))) AS score
+            FROM bm25_query q
+            CROSS JOIN bm25_postings p ON p.term = q.term
+            CROSS JOIN bm25_docs d ON d.id = p.id
+            GROUP BY p.id
+            """,
+            {"k1": k1, "b": b, "avg_length": avg_length or 1.0},
+        )
+        stats.matched = conn.execute("SELECT COUNT(*) FROM bm25_scores").fetchone()[0]
+        where, filter_params = bookmark_filter_sql(keywords, authors)
+        # A post without a BM25 score can only place on recency, so the
+        # newest ``limit`` posts are the only unscored candidates worth scoring.
+        rows = conn.execute(
+            f"""
+            WITH candidates AS (
+                SELECT s.id, s.score FROM bm25_scores s
+                JOIN bookmarks b ON b.id = s.id WHERE {where}
+                UNION ALL
+                SELECT id, NULL FROM (
+                    SELECT b.id FROM bookmarks b WHERE {where}
+                    ORDER BY b.created_at DESC LIMIT ?
+                )
+            ),
+            scored AS (SELECT id, MAX(score) AS score FROM candidates GROUP BY id)
+            SELECT b.id, COALESCE(s.score, 0) AS relevance,
+                   COALESCE(s.score / NULLIF((SELECT MAX(score) FROM scored), 0), 0)
+                   + ? * pow(0.5, MAX(julianday(?) - julianday(b.created_at), 0) / ?) AS combined
+            FROM scored s JOIN bookmarks b ON b.id = s.id
+            ORDER BY combined DESC, b.created_at DESC
+            LIMIT ?
+            """,
+            (
+                *filter_params,
+                *filter_params,
+                limit,
+                recency_weight,
+                now.isoformat(),
+                max(half_life_days, 1e-6),
+                limit,
+            ),
+        ).fetchall()
+        conn.execute("DROP TABLE IF EXISTS temp.bm25_scores")
+    finally:
+        conn.close()
+
+    ids = [row[0] for row in rows]
+    stats.top = [
+        {"id": row[0], "bm25": round(row[1], 3), "score": round(row[2] or 0.0, 3)}
+        for row in rows[:5]
+    ]
+    posts = load_cached_bookmarks_by_ids(cache_path, ids)
+    stats.seconds = round(time.perf_counter() - started, 4)
+    return posts, stats
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+from pathlib import Path
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
+
+from daily_research_agent.integrations.mcp_client import wrap_tool
+
+CASSETTE_VERSION = 1
+CASSETTE_FILENAME = "cassette.jsonl.gz"
+
+# Run ids embed the wall-clock time and a random suffix; they leak into
+# prompts through spill-file paths, so they are masked before hashing.
+_RUN_ID_RE = re.compile(r"\d{4}-\d{2}-\d{2}-\d{6}-[0-9a-f]{8}")
+_KEPT_RESPONSE_HEADERS = ("content-type",)
+
+
+class CassetteError(RuntimeError):
+    pass
+
+
+def _body_hash(body: bytes) -> str:
+    text = _RUN_ID_RE.sub("<run_id>", body.decode("utf-8", errors="replace"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _args_hash(arguments: Dict[str, Any]) -> str:
+    payload = json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _encode_body(body: bytes) -> Dict[str, str]:
+    try:
+        return {"body": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(body).decode("ascii")}
+
+
+def _decode_body(entry: Dict[str, Any]) -> bytes:
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+class Cassette:
+    """Records or replays the run's LLM, MCP and X traffic.
+
+    In record mode, HTTP transports and MCP tools are wrapped so every exchange
+    is appended to the cassette. In replay mode the same hooks serve recorded
+    exchanges instead of touching the network: an entry with an identical
+    request (same body or tool arguments) is preferred, otherwise entries are
+    served in recorded order per channel.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        entries: Optional[List[Dict[str, Any]]] = None,
+        simulate_latency: bool = False,
+    ) -> None:
+        if mode not in ("record", "replay"):
+            raise CassetteError(f"Unsupported cassette mode: {mode}")
+        self.mode = mode
+        self.entries: List[Dict[str, Any]] = entries or []
+        self.simulate_latency = simulate_latency
+        self.served = 0
+        self._used: set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @classmethod
+    def recorder(cls, **meta: Any) -> "Cassette":
+        cassette = cls("record")
+        cassette.entries.append(
+            {"kind": "meta", "version": CASSETTE_VERSION, "recorded_at": time.time(), **meta}
+        )
+        return cassette
+
+    @classmethod
+    def load(cls, path: Path, simulate_latency: bool = False) -> "Cassette":
+        if not path.exists():
+            raise CassetteError(f"Cassette not found: {path}")
+        entries = []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entries.append(json.loads(line))
+        meta = next((e for e in entries if e.get("kind") == "meta"), {})
+        if meta.get("version") != CASSETTE_VERSION:
+            raise CassetteError(f"Unsupported cassette version in {path}: {meta.get('version')}")
+        return cls("replay", entries, simulate_latency=simulate_latency)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+
+    def summary(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for entry in self.entries:
+            key = f"{entry['kind']}:{entry.get('channel', '')}".rstrip(":")
+            counts[key] = counts.get(key, 0) + 1
+        return {"mode": self.mode, "entries": counts, "served": self.served}
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.entries.append(entry)
+
+    def _take(self, kind: str, channel: str, match_key: str, match_value: str) -> Dict[str, Any]:
+        with self._lock:
+            fallback = None
+            for index, entry in enumerate(self.entries):
+                if index in self._used or entry.get("kind") != kind:
+                    continue
+                if entry.get("channel") != channel:
+                    continue
+                if entry.get(match_key) == match_value:
+                    fallback = index
+                    break
+                if fallback is None:
+                    fallback = index
+            if fallback is None:
+                raise CassetteError(f"No recorded {kind} exchange left for {channel}")
+            self._used.add(fallback)
+            self.served += 1
+            return self.entries[fallback]
+
+    # HTTP -----------------------------------------------------------------
+
+    def sync_transport(
+        self, channel: str, inner: Optional[httpx.BaseTransport] = None
+    ) -> httpx.BaseTransport:
+        return _SyncCassetteTransport(self, channel, inner or httpx.HTTPTransport())
+
+    def async_transport(
+        self, channel: str, inner: Optional[httpx.AsyncBaseTransport] = None
+    ) -> httpx.AsyncBaseTransport:
+        return _AsyncCassetteTransport(self, channel, inner or httpx.AsyncHTTPTransport())
+
+    def _record_http(
+        self,
+        channel: str,
+        request: httpx.Request,
+        request_body: bytes,
+        response: httpx.Response,
+        body: bytes,
+        latency: float,
+    ) -> httpx.Response:
+        headers = {k: v for k, v in response.headers.items() if k.lower() in _KEPT_RESPONSE_HEADERS}
+        self._append(
+            {
+                "kind": "http",
+                "channel": channel,
+                "method": request.method,
+                "path": request.url.path,
+                "request_hash": _body_hash(request.url.query + request_body),
+                "status": response.status_code,
+                "headers": headers,
+                "latency": round(latency, 4),
+                **_encode_body(body),
+            }
+        )
+        # The body has already been decoded, so drop content-encoding/length.
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    def _replay_http(self, channel: str, request: httpx.Request, request_body: bytes) -> Dict[str, Any]:
+        return self._take("http", channel, "request_hash", _body_hash(request.url.query + request_body))
+
+    @staticmethod
+    def _response(entry: Dict[str, Any], request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            entry["status"], headers=entry.get("headers", {}), content=_decode_body(entry), request=request
+        )
+
+    # MCP ------------------------------------------------------------------
+
+    def wrap_mcp_tools(self, tools: List[BaseTool]) -> List[BaseTool]:
+        self._append(
+            {
+                "kind": "mcp_schema",
+                "tools": [
+                    {
+                        "name": tool.name,
+                        "description": tool.description,
+                        "input_schema": tool.args_schema
+                        if isinstance(tool.args_schema, dict) or tool.args_schema is None
+                        else tool.args_schema.model_json_schema(),
+                    }
+                    for tool in tools
+                ],
+            }
+        )
+        return [wrap_tool(tool, self._record_mcp_call) for tool in tools]
+
+    async def _record_mcp_call(self, tool: BaseTool, arguments: Dict[str, Any]) -> Any:
+        started = time.monotonic()
+        entry: Dict[str, Any] = {
+            "kind": "mcp",
+            "channel": tool.name,
+            "arguments_hash": _args_hash(arguments),
+        }
+        try:
+            result = await tool.ainvoke(arguments)
+        except ToolException as exc:
+            entry.update({"tool_error": str(exc), "latency": round(time.monotonic() - started, 4)})
+            self._append(entry)
+            raise
+        except Exception as exc:
+            entry.update({"error": str(exc), "latency": round(time.monotonic() - started, 4)})
+            self._append(entry)
+            raise
+        entry.update({"result": result, "latency": round(time.monotonic() - started, 4)})
+        self._append(entry)
+        return result
+
+    def mcp_tools(self) -> List[BaseTool]:
+        tools: List[BaseTool] = []
+        for entry in self.entries:
+            if entry.get("kind") != "mcp_schema":
+                continue
+            for item in entry.get("tools", []):
+                tools.append(self._replay_tool(item))
+        return tools
+
+    def _replay_tool(self, item: Dict[str, Any]) -> BaseTool:
+        name = item["name"]
+
+        async def _call(**arguments: Any) -> Any:
+            entry = self._take("mcp", name, "arguments_hash", _args_hash(arguments))
+            if self.simulate_latency:
+                await asyncio.sleep(entry.get("latency", 0))
+            if "error" in entry:
+                raise CassetteError(entry["error"])
+            if "tool_error" in entry:
+                raise ToolException(entry["tool_error"])
+            return entry.get("result")
+
+        return StructuredTool(
+            name=name,
+            description=item.get("description") or "",
+            args_schema=item.get("input_schema") or {"type": "object", "properties": {}},
+            coroutine=_call,
+            handle_tool_error=True,
+        )
+
+
+class _SyncCassetteTransport(httpx.BaseTransport):
+    def __init__(self, cassette: Cassette, channel: str, inner: httpx.BaseTransport) -> None:
+        self._cassette = cassette
+        self._channel = channel
+        self._inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request_body = request.read()
+        if self._cassette.replaying:
+            entry = self._cassette._replay_http(self._channel, request, request_body)
+            if self._cassette.simulate_latency:
+                time.sleep(entry.get("latency", 0))
+            return Cassette._response(entry, request)
+        started = time.monotonic()
+        response = self._inner.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        return self._cassette._record_http(
+            self._channel, request, request_body, response, body, time.monotonic() - started
+        )
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class _AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette, channel: str, inner: httpx.AsyncBaseTransport) -> None:
+        self._cassette = cassette
+        self._channel = channel
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request_body = await request.aread()
+        if self._cassette.replaying:
+            entry = self._cassette._replay_http(self._channel, request, request_body)
+            if self._cassette.simulate_latency:
+                await asyncio.sleep(entry.get("latency", 0))
+            return Cassette._response(entry, request)
+        started = time.monotonic()
+        response = await self._inner.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        return self._cassette._record_http(
+            self._channel, request, request_body, response, body, time.monotonic() - started
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
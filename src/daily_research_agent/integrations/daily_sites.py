@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+import json
+from pathlib import Path
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+import xml.etree.ElementTree as ET
+
+import httpx
+
+from daily_research_agent.pipeline.dedup import canonicalize_url
+
+USER_AGENT = "daily-research-agent/prefetch"
+# Anchor text shorter than this is navigation ("Home", "Next", "42 comments").
+MIN_LINK_TEXT = 20
+_HEADING_TAGS = ("h1", "h2", "h3")
+_SKIPPED_SCHEMES = ("javascript:", "mailto:", "tel:", "#")
+
+STATUS_FIRST = "first"
+STATUS_CHANGED = "changed"
+STATUS_UNCHANGED = "unchanged"
+STATUS_ERROR = "error"
+
+
+def snapshot_store_path(state_dir: Path) -> Path:
+    return state_dir / "daily_sites.sqlite"
+
+
+@dataclass(frozen=True)
+class SiteItem:
+    url: str
+    title: str
+
+
+@dataclass
+class SiteUpdate:
+    site: str
+    status: str
+    new_items: List[SiteItem] = field(default_factory=list)
+    http_status: Optional[int] = None
+    error: Optional[str] = None
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "status": self.status,
+            "http_status": self.http_status,
+            "new_items": len(self.new_items),
+            **({"error": self.error} if self.error else {}),
+        }
+
+
+class _LinkExtractor(HTMLParser):
+    """Collects headline and article-like anchors from a front page."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.items: List[Tuple[str, str, bool]] = []
+        self._href: Optional[str] = None
+        self._text: List[str] = []
+        self._heading_depth = 0
+        self._in_heading_link = False
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag in _HEADING_TAGS:
+            self._heading_depth += 1
+        elif tag == "a":
+            self._href = dict(attrs).get("href")
+            self._text = []
+            self._in_heading_link = self._heading_depth > 0
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _HEADING_TAGS:
+            self._heading_depth = max(0, self._heading_depth - 1)
+        elif tag == "a" and self._href is not None:
+            text = " ".join("".join(self._text).split())
+            self.items.append((self._href, text, self._in_heading_link))
+            self._href = None
+
+    def handle_data(self, data: str) -> None:
+        if self._href is not None:
+            self._text.append(data)
+
+
+def _extract_feed(body: str, base_url: str) -> Optional[List[SiteItem]]:
+    try:
+        root = ET.fromstring(body)
+    except ET.ParseError:
+        return None
+    items: List[SiteItem] = []
+    for node in root.iter():
+        tag = node.tag.rsplit("}", 1)[-1]
+        if tag not in ("item", "entry"):
+            continue
+        title = link = ""
+        for child in node:
+            child_tag = child.tag.rsplit("}", 1)[-1]
+            if child_tag == "title":
+                title = " ".join((child.text or "").split())
+            elif child_tag == "link":
+                link = child.get("href") or (child.text or "").strip()
+        if title and link:
+            items.append(SiteItem(urljoin(base_url, link), title))
+    return items
+
+
+def extract_items(body: str, base_url: str, content_type: str = "") -> List[SiteItem]:
+    """Headlines and article links on a page, or the entries of an RSS/Atom feed.
+
+    Links are resolved against ``base_url`` and de-duplicated by canonical
+    URL; anchors inside h1-h3 are kept whatever their length, others only
+    when their text looks like a headline.
+    """
+    if "xml" in content_type or body.lstrip().startswith("<?xml"):
+        feed = _extract_feed(body, base_url)
+        if feed is not None:
+            return _unique(feed)
+    parser = _LinkExtractor()
+    parser.feed(body)
+    items = []
+    for href, text, in_heading in parser.items:
+        if not href or not text or href.startswith(_SKIPPED_SCHEMES):
+            continue
+        if not in_heading and len(text) < MIN_LINK_TEXT:
+            continue
+        url = urljoin(base_url, href)
+        if urlsplit(url).scheme not in ("http", "https"):
+            continue
+        items.append(SiteItem(url, text))
+    return _unique(items)
+
+
+def _unique(items: List[SiteItem]) -> List[SiteItem]:
+    seen = set()
+    unique = []
+    for item in items:
+        key = canonicalize_url(item.url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+SnapshotRow = Tuple[str, Optional[str], Optional[str], List[SiteItem]]
+
+
+class SiteSnapshotStore:
+    """Last response validators and reported items per (preset, daily site).
+
+    Presets share ``sources.daily_sites`` but each reports new items on its
+    own, so each keeps its own snapshot of every site.
+    """
+
+    def __init__(self, path: Path, preset: str) -> None:
+        self.path = path
+        self.preset = preset
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        # Snapshots used to be keyed by site alone; those can't be told apart
+        # per preset, so every site starts over once.
+        conn.execute("DROP TABLE IF EXISTS snapshots")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS site_snapshots (
+                preset TEXT NOT NULL,
+                site TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                items TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (preset, site)
+            )
+            """
+        )
+        return conn
+
+    def load(self, sites: List[str]) -> Dict[str, Tuple[Optional[str], Optional[str], List[SiteItem]]]:
+        if not sites:
+            return {}
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT site, etag, last_modified, items FROM site_snapshots "
+                f"WHERE preset = ? AND site IN ({','.join('?' for _ in sites)})",
+                [self.preset, *sites],
+            ).fetchall()
+        finally:
+            conn.close()
+        return {
+            site: (etag, last_modified, [SiteItem(**item) for item in json.loads(items)])
+            for site, etag, last_modified, items in rows
+        }
+
+    def save(self, rows: List[SnapshotRow]) -> None:
+        if not rows:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO site_snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            self.preset,
+                            site,
+                            etag,
+                            last_modified,
+                            json.dumps([asdict(item) for item in items], ensure_ascii=False),
+                            now,
+                        )
+                        for site, etag, last_modified, items in rows
+                    ],
+                )
+        finally:
+            conn.close()
+
+
+async def prefetch_daily_sites(
+    sites: List[str],
+    store: SiteSnapshotStore,
+    concurrency: int = 8,
+    timeout_seconds: float = 10.0,
+    max_items_per_site: int = 20,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> Tuple[List[SiteUpdate], List[SnapshotRow], float]:
+    """Fetch every daily site concurrently and diff it against its snapshot.
+
+    Requests are conditional on the stored ETag/Last-Modified, so unchanged
+    sites answer 304 and cost nothing further. A changed site reports the
+    items that weren't on the previous snapshot (canonical URL comparison);
+    a site seen for the first time reports its first ``max_items_per_site``.
+
+    A snapshot holds only the items that were known or reported, so items
+    past ``max_items_per_site`` come up on the next run; until then the
+    site's validators aren't stored and it is fetched unconditionally. The
+    new snapshot rows are returned rather than saved: the caller saves
+    them once the run has actually reported the new items, so a failed run
+    sees the same items again next time. Failed sites have no row and keep
+    their old snapshot.
+    """
+    started = time.perf_counter()
+    previous = await asyncio.to_thread(store.load, sites)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    saved: List[SnapshotRow] = []
+
+    async def _fetch(client: httpx.AsyncClient, site: str) -> SiteUpdate:
+        etag, last_modified, old_items = previous.get(site, (None, None, []))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        async with semaphore:
+            try:
+                response = await client.get(site, headers=headers)
+            except httpx.HTTPError as exc:
+                return SiteUpdate(site, STATUS_ERROR, error=str(exc) or type(exc).__name__)
+        if response.status_code == 304 and site in previous:
+            return SiteUpdate(site, STATUS_UNCHANGED, http_status=304)
+        if response.status_code >= 400:
+            return SiteUpdate(site, STATUS_ERROR, http_status=response.status_code)
+
+        items = extract_items(
+            response.text, str(response.url), response.headers.get("content-type", "")
+        )
+        known = {canonicalize_url(item.url) for item in old_items}
+        new_items = [item for item in items if canonicalize_url(item.url) not in known]
+        reported = new_items[:max_items_per_site]
+        seen = known | {canonicalize_url(item.url) for item in reported}
+        complete = len(reported) == len(new_items)
+        saved.append(
+            (
+                site,
+                response.headers.get("etag") if complete else None,
+                response.headers.get("last-modified") if complete else None,
+                [item for item in items if canonicalize_url(item.url) in seen],
+            )
+        )
+        if site not in previous:
+            status = STATUS_FIRST
+        else:
+            status = STATUS_CHANGED if new_items else STATUS_UNCHANGED
+        return SiteUpdate(site, status, reported, http_status=response.status_code)
+
+    limits = httpx.Limits(max_connections=max(1, concurrency))
+    async with httpx.AsyncClient(
+        transport=transport,
+        limits=limits,
+        timeout=timeout_seconds,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+    ) as client:
+        updates = await asyncio.gather(*(_fetch(client, site) for site in sites))
+    return list(updates), saved, round(time.perf_counter() - started, 3)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import re
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+_SHORTLINK_RE = re.compile(r"https?://t\.co/[A-Za-z0-9]+")
+_X_HOSTS = ("x.com", "twitter.com", "www.x.com", "www.twitter.com", "mobile.twitter.com")
+_MEDIA_PATH_RE = re.compile(r"/status/\d+/(?:photo|video)/\d+$")
+MAX_REDIRECTS = 5
+# _head's answer for a link the deadline left no time for.
+_SKIPPED = ""
+
+
+def shortlinks(text: str) -> List[str]:
+    """t.co links in post text, in order and without repeats."""
+    return list(dict.fromkeys(_SHORTLINK_RE.findall(text)))
+
+
+def is_media_link(url: str) -> bool:
+    """Links X adds for attached photos/videos; they point back at the post."""
+    parts = urlsplit(url)
+    return (parts.hostname or "").lower() in _X_HOSTS and bool(_MEDIA_PATH_RE.search(parts.path))
+
+
+def entity_links(tweet: Dict) -> Optional[Dict[str, str]]:
+    """t.co link -> expanded URL from a tweet's ``entities.urls``.
+
+    Returns ``None`` when the payload carries no entities at all, so callers
+    can tell "no links" apart from "links not expanded by the API".
+    """
+    entities = tweet.get("entities")
+    if entities is None:
+        return None
+    links: Dict[str, str] = {}
+    for item in entities.get("urls", []) or []:
+        short = item.get("url")
+        expanded = item.get("unwound_url") or item.get("expanded_url")
+        if short and expanded:
+            links[short] = expanded
+    return links
+
+
+def expanded_links(links: Iterable[str]) -> List[str]:
+    """Expanded URLs worth passing on: no media links, no repeats."""
+    return [url for url in dict.fromkeys(links) if not is_media_link(url)]
+
+
+@dataclass
+class LinkStats:
+    requested: int = 0
+    cache_hits: int = 0
+    resolved: int = 0
+    failed: int = 0
+    # Not attempted because the deadline had passed.
+    skipped: int = 0
+
+
+class LinkResolver:
+    """Expands shortlinks by following redirects, remembering the results.
+
+    Lookups hit the ``resolved_links`` table first; misses are resolved
+    concurrently with HEAD requests over one pooled client. Failures aren't
+    cached, so they are retried on the next run.
+
+    With a ``deadline`` (a ``time.monotonic()`` value) every request's timeout
+    is capped at the time left and links not reached in time are skipped,
+    keeping their short URL.
+    """
+
+    def __init__(
+        self,
+        cache_path: str,
+        concurrency: int = 8,
+        timeout_seconds: float = 5.0,
+        transport: Optional[httpx.BaseTransport] = None,
+    ) -> None:
+        self._cache_path = cache_path
+        self._concurrency = max(1, concurrency)
+        self._timeout_seconds = timeout_seconds
+        self._transport = transport
+        self.stats = LinkStats()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._cache_path)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resolved_links (
+                short_url TEXT PRIMARY KEY,
+                expanded_url TEXT NOT NULL,
+                resolved_at TEXT NOT NULL
+            )
+            """
+        )
+        return conn
+
+    def _timeout(self, deadline: Optional[float]) -> float:
+        if deadline is None:
+            return self._timeout_seconds
+        return min(self._timeout_seconds, deadline - time.monotonic())
+
+    def _head(self, client: httpx.Client, url: str, deadline: Optional[float]) -> Optional[str]:
+        # Redirects are followed by hand so each hop gets only the time left.
+        current = url
+        for _ in range(MAX_REDIRECTS + 1):
+            timeout = self._timeout(deadline)
+            if timeout <= 0:
+                return _SKIPPED if current == url else None
+            try:
+                response = client.head(current, timeout=timeout)
+            except httpx.HTTPError:
+                return None
+            if not response.has_redirect_location:
+                break
+            current = str(response.url.join(response.headers["location"]))
+        else:
+            return None
+        # Some origins answer HEAD with 4xx/405; the redirect chain that got
+        # there is still the answer.
+        return current if current != url else None
+
+    def resolve(self, urls: Iterable[str], deadline: Optional[float] = None) -> Dict[str, str]:
+        wanted = list(dict.fromkeys(urls))
+        if not wanted:
+            return {}
+        self.stats.requested += len(wanted)
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" for _ in wanted)
+            resolved = dict(
+                conn.execute(
+                    "SELECT short_url, expanded_url FROM resolved_links "
+                    f"WHERE short_url IN ({placeholders})",
+                    wanted,
+                ).fetchall()
+            )
+            self.stats.cache_hits += len(resolved)
+            missing = [url for url in wanted if url not in resolved]
+            if missing:
+                fresh, skipped = self._resolve_remote(missing, deadline)
+                self.stats.resolved += len(fresh)
+                self.stats.skipped += skipped
+                self.stats.failed += len(missing) - len(fresh) - skipped
+                now = datetime.now(timezone.utc).isoformat()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO resolved_links VALUES (?, ?, ?)",
+                        [(short, expanded, now) for short, expanded in fresh.items()],
+                    )
+                resolved.update(fresh)
+        finally:
+            conn.close()
+        return resolved
+
+    def _resolve_remote(
+        self, urls: List[str], deadline: Optional[float]
+    ) -> Tuple[Dict[str, str], int]:
+        limits = httpx.Limits(
+            max_connections=self._concurrency, max_keepalive_connections=self._concurrency
+        )
+        with httpx.Client(
+            timeout=self._timeout_seconds,
+            limits=limits,
+            transport=self._transport,
+        ) as client:
+            with ThreadPoolExecutor(max_workers=min(self._concurrency, len(urls))) as pool:
+                results = list(pool.map(lambda url: self._head(client, url, deadline), urls))
+        fresh = {url: final for url, final in zip(urls, results) if final}
+        return fresh, results.count(_SKIPPED)
@@ -1,19 +1,107 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+from dataclasses import asdict, dataclass, field
+import hashlib
+import json
 import os
-from typing import Dict, List, Optional
+from pathlib import Path
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 from langchain_mcp_adapters.client import MultiServerMCPClient
-from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
+from mcp.types import Tool as MCPTool
 
+from daily_research_agent.artifacts.paths import slugify
+from daily_research_agent.artifacts.writer import write_json
 from daily_research_agent.config import MCPServerConfig
+from daily_research_agent.integrations.mcp_health import MCPHealthStore
+from daily_research_agent.pipeline.deadline import wait_with_timeout
+from daily_research_agent.pipeline.event_loop import BlockingCalls
 
 
 @dataclass
 class MCPTools:
     tools: List[BaseTool]
     tool_names: List[str]
+    failed_servers: Dict[str, str] = field(default_factory=dict)
+    cached_servers: List[str] = field(default_factory=list)
+
+
+ToolHandler = Callable[[BaseTool, Dict[str, Any]], Awaitable[Any]]
+
+
+def wrap_tool(tool: BaseTool, handler: ToolHandler) -> BaseTool:
+    """Return a copy of ``tool`` whose calls go through ``handler``.
+
+    The copy keeps the original's schema, ``response_format`` and error
+    handling. ``handler`` receives a tool and the call arguments and is
+    expected to call ``tool.ainvoke(arguments)`` itself (or return a
+    substitute result). For ``content_and_artifact`` tools that tool returns
+    the content only, and the artifact of the call is passed on alongside
+    whatever ``handler`` returns. Tool errors (``ToolException``) propagate
+    through ``handler`` and are turned into the error result by the
+    outermost copy, so handlers can tell failed calls apart.
+    """
+    if not isinstance(tool, StructuredTool) or tool.coroutine is None:
+        inner = tool.model_copy(update={"handle_tool_error": False})
+
+        async def _call(**arguments: Any) -> Any:
+            return await handler(inner, arguments)
+
+        return StructuredTool(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            coroutine=_call,
+            metadata=tool.metadata,
+            handle_tool_error=tool.handle_tool_error,
+            handle_validation_error=tool.handle_validation_error,
+        )
+
+    if tool.response_format != "content_and_artifact":
+        inner = tool.model_copy(update={"handle_tool_error": False})
+
+        async def _call(**arguments: Any) -> Any:
+            return await handler(inner, arguments)
+
+        return tool.model_copy(update={"coroutine": _call})
+
+    original = tool.coroutine
+
+    async def _call_with_artifact(**arguments: Any) -> Tuple[Any, Any]:
+        artifacts: List[Any] = []
+
+        async def _content(**kwargs: Any) -> Any:
+            content, artifact = await original(**kwargs)
+            artifacts.append(artifact)
+            return content
+
+        view = tool.model_copy(
+            update={"coroutine": _content, "response_format": "content", "handle_tool_error": False}
+        )
+        result = await handler(view, arguments)
+        # A substituted result (refusal, replay, open circuit) has no artifact.
+        return result, artifacts[-1] if artifacts else None
+
+    return tool.model_copy(update={"coroutine": _call_with_artifact})
+
+
+def content_to_text(content: Any) -> str:
+    """Flatten tool/message content (a string or a list of content blocks) to text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for block in content:
+            if isinstance(block, str):
+                parts.append(block)
+            elif isinstance(block, dict) and block.get("type") == "text":
+                parts.append(block.get("text", ""))
+        return "\n".join(parts)
+    return str(content)
 
 
 def _server_to_config(server: MCPServerConfig) -> dict:
@@ -36,18 +124,268 @@ def _server_to_config(server: MCPServerConfig) -> dict:
     raise ValueError(f"Unsupported MCP transport: {server.transport}")
 
 
+CIRCUIT_OPEN_MESSAGE = (
+    "The {server} MCP server is failing repeatedly and has been disabled for now. "
+    "Use other tools or finalize with what you have."
+)
+
+
+class CircuitOpenMessage(str):
+    """The substitute result returned while a server's circuit is open."""
+
+
+class MCPConnectError(RuntimeError):
+    pass
+
+
+def _server_config_hash(server: MCPServerConfig) -> str:
+    payload = json.dumps(asdict(server), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _describe_error(exc: BaseException) -> str:
+    # anyio task groups wrap the real failure in (nested) exception groups.
+    while isinstance(exc, BaseExceptionGroup) and exc.exceptions:
+        exc = exc.exceptions[0]
+    return str(exc) or type(exc).__name__
+
+
+def _tool_schema(tool: BaseTool) -> Dict[str, Any]:
+    schema = tool.args_schema
+    if schema is not None and not isinstance(schema, dict):
+        schema = schema.model_json_schema()
+    return {
+        "name": tool.name,
+        "description": tool.description,
+        "input_schema": schema or {"type": "object", "properties": {}},
+    }
+
+
 class MCPResearchClient:
-    def __init__(self, servers: List[MCPServerConfig]) -> None:
+    def __init__(
+        self,
+        servers: List[MCPServerConfig],
+        connect_timeout_seconds: float = 0,
+        schema_cache_dir: Optional[Path] = None,
+        schema_cache_ttl_hours: float = 24,
+        lazy_stdio: bool = False,
+        health: Optional[MCPHealthStore] = None,
+        blocking: Optional[BlockingCalls] = None,
+    ) -> None:
         self._servers = servers
+        self._connect_timeout_seconds = connect_timeout_seconds
+        self._schema_cache_dir = schema_cache_dir
+        self._schema_cache_ttl_seconds = schema_cache_ttl_hours * 3600
+        self._lazy_stdio = lazy_stdio
+        self._health = health
+        # Health updates and the schema cache touch disk on every call.
+        self._blocking = blocking or BlockingCalls(offload=False)
         self._client: Optional[MultiServerMCPClient] = None
         self._tools: List[BaseTool] = []
+        # Servers still connecting when the last connect()'s time ran out.
+        self.cut_off_servers: List[str] = []
+
+    async def connect(self, timeout: Optional[float] = None) -> MCPTools:
+        """Connect every server concurrently and collect their tools.
 
-    async def connect(self) -> MCPTools:
+        Servers still connecting after ``timeout`` seconds are cancelled and
+        reported as failed (and in ``cut_off_servers``); the ones that made it
+        are kept.
+        """
         server_configs = {s.name: _server_to_config(s) for s in self._servers}
         self._client = MultiServerMCPClient(server_configs)
-        self._tools = await self._client.get_tools()
+
+        failed_servers: Dict[str, str] = {}
+        servers = list(self._servers)
+        cached = {
+            s.name: await self._blocking.run(self._load_cached_schemas, s)
+            for s in servers
+            if s.transport != "stdio" or self._lazy_stdio
+        }
+        if self._health is not None:
+            health = self._health
+            servers.sort(key=lambda s: health.priority(s.name))
+            for server in list(servers):
+                # A server served from cached schemas isn't contacted here, so
+                # it must not take the half-open probe: its first tool call is.
+                admitted = (
+                    health.available(server.name)
+                    if cached.get(server.name) is not None
+                    else await self._blocking.run(health.allow, server.name)
+                )
+                if not admitted:
+                    failed_servers[server.name] = "circuit open"
+                    servers.remove(server)
+
+        started = time.monotonic()
+        tasks = [
+            asyncio.ensure_future(
+                self._connect_server(s, server_configs[s.name], cached.get(s.name))
+            )
+            for s in servers
+        ]
+        pending: Set[asyncio.Future] = set()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            # Stdio sessions may surface cancellation as an exception group.
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        self._tools = []
+        self.cut_off_servers = []
+        cached_servers: List[str] = []
+        for server, task in zip(servers, tasks):
+            if task in pending:
+                self.cut_off_servers.append(server.name)
+                failed_servers[server.name] = f"connect cut off by the deadline ({timeout:.1f}s)"
+                if self._health is not None:
+                    await self._blocking.run(
+                        self._health.record_failure,
+                        server.name,
+                        "connect",
+                        time.monotonic() - started,
+                        "deadline",
+                    )
+                continue
+            if task.exception() is not None:
+                failed_servers[server.name] = _describe_error(task.exception())
+                continue
+            tools, from_cache = task.result()
+            self._tools.extend(tools)
+            if from_cache:
+                cached_servers.append(server.name)
+
+        if failed_servers and len(failed_servers) == len(self._servers):
+            raise MCPConnectError(f"All MCP servers failed: {failed_servers}")
         tool_names = [tool.name for tool in self._tools]
-        return MCPTools(tools=self._tools, tool_names=tool_names)
+        return MCPTools(
+            tools=self._tools,
+            tool_names=tool_names,
+            failed_servers=failed_servers,
+            cached_servers=cached_servers,
+        )
+
+    async def _connect_server(
+        self,
+        server: MCPServerConfig,
+        connection: Dict[str, Any],
+        cached: Optional[List[Dict[str, Any]]],
+    ) -> Tuple[List[BaseTool], bool]:
+        # Cached schemas let stdio servers start on their first tool call
+        # instead of during discovery.
+        if cached is not None:
+            tools = [
+                convert_mcp_tool_to_langchain_tool(
+                    None,
+                    MCPTool(
+                        name=item["name"],
+                        description=item.get("description") or "",
+                        inputSchema=item.get("input_schema") or {"type": "object"},
+                    ),
+                    connection=connection,
+                    server_name=server.name,
+                )
+                for item in cached
+            ]
+            return self._track_tools(server.name, tools), True
+
+        assert self._client is not None
+        timeout = self._connect_timeout_seconds or None
+        started = time.monotonic()
+        try:
+            tools = await wait_with_timeout(
+                self._client.get_tools(server_name=server.name), timeout
+            )
+        except Exception as exc:
+            if isinstance(exc, asyncio.TimeoutError):
+                exc = MCPConnectError(
+                    f"{server.name}: connect timed out after {self._connect_timeout_seconds:g}s"
+                )
+            if self._health is not None:
+                await self._blocking.run(
+                    self._health.record_failure,
+                    server.name,
+                    "connect",
+                    time.monotonic() - started,
+                    _describe_error(exc),
+                )
+            raise exc
+        if self._health is not None:
+            await self._blocking.run(
+                self._health.record_success, server.name, "connect", time.monotonic() - started
+            )
+        await self._blocking.run(self._save_cached_schemas, server, tools)
+        return self._track_tools(server.name, tools), False
+
+    def _track_tools(self, server_name: str, tools: List[BaseTool]) -> List[BaseTool]:
+        if self._health is None:
+            return tools
+        health = self._health
+        blocking = self._blocking
+
+        async def _call(tool: BaseTool, arguments: Dict[str, Any]) -> Any:
+            if not await blocking.run(health.allow, server_name):
+                return CircuitOpenMessage(CIRCUIT_OPEN_MESSAGE.format(server=server_name))
+            started = time.monotonic()
+            try:
+                result = await tool.ainvoke(arguments)
+            except asyncio.CancelledError:
+                # Budget/deadline timeouts cancel the call; count them as failures.
+                # Recorded inline: awaiting here would be cancelled too.
+                health.record_failure(server_name, "call", time.monotonic() - started, "cancelled")
+                raise
+            except ToolException:
+                # The server answered with an error result; the server itself is fine.
+                await blocking.run(
+                    health.record_success, server_name, "call", time.monotonic() - started
+                )
+                raise
+            except Exception as exc:
+                await blocking.run(
+                    health.record_failure,
+                    server_name,
+                    "call",
+                    time.monotonic() - started,
+                    _describe_error(exc),
+                )
+                raise
+            await blocking.run(health.record_success, server_name, "call", time.monotonic() - started)
+            return result
+
+        return [wrap_tool(tool, _call) for tool in tools]
+
+    def _schema_cache_path(self, server: MCPServerConfig) -> Optional[Path]:
+        if self._schema_cache_dir is None:
+            return None
+        name = slugify(server.name)
+        return self._schema_cache_dir / f"{name}-{_server_config_hash(server)}.json"
+
+    def _load_cached_schemas(self, server: MCPServerConfig) -> Optional[List[Dict[str, Any]]]:
+        path = self._schema_cache_path(server)
+        if path is None or not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() - float(payload.get("fetched_at", 0)) > self._schema_cache_ttl_seconds:
+            return None
+        tools = payload.get("tools")
+        return tools if isinstance(tools, list) and tools else None
+
+    def _save_cached_schemas(self, server: MCPServerConfig, tools: List[BaseTool]) -> None:
+        path = self._schema_cache_path(server)
+        if path is None or not tools:
+            return
+        write_json(
+            path,
+            {
+                "server": server.name,
+                "fetched_at": time.time(),
+                "tools": [_tool_schema(tool) for tool in tools],
+            },
+        )
 
     async def close(self) -> None:
         if self._client is not None:
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+import json
+from pathlib import Path
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from daily_research_agent.config import MCPCircuitBreakerConfig
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+T = TypeVar("T")
+
+
+def health_file_path(state_dir: Path) -> Path:
+    return state_dir / "mcp_health.sqlite"
+
+
+def _legacy_health_file(state_dir: Path) -> Path:
+    return state_dir / "mcp_health.json"
+
+
+@dataclass
+class LatencyHistogram:
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    count: int = 0
+    total_seconds: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = len(LATENCY_BUCKETS)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                index = i
+                break
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_seconds += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for i, bucket in enumerate(self.buckets):
+            cumulative += bucket
+            if cumulative >= target:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else float("inf")
+        return float("inf")
+
+
+@dataclass
+class ServerHealth:
+    name: str
+    state: str = STATE_CLOSED
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+    last_success_at: Optional[float] = None
+    last_failure_at: Optional[float] = None
+    last_error: Optional[str] = None
+    # Set while a half-open probe call is in flight.
+    probe_started_at: Optional[float] = None
+    connect_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    call_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "ServerHealth":
+        data = dict(payload)
+        for key in ("connect_latency", "call_latency"):
+            data[key] = LatencyHistogram(**data.get(key, {}))
+        return cls(**data)
+
+    @property
+    def failure_rate(self) -> float:
+        total = self.successes + self.failures
+        return self.failures / total if total else 0.0
+
+
+class MCPHealthStore:
+    """Per-server MCP health persisted across runs, with a circuit breaker.
+
+    A server whose consecutive failures reach ``failure_threshold`` is opened
+    and skipped until ``cooldown_seconds`` have passed; it is then half-open and
+    admits a single probe call, closing again on success and re-opening on
+    failure. Further calls are refused while the probe is in flight (a probe
+    older than the cooldown is assumed lost and replaced).
+
+    State lives in SQLite and every change is a read-modify-write of one
+    server's row inside an immediate transaction, so concurrent runs sharing
+    ``state_dir`` don't overwrite each other's updates.
+    """
+
+    def __init__(self, path: Path, failure_threshold: int = 3, cooldown_seconds: float = 3600) -> None:
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        # Snapshot of the stored state, refreshed by load() and every update.
+        self.servers: Dict[str, ServerHealth] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS servers (
+                name TEXT PRIMARY KEY,
+                health TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        return conn
+
+    def load(self, legacy_path: Optional[Path] = None) -> "MCPHealthStore":
+        conn = self._connect()
+        try:
+            if legacy_path is not None and legacy_path.exists():
+                self._import_legacy(conn, legacy_path)
+            rows = conn.execute("SELECT name, health FROM servers").fetchall()
+        finally:
+            conn.close()
+        for name, payload in rows:
+            try:
+                self.servers[name] = ServerHealth.from_dict(json.loads(payload))
+            except (TypeError, json.JSONDecodeError):
+                continue
+        return self
+
+    def _import_legacy(self, conn: sqlite3.Connection, legacy_path: Path) -> None:
+        # Health used to live in one JSON file; carry it over once.
+        try:
+            payload = json.loads(legacy_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        conn.executemany(
+            "INSERT OR IGNORE INTO servers VALUES (?, ?, ?)",
+            [
+                (name, json.dumps(item), time.time())
+                for name, item in payload.get("servers", {}).items()
+                if isinstance(item, dict)
+            ],
+        )
+        legacy_path.rename(legacy_path.with_suffix(".json.imported"))
+
+    def _update(self, name: str, change: Callable[[ServerHealth], T]) -> T:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT health FROM servers WHERE name = ?", (name,)).fetchone()
+            health = ServerHealth(name=name)
+            if row is not None:
+                try:
+                    health = ServerHealth.from_dict(json.loads(row[0]))
+                except (TypeError, json.JSONDecodeError):
+                    pass
+            result = change(health)
+            conn.execute(
+                "INSERT OR REPLACE INTO servers VALUES (?, ?, ?)",
+                (name, json.dumps(asdict(health)), time.time()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        self.servers[name] = health
+        return result
+
+    def get(self, name: str) -> ServerHealth:
+        health = self.servers.get(name)
+        if health is None:
+            health = ServerHealth(name=name)
+            self.servers[name] = health
+        return health
+
+    def available(self, name: str) -> bool:
+        """Whether ``allow`` could admit a call now, without taking the probe."""
+        health = self.get(name)
+        now = time.time()
+        if health.state == STATE_OPEN:
+            return now - (health.opened_at or 0) >= self.cooldown_seconds
+        if health.state == STATE_HALF_OPEN:
+            return health.probe_started_at is None or (
+                now - health.probe_started_at >= self.cooldown_seconds
+            )
+        return True
+
+    def allow(self, name: str) -> bool:
+        cached = self.servers.get(name)
+        if cached is not None and cached.state == STATE_CLOSED:
+            # Fast path; a breaker opened by another run is picked up on the
+            # next failure recorded here.
+            return True
+
+        def _admit(health: ServerHealth) -> bool:
+            now = time.time()
+            if health.state == STATE_CLOSED:
+                return True
+            if health.state == STATE_HALF_OPEN:
+                probing = health.probe_started_at is not None and (
+                    now - health.probe_started_at < self.cooldown_seconds
+                )
+                if probing:
+                    return False
+            elif now - (health.opened_at or 0) < self.cooldown_seconds:
+                return False
+            health.state = STATE_HALF_OPEN
+            health.probe_started_at = now
+            return True
+
+        return self._update(name, _admit)
+
+    def record_success(self, name: str, kind: str, seconds: float) -> None:
+        def _apply(health: ServerHealth) -> None:
+            self._latency(health, kind).observe(seconds)
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.last_success_at = time.time()
+            health.state = STATE_CLOSED
+            health.opened_at = None
+            health.probe_started_at = None
+
+        self._update(name, _apply)
+
+    def record_failure(self, name: str, kind: str, seconds: float, error: str) -> None:
+        def _apply(health: ServerHealth) -> None:
+            self._latency(health, kind).observe(seconds)
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.last_failure_at = time.time()
+            health.last_error = error[:500]
+            if health.state == STATE_HALF_OPEN or (
+                self.failure_threshold > 0
+                and health.consecutive_failures >= self.failure_threshold
+            ):
+                health.state = STATE_OPEN
+                health.opened_at = time.time()
+                health.probe_started_at = None
+
+        self._update(name, _apply)
+
+    def priority(self, name: str) -> tuple:
+        # Healthy, reliable, fast servers first.
+        health = self.get(name)
+        p50 = health.call_latency.quantile(0.5) or health.connect_latency.quantile(0.5) or 0.0
+        return (health.state != STATE_CLOSED, round(health.failure_rate, 2), p50)
+
+    @staticmethod
+    def _latency(health: ServerHealth, kind: str) -> LatencyHistogram:
+        return health.connect_latency if kind == "connect" else health.call_latency
+
+
+def load_health_store(state_dir: Path, config: MCPCircuitBreakerConfig) -> MCPHealthStore:
+    # With the breaker disabled health is still recorded, but nothing opens.
+    return MCPHealthStore(
+        health_file_path(state_dir),
+        failure_threshold=config.failure_threshold if config.enabled else 0,
+        cooldown_seconds=config.cooldown_minutes * 60,
+    ).load(_legacy_health_file(state_dir))
@@ -1,14 +1,33 @@
 from __future__ import annotations
 
-from dataclasses import asdict
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime, timezone
 import json
 import sqlite3
+import time
 from typing import Dict, Iterable, List, Optional, Tuple
 
 import httpx
 
 from daily_research_agent.domain.models import BookmarkPost
+from daily_research_agent.integrations.link_expansion import (
+    LinkResolver,
+    entity_links,
+    expanded_links,
+    shortlinks,
+)
+
+# The trigram tokenizer can't match terms shorter than three characters.
+MIN_MATCH_CHARS = 3
+_POST_COLUMNS = (
+    "b.id, b.url, b.text, b.author_username, b.author_name, b.created_at, "
+    "b.referenced_posts, b.expanded_urls"
+)
+
+
+REQUEST_TIMEOUT_SECONDS = 30.0
+# Link resolution stops this long before the deadline so the cache write fits.
+CACHE_WRITE_RESERVE_SECONDS = 1.0
 
 
 class XBookmarksError(RuntimeError):
@@ -17,11 +36,41 @@ class XBookmarksError(RuntimeError):
         self.status_code = status_code
 
 
+class XDeadlineExceeded(XBookmarksError):
+    """The fetch ran out of time before touching the cache."""
+
+
+def _check_deadline(deadline: Optional[float]) -> None:
+    if deadline is not None and time.monotonic() >= deadline:
+        raise XDeadlineExceeded("X bookmarks fetch exceeded its deadline")
+
+
+def _request_timeout(deadline: Optional[float]) -> float:
+    _check_deadline(deadline)
+    if deadline is None:
+        return REQUEST_TIMEOUT_SECONDS
+    return min(REQUEST_TIMEOUT_SECONDS, deadline - time.monotonic())
+
+
+@dataclass
+class XFetchStats:
+    pages: int = 0
+    posts_seen: int = 0
+    cache_hits: int = 0
+    new_posts: int = 0
+    links_from_entities: int = 0
+    links_resolved: int = 0
+    links_cached: int = 0
+    links_unresolved: int = 0
+    links_skipped: int = 0
+
+
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _init_db(conn: sqlite3.Connection) -> None:
+def init_bookmark_db(conn: sqlite3.Connection) -> None:
+    """Create the bookmark cache tables if they don't exist yet."""
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS bookmarks (
@@ -32,16 +81,86 @@ def _init_db(conn: sqlite3.Connection) -> None:
             author_name TEXT NOT NULL,
             created_at TEXT NOT NULL,
             referenced_posts TEXT,
-            fetched_at TEXT NOT NULL
+            fetched_at TEXT NOT NULL,
+            expanded_urls TEXT
         )
         """
     )
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(bookmarks)")}
+    if "expanded_urls" not in columns:
+        conn.execute("ALTER TABLE bookmarks ADD COLUMN expanded_urls TEXT")
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_bookmarks_fetched_at ON bookmarks(fetched_at)"
     )
+    has_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bookmarks_fts'"
+    ).fetchone()
+    if not has_fts:
+        # Full-text index over the cache, kept in step with inserts and
+        # evictions by triggers; an existing cache is indexed once here.
+        conn.executescript(
+            """
+            CREATE VIRTUAL TABLE bookmarks_fts USING fts5(
+                text, author_username, author_name,
+                content='bookmarks', content_rowid='rowid', tokenize='trigram'
+            );
+            CREATE TRIGGER bookmarks_fts_ai AFTER INSERT ON bookmarks BEGIN
+                INSERT INTO bookmarks_fts (rowid, text, author_username, author_name)
+                VALUES (new.rowid, new.text, new.author_username, new.author_name);
+            END;
+            CREATE TRIGGER bookmarks_fts_ad AFTER DELETE ON bookmarks BEGIN
+                INSERT INTO bookmarks_fts (bookmarks_fts, rowid, text, author_username, author_name)
+                VALUES ('delete', old.rowid, old.text, old.author_username, old.author_name);
+            END;
+            INSERT INTO bookmarks_fts (bookmarks_fts) VALUES ('rebuild');
+            """
+        )
     conn.commit()
 
 
+def _keyword_filter(keywords: List[str]) -> Tuple[str, List[str]]:
+    """SQL condition on ``b`` matching any of ``keywords``.
+
+    Keywords of three or more characters go through the FTS index; shorter
+    ones fall back to LIKE.
+    """
+    clauses: List[str] = []
+    params: List[str] = []
+    phrases = [term for term in keywords if len(term) >= MIN_MATCH_CHARS]
+    if phrases:
+        clauses.append(
+            "b.rowid IN (SELECT rowid FROM bookmarks_fts WHERE bookmarks_fts MATCH ?)"
+        )
+        params.append(" OR ".join('"' + term.replace('"', '""') + '"' for term in phrases))
+    for term in keywords:
+        if len(term) < MIN_MATCH_CHARS:
+            clauses.append("b.text LIKE ?")
+            params.append(f"%{term}%")
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def bookmark_filter_sql(
+    keywords: Optional[List[str]] = None, authors: Optional[List[str]] = None
+) -> Tuple[str, List[str]]:
+    """SQL condition on ``b`` for a preset's bookmark filter.
+
+    A post passes when it matches any of ``keywords`` and was written by one
+    of ``authors``; an empty list doesn't restrict.
+    """
+    clauses: List[str] = []
+    params: List[str] = []
+    terms = [term.strip() for term in keywords or [] if term.strip()]
+    if terms:
+        clause, clause_params = _keyword_filter(terms)
+        clauses.append(clause)
+        params.extend(clause_params)
+    names = [name.strip().lstrip("@").lower() for name in authors or [] if name.strip()]
+    if names:
+        clauses.append(f"lower(b.author_username) IN ({','.join('?' for _ in names)})")
+        params.extend(names)
+    return " AND ".join(clauses) or "1", params
+
+
 def _get_cached_ids(conn: sqlite3.Connection, ids: Iterable[str]) -> set[str]:
     id_list = list(ids)
     if not id_list:
@@ -57,8 +176,9 @@ def _insert_bookmark(conn: sqlite3.Connection, post: BookmarkPost) -> None:
     conn.execute(
         """
         INSERT OR IGNORE INTO bookmarks (
-            id, url, text, author_username, author_name, created_at, referenced_posts, fetched_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            id, url, text, author_username, author_name, created_at, referenced_posts, fetched_at,
+            expanded_urls
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
         (
             post.id,
@@ -69,6 +189,7 @@ def _insert_bookmark(conn: sqlite3.Connection, post: BookmarkPost) -> None:
             post.created_at,
             json.dumps([asdict(p) for p in post.referenced_posts], ensure_ascii=False),
             _utc_now_iso(),
+            json.dumps(post.expanded_urls, ensure_ascii=False),
         ),
     )
 
@@ -115,6 +236,7 @@ def _parse_cached_posts(raw: str) -> List[BookmarkPost]:
                 author_name=item.get("author_name", ""),
                 created_at=item.get("created_at", ""),
                 referenced_posts=[],
+                expanded_urls=list(item.get("expanded_urls") or []),
             )
         )
     return posts
@@ -124,39 +246,105 @@ def load_cached_bookmarks(
     cache_path: str,
     limit: int,
     exclude_ids: Optional[set[str]] = None,
+    keywords: Optional[List[str]] = None,
+    authors: Optional[List[str]] = None,
 ) -> List[BookmarkPost]:
     if limit <= 0:
         return []
     exclude_ids = exclude_ids or set()
+    where, params = bookmark_filter_sql(keywords, authors)
     conn = sqlite3.connect(cache_path)
-    _init_db(conn)
+    init_bookmark_db(conn)
     rows = conn.execute(
-        """
-        SELECT id, url, text, author_username, author_name, created_at, referenced_posts
-        FROM bookmarks
-        ORDER BY created_at DESC
+        f"""
+        SELECT {_POST_COLUMNS}
+        FROM bookmarks b
+        WHERE {where}
+        ORDER BY b.created_at DESC
         LIMIT ?
         """,
-        (limit,),
+        (*params, limit),
     ).fetchall()
     conn.close()
-    posts = []
-    for row in rows:
-        if row[0] in exclude_ids:
-            continue
-        referenced = _parse_cached_posts(row[6] or "")
-        posts.append(
-            BookmarkPost(
-                id=row[0],
-                url=row[1],
-                text=row[2],
-                author_username=row[3],
-                author_name=row[4],
-                created_at=row[5],
-                referenced_posts=referenced,
-            )
+    return [_row_to_post(row) for row in rows if row[0] not in exclude_ids]
+
+
+def search_cached_bookmarks(
+    cache_path: str,
+    query: Optional[str] = None,
+    authors: Optional[List[str]] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = 20,
+) -> List[BookmarkPost]:
+    """Search the cache; every filter is optional and they combine with AND.
+
+    All query terms must match. ``since``/``until`` are inclusive ISO dates
+    on the post's creation time. Results with a query are ranked by BM25,
+    otherwise newest first.
+    """
+    terms = (query or "").split()
+    phrases = [term for term in terms if len(term) >= MIN_MATCH_CHARS]
+    short = [term for term in terms if len(term) < MIN_MATCH_CHARS]
+    author_where, params = bookmark_filter_sql(authors=authors)
+    clauses = [author_where]
+    for term in short:
+        clauses.append("b.text LIKE ?")
+        params.append(f"%{term}%")
+    if since:
+        clauses.append("substr(b.created_at, 1, 10) >= ?")
+        params.append(since)
+    if until:
+        clauses.append("substr(b.created_at, 1, 10) <= ?")
+        params.append(until)
+    where = " AND ".join(clauses)
+    if phrases:
+        match_expr = " AND ".join('"' + term.replace('"', '""') + '"' for term in phrases)
+        sql = (
+            f"SELECT {_POST_COLUMNS} FROM bookmarks_fts "
+            "JOIN bookmarks b ON b.rowid = bookmarks_fts.rowid "
+            f"WHERE bookmarks_fts MATCH ? AND {where} "
+            "ORDER BY bm25(bookmarks_fts), b.created_at DESC LIMIT ?"
         )
-    return posts
+        params = [match_expr, *params]
+    else:
+        sql = f"SELECT {_POST_COLUMNS} FROM bookmarks b WHERE {where} ORDER BY b.created_at DESC LIMIT ?"
+    conn = sqlite3.connect(cache_path)
+    try:
+        init_bookmark_db(conn)
+        rows = conn.execute(sql, (*params, limit)).fetchall()
+    finally:
+        conn.close()
+    return [_row_to_post(row) for row in rows]
+
+
+def load_cached_bookmarks_by_ids(cache_path: str, ids: List[str]) -> List[BookmarkPost]:
+    """Cached posts for ``ids``, in the order given."""
+    if not ids:
+        return []
+    conn = sqlite3.connect(cache_path)
+    init_bookmark_db(conn)
+    placeholders = ",".join("?" for _ in ids)
+    rows = conn.execute(
+        f"SELECT {_POST_COLUMNS} FROM bookmarks b WHERE b.id IN ({placeholders})",
+        ids,
+    ).fetchall()
+    conn.close()
+    by_id = {row[0]: _row_to_post(row) for row in rows}
+    return [by_id[post_id] for post_id in ids if post_id in by_id]
+
+
+def _row_to_post(row: Tuple) -> BookmarkPost:
+    return BookmarkPost(
+        id=row[0],
+        url=row[1],
+        text=row[2],
+        author_username=row[3],
+        author_name=row[4],
+        created_at=row[5],
+        referenced_posts=_parse_cached_posts(row[6] or ""),
+        expanded_urls=json.loads(row[7]) if row[7] else [],
+    )
 
 
 def _merge_with_cache(
@@ -182,6 +370,24 @@ def _index_includes(payload: Dict) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
     return users, tweets
 
 
+def _missing_links(tweet: Dict) -> List[str]:
+    """t.co links in the text that the payload's entities don't expand."""
+    links = entity_links(tweet) or {}
+    return [link for link in shortlinks(tweet.get("text", "")) if link not in links]
+
+
+def _with_resolved_links(
+    post: BookmarkPost, missing: Dict[str, List[str]], resolved: Dict[str, str]
+) -> BookmarkPost:
+    referenced = [_with_resolved_links(ref, missing, resolved) for ref in post.referenced_posts]
+    extra = [resolved[link] for link in missing.get(post.id, []) if link in resolved]
+    return replace(
+        post,
+        referenced_posts=referenced,
+        expanded_urls=expanded_links([*post.expanded_urls, *extra]),
+    )
+
+
 def _parse_post(tweet: Dict, users: Dict[str, Dict], referenced_posts: List[BookmarkPost]) -> BookmarkPost:
     author = users.get(tweet.get("author_id"), {})
     username = author.get("username", "unknown")
@@ -194,11 +400,16 @@ def _parse_post(tweet: Dict, users: Dict[str, Dict], referenced_posts: List[Book
         author_name=name,
         created_at=tweet.get("created_at", ""),
         referenced_posts=referenced_posts,
+        expanded_urls=expanded_links((entity_links(tweet) or {}).values()),
     )
 
 
 def _collect_referenced(
-    tweet: Dict, tweets: Dict[str, Dict], users: Dict[str, Dict], resolve_depth: int
+    tweet: Dict,
+    tweets: Dict[str, Dict],
+    users: Dict[str, Dict],
+    resolve_depth: int,
+    missing_links: Optional[Dict[str, List[str]]] = None,
 ) -> List[BookmarkPost]:
     if resolve_depth <= 0:
         return []
@@ -210,20 +421,35 @@ def _collect_referenced(
         if not ref_tweet:
             continue
         referenced.append(_parse_post(ref_tweet, users, []))
+        missing = _missing_links(ref_tweet)
+        if missing_links is not None and missing:
+            missing_links[ref_tweet["id"]] = missing
     return referenced
 
 
 class XBookmarksClient:
-    def __init__(self, base_url: str, access_token: str, cache_path: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        access_token: str,
+        cache_path: str,
+        transport: Optional[httpx.BaseTransport] = None,
+    ) -> None:
         self._base_url = base_url.rstrip("/")
         self._access_token = access_token
         self._cache_path = cache_path
+        self._transport = transport
 
     def _headers(self) -> Dict[str, str]:
         return {"Authorization": f"Bearer {self._access_token}"}
 
     def _client(self) -> httpx.Client:
-        return httpx.Client(base_url=self._base_url, headers=self._headers(), timeout=30.0)
+        return httpx.Client(
+            base_url=self._base_url,
+            headers=self._headers(),
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            transport=self._transport,
+        )
 
     def fetch_bookmarks(
         self,
@@ -232,70 +458,120 @@ class XBookmarksClient:
         resolve_depth: int,
         max_cached_posts: int,
         enabled_cache: bool,
+        stats: Optional[XFetchStats] = None,
+        link_resolver: Optional[LinkResolver] = None,
+        deadline: Optional[float] = None,
     ) -> List[BookmarkPost]:
+        """Fetch new bookmarks, merging them into the cache when enabled.
+
+        t.co links come expanded from the API's URL entities; any the payload
+        leaves unexpanded are resolved by ``link_resolver`` when given.
+
+        ``deadline`` (a ``time.monotonic()`` value) caps every request's
+        timeout; once it passes, ``XDeadlineExceeded`` is raised before the
+        cache is written, so a caller that gave up can read the cache safely.
+        Link resolution stops ``CACHE_WRITE_RESERVE_SECONDS`` earlier and
+        keeps the short URLs it didn't get to.
+        """
+        stats = stats if stats is not None else XFetchStats()
         if max_results <= 0:
             return []
         if not self._access_token:
             raise XBookmarksError("X_USER_ACCESS_TOKEN is not set")
 
         conn = sqlite3.connect(self._cache_path)
-        _init_db(conn)
-
-        new_posts: List[BookmarkPost] = []
-        seen_streak = 0
-
-        with self._client() as client:
-            user_id = self._get_user_id(client)
-            next_token: Optional[str] = None
-
-            while True:
-                payload = self._get_bookmarks_page(
-                    client,
-                    user_id,
-                    max_results,
-                    next_token,
-                    resolve_depth,
-                )
-                data = payload.get("data", [])
-                if not data:
-                    break
-                users, tweets = _index_includes(payload)
-                ids = [tweet["id"] for tweet in data]
-                cached_ids = _get_cached_ids(conn, ids) if enabled_cache else set()
-
-                for tweet in data:
-                    if enabled_cache and tweet["id"] in cached_ids:
-                        seen_streak += 1
-                        if seen_streak >= stop_on_seen_streak:
-                            break
-                        continue
-
-                    referenced = _collect_referenced(tweet, tweets, users, resolve_depth)
-                    post = _parse_post(tweet, users, referenced)
-                    new_posts.append(post)
-                    seen_streak = 0
-                    if enabled_cache:
-                        _insert_bookmark(conn, post)
-                    if len(new_posts) >= max_results:
+        init_bookmark_db(conn)
+        try:
+            new_posts: List[BookmarkPost] = []
+            missing_links: Dict[str, List[str]] = {}
+            seen_streak = 0
+
+            with self._client() as client:
+                user_id = self._get_user_id(client, deadline)
+                next_token: Optional[str] = None
+
+                while True:
+                    payload = self._get_bookmarks_page(
+                        client,
+                        user_id,
+                        max_results,
+                        next_token,
+                        resolve_depth,
+                        deadline,
+                    )
+                    data = payload.get("data", [])
+                    stats.pages += 1
+                    if not data:
                         break
+                    users, tweets = _index_includes(payload)
+                    ids = [tweet["id"] for tweet in data]
+                    cached_ids = _get_cached_ids(conn, ids) if enabled_cache else set()
+
+                    for tweet in data:
+                        stats.posts_seen += 1
+                        if enabled_cache and tweet["id"] in cached_ids:
+                            stats.cache_hits += 1
+                            seen_streak += 1
+                            if seen_streak >= stop_on_seen_streak:
+                                break
+                            continue
+
+                        referenced = _collect_referenced(
+                            tweet, tweets, users, resolve_depth, missing_links
+                        )
+                        post = _parse_post(tweet, users, referenced)
+                        missing = _missing_links(tweet)
+                        if missing:
+                            missing_links[post.id] = missing
+                        new_posts.append(post)
+                        stats.new_posts += 1
+                        seen_streak = 0
+                        if len(new_posts) >= max_results:
+                            break
 
-                if len(new_posts) >= max_results or seen_streak >= stop_on_seen_streak:
-                    break
+                    if len(new_posts) >= max_results or seen_streak >= stop_on_seen_streak:
+                        break
 
-                next_token = payload.get("meta", {}).get("next_token")
-                if not next_token:
-                    break
+                    next_token = payload.get("meta", {}).get("next_token")
+                    if not next_token:
+                        break
 
-        if enabled_cache:
-            _cleanup_cache(conn, max_cached_posts)
-        conn.commit()
-        conn.close()
+            stats.links_from_entities = sum(
+                len(post.expanded_urls)
+                + sum(len(ref.expanded_urls) for ref in post.referenced_posts)
+                for post in new_posts
+            )
+            if link_resolver is not None and missing_links:
+                _check_deadline(deadline)
+                links = [link for group in missing_links.values() for link in group]
+                resolved = link_resolver.resolve(
+                    links,
+                    deadline - CACHE_WRITE_RESERVE_SECONDS if deadline is not None else None,
+                )
+                new_posts = [_with_resolved_links(post, missing_links, resolved) for post in new_posts]
+                stats.links_cached = link_resolver.stats.cache_hits
+                stats.links_resolved = link_resolver.stats.resolved
+                stats.links_unresolved = link_resolver.stats.failed
+                stats.links_skipped = link_resolver.stats.skipped
+
+            if enabled_cache:
+                _check_deadline(deadline)
+                for post in new_posts:
+                    _insert_bookmark(conn, post)
+                _cleanup_cache(conn, max_cached_posts)
+            conn.commit()
+        finally:
+            conn.close()
         if enabled_cache:
             return _merge_with_cache(new_posts, self._cache_path, max_results)
         return new_posts[:max_results]
 
-    def _get_user_id(self, client: httpx.Client) -> str:
-        resp = client.get("/2/users/me")
+    def _get_user_id(self, client: httpx.Client, deadline: Optional[float] = None) -> str:
+        try:
+            resp = client.get("/2/users/me", timeout=_request_timeout(deadline))
+        except httpx.TimeoutException:
+            _check_deadline(deadline)
+            raise
         if resp.status_code >= 400:
             raise XBookmarksError(
                 f"X API /2/users/me failed: {resp.status_code} {resp.text}",
@@ -311,9 +587,10 @@ class XBookmarksClient:
         max_results: int,
         pagination_token: Optional[str],
         resolve_depth: int,
+        deadline: Optional[float] = None,
     ) -> Dict:
         expansions = ["author_id"]
-        tweet_fields = ["created_at", "author_id"]
+        tweet_fields = ["created_at", "author_id", "entities"]
         if resolve_depth > 0:
             expansions.extend(["referenced_tweets.id", "referenced_tweets.id.author_id"])
             tweet_fields.append("referenced_tweets")
@@ -325,7 +602,13 @@ class XBookmarksClient:
         }
         if pagination_token:
             params["pagination_token"] = pagination_token
-        resp = client.get(f"/2/users/{user_id}/bookmarks", params=params)
+        try:
+            resp = client.get(
+                f"/2/users/{user_id}/bookmarks", params=params, timeout=_request_timeout(deadline)
+            )
+        except httpx.TimeoutException:
+            _check_deadline(deadline)
+            raise
         if resp.status_code >= 400:
             raise XBookmarksError(
                 f"X API /2/users/{user_id}/bookmarks failed: {resp.status_code} {resp.text}",
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import copy
 import json
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Any
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+import uuid
 
 from daily_research_agent.config import LoggingConfig
 
+RUN_LOGGER_PREFIX = "daily_research_agent.run"
+
 
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
@@ -15,6 +22,9 @@ class JsonFormatter(logging.Formatter):
             "message": record.getMessage(),
             "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S%z"),
         }
+        run_id = getattr(record, "run_id", None)
+        if run_id:
+            payload["run_id"] = run_id
         if record.args:
             if isinstance(record.args, dict):
                 payload.update(record.args)
@@ -23,22 +33,109 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(payload, ensure_ascii=False)
 
 
-def get_logger(log_path: Path, config: LoggingConfig) -> logging.Logger:
-    logger = logging.getLogger("daily_research_agent")
+class _BoundedQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records when the queue is full.
+
+    Records are passed through unformatted so the JSON encoding happens on the
+    listener thread, and the dict payload in ``record.args`` survives.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full; the sentinel must not be dropped.
+        self.queue.put(self._sentinel)
+
+
+class RunLogger(logging.LoggerAdapter):
+    """Logger for a single run.
+
+    Every record is tagged with the run's ``run_id`` and handed to a bounded
+    queue; a listener thread formats and writes it to the run's own handlers.
+    Call ``close()`` when the run ends to flush the queue and release them.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        run_id: str,
+        handler: _BoundedQueueHandler,
+        listener: QueueListener,
+        handlers: List[logging.Handler],
+    ) -> None:
+        super().__init__(logger, {"run_id": run_id})
+        self.run_id = run_id
+        self._queue_handler = handler
+        self._listener = listener
+        self._handlers = handlers
+        self._closed = False
+
+    @property
+    def dropped(self) -> int:
+        return self._queue_handler.dropped
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "queue_size": self._queue_handler.queue.maxsize,
+            "dropped_records": self.dropped,
+        }
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._listener.stop()
+        self.logger.removeHandler(self._queue_handler)
+        for handler in self._handlers:
+            handler.close()
+        logging.Logger.manager.loggerDict.pop(self.logger.name, None)
+
+
+def get_logger(log_path: Path, config: LoggingConfig, run_id: Optional[str] = None) -> RunLogger:
+    run_id = run_id or uuid.uuid4().hex[:8]
+    # A child logger per run: concurrent runs never share or clear handlers.
+    logger = logging.getLogger(f"{RUN_LOGGER_PREFIX}.{run_id}")
     logger.setLevel(getattr(logging, config.level.upper(), logging.INFO))
-    logger.handlers.clear()
+    logger.propagate = False
 
     formatter = JsonFormatter() if config.format == "json" else logging.Formatter()
+    handlers: List[logging.Handler] = []
 
     if config.to_stdout:
         stream_handler = logging.StreamHandler()
         stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
+        handlers.append(stream_handler)
 
     if config.to_file:
         log_path.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_path)
+        file_handler = RotatingFileHandler(
+            log_path,
+            maxBytes=config.max_bytes,
+            backupCount=config.backup_count,
+            encoding="utf-8",
+        )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    log_queue: "queue.Queue[Any]" = queue.Queue(maxsize=config.queue_size)
+    queue_handler = _BoundedQueueHandler(log_queue)
+    listener = _Listener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    logger.addHandler(queue_handler)
 
-    return logger
+    return RunLogger(logger, run_id, queue_handler, listener, handlers)
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import math
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+from daily_research_agent.config import MetricsConfig
+
+METRIC_PREFIX = "daily_research_agent"
+STATE_FILENAME = "metrics_state.json"
+LOCK_FILENAME = "metrics_state.lock"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DURATION_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0)
+
+# name -> (type, help)
+METRICS: Dict[str, Tuple[str, str]] = {
+    "runs_total": ("counter", "Completed orchestrator runs by outcome."),
+    "stage_duration_seconds": ("histogram", "Wall time per orchestrator stage."),
+    "tokens_total": ("counter", "LLM tokens by stage and direction."),
+    "tool_calls_total": ("counter", "Researcher tool calls by result."),
+    "cache_lookups_total": ("counter", "Cache lookups by cache and result."),
+    "cache_hit_ratio": ("gauge", "Cache hit ratio observed in the last run."),
+    "x_cache_fallback_total": ("counter", "Runs that fell back to cached X bookmarks, by reason."),
+    "x_failed_total": ("counter", "Runs whose X stage failed."),
+    "mcp_failed_total": ("counter", "Runs whose MCP or research stage failed."),
+    "last_run_x_failed": ("gauge", "1 if the last run's X stage failed."),
+    "last_run_mcp_failed": ("gauge", "1 if the last run's MCP or research stage failed."),
+    "last_run_success": ("gauge", "1 if the last run produced an article."),
+    "last_run_timestamp_seconds": ("gauge", "Unix time the last run finished."),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(round(float(value), 6))
+
+
+class MetricsRegistry:
+    """Minimal counter/gauge/histogram store rendered in Prometheus text format.
+
+    The state round-trips through JSON so one-shot runs can keep counters and
+    histograms cumulative across processes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Dict[str, Any]]] = {}
+
+    def inc(self, name: str, labels: Dict[str, str], value: float = 1.0) -> None:
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, labels: Dict[str, str], value: float) -> None:
+        with self._lock:
+            self._values.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, labels: Dict[str, str], value: float) -> None:
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.setdefault(
+                _label_key(labels), {"buckets": [0] * len(DURATION_BUCKETS), "sum": 0.0, "count": 0}
+            )
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    hist["buckets"][index] += 1
+            hist["sum"] += value
+            hist["count"] += 1
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, help_text) in METRICS.items():
+                full = f"{METRIC_PREFIX}_{name}"
+                if kind == "histogram":
+                    series = self._histograms.get(name)
+                else:
+                    series = self._values.get(name)
+                if not series:
+                    continue
+                lines.append(f"# HELP {full} {help_text}")
+                lines.append(f"# TYPE {full} {kind}")
+                for key in sorted(series):
+                    if kind != "histogram":
+                        lines.append(f"{full}{_format_labels(key)} {_format_value(series[key])}")
+                        continue
+                    hist = series[key]
+                    for bound, count in zip(DURATION_BUCKETS, hist["buckets"]):
+                        le = ("le", _format_value(bound))
+                        lines.append(f"{full}_bucket{_format_labels(key, le)} {count}")
+                    inf = ("le", "+Inf")
+                    lines.append(f"{full}_bucket{_format_labels(key, inf)} {hist['count']}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {_format_value(hist['sum'])}")
+                    lines.append(f"{full}_count{_format_labels(key)} {hist['count']}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "values": {
+                    name: [[list(map(list, key)), value] for key, value in series.items()]
+                    for name, series in self._values.items()
+                },
+                "histograms": {
+                    name: [[list(map(list, key)), hist] for key, hist in series.items()]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def load(self, payload: Dict[str, Any]) -> None:
+        """Replace the registry's contents with a ``to_dict`` payload."""
+        values = {
+            name: {tuple(map(tuple, key)): value for key, value in series}
+            for name, series in payload.get("values", {}).items()
+        }
+        histograms = {
+            name: {
+                tuple(map(tuple, key)): hist
+                for key, hist in series
+                if len(hist.get("buckets", [])) == len(DURATION_BUCKETS)
+            }
+            for name, series in payload.get("histograms", {}).items()
+        }
+        with self._lock:
+            self._values = values
+            self._histograms = histograms
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "MetricsRegistry":
+        registry = cls()
+        registry.load(payload)
+        return registry
+
+
+class StageClock:
+    """Wall time per orchestrator stage, for metrics and run.json."""
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = round(
+                self.seconds.get(name, 0.0) + time.perf_counter() - started, 3
+            )
+
+
+def record_run(
+    registry: MetricsRegistry,
+    preset: str,
+    run_metadata: Dict[str, Any],
+    stage_seconds: Dict[str, float],
+    outcome: str,
+) -> None:
+    labels = {"preset": preset}
+    registry.inc("runs_total", {**labels, "outcome": outcome})
+    for stage, seconds in stage_seconds.items():
+        registry.observe("stage_duration_seconds", {**labels, "stage": stage}, seconds)
+
+    for stage, budget in (run_metadata.get("budgets") or {}).items():
+        for direction in ("input", "output"):
+            tokens = budget.get(f"{direction}_tokens", 0)
+            if tokens:
+                registry.inc(
+                    "tokens_total", {**labels, "stage": stage, "direction": direction}, tokens
+                )
+        refused = budget.get("refused_tool_calls", 0)
+        timed_out = budget.get("timed_out_tool_calls", 0)
+        errors = budget.get("error_tool_calls", 0)
+        for result, count in (
+            ("ok", budget.get("tool_calls", 0) - timed_out - errors),
+            ("error", errors),
+            ("refused", refused),
+            ("timed_out", timed_out),
+        ):
+            if count > 0:
+                registry.inc("tool_calls_total", {**labels, "stage": stage, "result": result}, count)
+
+    for cache, hits, misses in _cache_lookups(run_metadata):
+        registry.inc("cache_lookups_total", {**labels, "cache": cache, "result": "hit"}, hits)
+        registry.inc("cache_lookups_total", {**labels, "cache": cache, "result": "miss"}, misses)
+        if hits + misses:
+            registry.set("cache_hit_ratio", {**labels, "cache": cache}, hits / (hits + misses))
+
+    fallback = run_metadata.get("x_cache_fallback")
+    if fallback:
+        registry.inc("x_cache_fallback_total", {**labels, "reason": fallback})
+
+    x_failed = bool(run_metadata.get("x_failed"))
+    mcp_failed = bool(run_metadata.get("mcp_failed"))
+    if x_failed:
+        registry.inc("x_failed_total", labels)
+    if mcp_failed:
+        registry.inc("mcp_failed_total", labels)
+    registry.set("last_run_x_failed", labels, float(x_failed))
+    registry.set("last_run_mcp_failed", labels, float(mcp_failed))
+    registry.set("last_run_success", labels, float(outcome == "success"))
+    registry.set("last_run_timestamp_seconds", labels, time.time())
+
+
+def _cache_lookups(run_metadata: Dict[str, Any]) -> List[Tuple[str, int, int]]:
+    lookups = []
+    x_fetch = run_metadata.get("x_fetch")
+    if x_fetch and x_fetch.get("posts_seen"):
+        hits = x_fetch.get("cache_hits", 0)
+        lookups.append(("x_bookmarks", hits, x_fetch["posts_seen"] - hits))
+    schema_cache = run_metadata.get("mcp_schema_cache")
+    if schema_cache:
+        lookups.append(("mcp_tool_schema", schema_cache["hits"], schema_cache["misses"]))
+    return lookups
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+class MetricsExporter:
+    """Process-wide metrics surface.
+
+    In one-shot mode each finished run updates the persisted state and rewrites
+    the node-exporter textfile atomically. The update re-reads the state under
+    a file lock first, so one-shot processes finishing at the same time keep
+    each other's increments. With ``http_port`` set, the same registry is
+    served on ``/metrics`` for as long as the process lives.
+    """
+
+    def __init__(self, config: MetricsConfig, state_dir: Path) -> None:
+        self.config = config
+        self.state_path = state_dir / STATE_FILENAME
+        self.lock_path = state_dir / LOCK_FILENAME
+        self.registry = MetricsRegistry()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        if self.config.persist:
+            self._load_state()
+
+    def _load_state(self) -> None:
+        if not self.state_path.exists():
+            return
+        try:
+            payload = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        self.registry.load(payload)
+
+    def serve(self) -> None:
+        if self._server is not None or self.config.http_port <= 0:
+            return
+        handler = type("Handler", (_MetricsHandler,), {"registry": self.registry})
+        self._server = ThreadingHTTPServer((self.config.http_host, self.config.http_port), handler)
+        thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-http", daemon=True
+        )
+        thread.start()
+
+    def record(
+        self,
+        preset: str,
+        run_metadata: Dict[str, Any],
+        stage_seconds: Dict[str, float],
+        outcome: str,
+    ) -> None:
+        with self._lock:
+            if not self.config.persist:
+                record_run(self.registry, preset, run_metadata, stage_seconds, outcome)
+                self._write_textfile()
+                return
+            with _file_lock(self.lock_path):
+                # Another process may have recorded a run since we last looked.
+                self._load_state()
+                record_run(self.registry, preset, run_metadata, stage_seconds, outcome)
+                _atomic_write(self.state_path, json.dumps(self.registry.to_dict()))
+                self._write_textfile()
+
+    def _write_textfile(self) -> None:
+        if self.config.textfile_path is not None:
+            _atomic_write(self.config.textfile_path, self.registry.render())
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on ``path`` across processes (a no-op without fcntl)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _atomic_write(path: Path, content: str) -> None:
+    # node-exporter may read the file at any time; never expose a partial write.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+_EXPORTERS: Dict[Tuple[str, Path], MetricsExporter] = {}
+_EXPORTERS_LOCK = threading.Lock()
+
+
+def get_exporter(config: MetricsConfig, state_dir: Path) -> Optional[MetricsExporter]:
+    """Return the process-wide exporter for this config, or None when disabled."""
+    if not config.enabled:
+        return None
+    key = (f"{config.http_host}:{config.http_port}:{config.textfile_path}", state_dir.resolve())
+    with _EXPORTERS_LOCK:
+        exporter = _EXPORTERS.get(key)
+        if exporter is None:
+            exporter = MetricsExporter(config, state_dir)
+            exporter.serve()
+            _EXPORTERS[key] = exporter
+        return exporter
@@ -1,36 +1,95 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import asdict
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass
 from datetime import date, datetime, timezone
 from zoneinfo import ZoneInfo
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 import os
+import sqlite3
 import subprocess
+import time
 
+import httpx
 from deepagents import create_deep_agent
 from deepagents.backends import FilesystemBackend
+from langchain.agents.structured_output import ProviderStrategy, ToolStrategy
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
 
+from daily_research_agent.artifacts.index import ResearchIndex
 from daily_research_agent.artifacts.paths import RunPaths, build_run_paths, ensure_dirs, slugify
 from daily_research_agent.artifacts.writer import write_json, write_text
 from daily_research_agent.config import AgentConfig, LoadedPreset, openrouter_settings
 from daily_research_agent.domain.models import BookmarkPost, Source
+from daily_research_agent.domain.schema import research_output_schema, validate_research_output
 from daily_research_agent.domain.prompts import (
+    ArticleTemplate,
     build_research_prompt,
     build_writer_prompt,
     load_article_template,
 )
-from daily_research_agent.integrations.mcp_client import MCPResearchClient
+from daily_research_agent.integrations.bookmark_ranking import rank_cached_bookmarks
+from daily_research_agent.integrations.cassette import CASSETTE_FILENAME, Cassette
+from daily_research_agent.integrations.daily_sites import (
+    STATUS_ERROR,
+    SiteSnapshotStore,
+    SiteUpdate,
+    SnapshotRow,
+    prefetch_daily_sites,
+    snapshot_store_path,
+)
+from daily_research_agent.integrations.link_expansion import LinkResolver
+from daily_research_agent.integrations.mcp_client import MCPResearchClient, content_to_text
+from daily_research_agent.integrations.mcp_health import load_health_store
 from daily_research_agent.integrations.x_bookmarks import (
     XBookmarksClient,
     XBookmarksError,
+    XDeadlineExceeded,
+    XFetchStats,
     load_cached_bookmarks,
 )
-from daily_research_agent.logging import get_logger
+from daily_research_agent.logging import RunLogger, get_logger
+from daily_research_agent.metrics import MetricsExporter, StageClock, get_exporter
+from daily_research_agent.pipeline.budget import BudgetExceededError, StageBudget
+from daily_research_agent.pipeline.clustering import (
+    BookmarkCluster,
+    assign_clusters,
+    group_clusters,
+)
+from daily_research_agent.pipeline.compaction import ToolOutputCompactor
+from daily_research_agent.pipeline.deadline import RunDeadline, wait_with_timeout
+from daily_research_agent.pipeline.dedup import dedupe_sources
+from daily_research_agent.pipeline.event_loop import BlockingCalls, LoopWatchdog
+from daily_research_agent.pipeline.json_extract import ExtractionResult, extract_research_json
+from daily_research_agent.pipeline.novelty import (
+    KIND_BOOKMARK,
+    KIND_CLAIM,
+    KIND_URL,
+    NoveltyStore,
+    covered_items,
+    drop_seen_findings,
+    filter_seen_bookmarks,
+    novelty_store_path,
+    run_entries,
+)
+from daily_research_agent.pipeline.profiling import StageProfiler
+from daily_research_agent.pipeline.reuse import (
+    PriorFindings,
+    find_previous_run,
+    load_prior_findings,
+    merge_prior_findings,
+)
+from daily_research_agent.pipeline.verifier import (
+    ClaimVerifier,
+    VerdictCache,
+    verdict_cache_path,
+    verify_findings,
+)
 from daily_research_agent.tools.x_oauth import (
     load_token_payload,
     refresh_access_token,
@@ -39,10 +98,69 @@ from daily_research_agent.tools.x_oauth import (
 )
 
 
+RESEARCH_FINALIZE_INSTRUCTION = (
+    "The research budget is exhausted. Do not call any tools. "
+    "Using only the information above, output the final JSON now."
+)
+FINALIZE_TOOL_RESULT_MAX_CHARS = 4000
+RESEARCH_REEMIT_INSTRUCTION = (
+    "Your previous answer could not be parsed as JSON. Re-emit it as one JSON object "
+    "with keys findings, sources, memo_markdown, missing_info. Output JSON only: "
+    "no prose and no code fences. Keep it compact so it is not cut off."
+)
+REEMIT_PREVIOUS_MAX_CHARS = 20000
+
+
 class OrchestratorError(RuntimeError):
     pass
 
 
+@dataclass(frozen=True)
+class HttpTransports:
+    """Base httpx transports for outbound X and LLM traffic.
+
+    ``None`` means the default network transport; benchmarks inject local
+    stand-ins here. A cassette, when given, wraps whichever transport is used.
+    """
+
+    x: Optional[httpx.BaseTransport] = None
+    llm: Optional[httpx.AsyncBaseTransport] = None
+    # Shortlink resolution (HEAD requests to t.co and wherever it redirects).
+    links: Optional[httpx.BaseTransport] = None
+    # Daily site prefetch (conditional GETs against sources.daily_sites).
+    sites: Optional[httpx.AsyncBaseTransport] = None
+
+
+@dataclass(frozen=True)
+class WriterOutput:
+    """One article written from the run's research.
+
+    ``name`` is empty for a preset without ``outputs``: its single article
+    keeps the plain ``<slug>-<run suffix>.md`` file name.
+    """
+
+    name: str
+    template: ArticleTemplate
+    language: str
+    model: str
+
+
+def _writer_outputs(
+    config: AgentConfig, preset: LoadedPreset, template: ArticleTemplate
+) -> List[WriterOutput]:
+    if not preset.outputs:
+        return [WriterOutput("", template, config.prompts.language, config.models.writer)]
+    return [
+        WriterOutput(
+            name=output.name,
+            template=load_article_template(output.template) if output.template else template,
+            language=output.language or config.prompts.language,
+            model=output.writer_model or config.models.writer,
+        )
+        for output in preset.outputs
+    ]
+
+
 def _git_sha() -> Optional[str]:
     try:
         result = subprocess.run(
@@ -57,25 +175,11 @@ def _git_sha() -> Optional[str]:
         return None
 
 
-def _safe_json_loads(text: str) -> Optional[Dict[str, Any]]:
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        return None
-
-
-def _extract_json(text: str) -> Optional[Dict[str, Any]]:
-    raw = text.strip()
-    if raw.startswith("{") and raw.endswith("}"):
-        return _safe_json_loads(raw)
-    start = raw.find("{")
-    end = raw.rfind("}")
-    if start == -1 or end == -1 or end <= start:
-        return None
-    return _safe_json_loads(raw[start : end + 1])
-
-
-def _build_chat_model(model_id: str, openrouter: Dict[str, Any]) -> ChatOpenAI:
+def _build_chat_model(
+    model_id: str,
+    openrouter: Dict[str, Any],
+    http_async_client: Optional[httpx.AsyncClient] = None,
+) -> ChatOpenAI:
     max_tokens_env = os.getenv("OPENROUTER_MAX_TOKENS")
     max_tokens = int(max_tokens_env) if max_tokens_env else 4096
     kwargs = {
@@ -87,6 +191,8 @@ def _build_chat_model(model_id: str, openrouter: Dict[str, Any]) -> ChatOpenAI:
     headers = openrouter.get("default_headers")
     if headers:
         kwargs["default_headers"] = headers
+    if http_async_client is not None:
+        kwargs["http_async_client"] = http_async_client
     return ChatOpenAI(**kwargs)
 
 
@@ -102,13 +208,34 @@ def _normalize_sources(raw_sources: List[Dict[str, Any]]) -> List[Source]:
                 publisher=item.get("publisher"),
                 published_at=item.get("published_at"),
                 snippet=item.get("snippet"),
+                mirrors=list(item.get("mirrors") or []),
             )
         )
     return sources
 
 
-def _serialize_bookmarks(bookmarks: List[BookmarkPost]) -> List[Dict[str, Any]]:
-    return [asdict(post) for post in bookmarks]
+def _research_response_format(output_mode: str) -> Any:
+    """Structured-output strategy for the researcher, or None for free text.
+
+    ``auto`` lets langchain pick native constrained decoding when the model's
+    profile supports it and fall back to a tool call otherwise.
+    """
+    if output_mode == "text":
+        return None
+    schema = research_output_schema()
+    if output_mode == "native":
+        return ProviderStrategy(schema, strict=True)
+    if output_mode == "tool":
+        return ToolStrategy(schema)
+    return schema
+
+
+def _serialize_bookmarks(
+    bookmarks: List[BookmarkPost], clusters: Optional[Dict[str, str]] = None
+) -> List[Dict[str, Any]]:
+    if not clusters:
+        return [asdict(post) for post in bookmarks]
+    return [{**asdict(post), "cluster_id": clusters.get(post.id)} for post in bookmarks]
 
 
 def _truncate_text(text: str, max_chars: int) -> str:
@@ -121,12 +248,24 @@ def _truncate_text(text: str, max_chars: int) -> str:
     return f"{text[: max_chars - 3]}..."
 
 
+def _bookmarks_prompt_limit() -> int:
+    return int(os.getenv("BOOKMARKS_PROMPT_LIMIT", "20"))
+
+
+def _prompt_clusters(
+    bookmarks: List[BookmarkPost], clusters: Optional[Dict[str, str]]
+) -> List[BookmarkCluster]:
+    """The bookmark clusters that go into prompts; one per post without clustering."""
+    grouped = group_clusters(bookmarks, clusters or {})
+    return grouped[: _bookmarks_prompt_limit()]
+
+
 def _serialize_bookmarks_for_prompt(
     bookmarks: List[BookmarkPost],
+    clusters: Optional[Dict[str, str]] = None,
 ) -> List[Dict[str, Any]]:
     max_chars = int(os.getenv("BOOKMARK_TEXT_MAX_CHARS", "500"))
     max_refs = int(os.getenv("BOOKMARK_REFERENCED_MAX", "1"))
-    max_bookmarks = int(os.getenv("BOOKMARKS_PROMPT_LIMIT", "20"))
 
     def _serialize_ref(post: BookmarkPost) -> Dict[str, Any]:
         return {
@@ -136,15 +275,21 @@ def _serialize_bookmarks_for_prompt(
             "author_username": post.author_username,
             "author_name": post.author_name,
             "created_at": post.created_at,
+            **({"links": post.expanded_urls} if post.expanded_urls else {}),
         }
 
     output: List[Dict[str, Any]] = []
-    for post in bookmarks[:max_bookmarks]:
+    for cluster in _prompt_clusters(bookmarks, clusters):
+        post = cluster.representative
         payload: Dict[str, Any] = _serialize_ref(post)
         if post.referenced_posts and max_refs > 0:
             payload["referenced_posts"] = [
                 _serialize_ref(ref) for ref in post.referenced_posts[:max_refs]
             ]
+        if len(cluster.members) > 1:
+            # Other bookmarks on the same topic, as references only.
+            payload["cluster_size"] = len(cluster.members)
+            payload["cluster_urls"] = cluster.other_urls
         output.append(payload)
     return output
 
@@ -174,107 +319,466 @@ def _build_run_metadata(
     }
 
 
+def _fetch_x_bookmarks(
+    config: AgentConfig,
+    logger: RunLogger,
+    cassette: Optional[Cassette] = None,
+    transport: Optional[httpx.BaseTransport] = None,
+    stats: Optional[XFetchStats] = None,
+    links_transport: Optional[httpx.BaseTransport] = None,
+    deadline: Optional[float] = None,
+) -> List[BookmarkPost]:
+    config.x.cache.path.parent.mkdir(parents=True, exist_ok=True)
+    token_path = token_file_path(config.run.state_dir)
+    cached_tokens = load_token_payload(token_path) or {}
+
+    access_token = os.getenv("X_USER_ACCESS_TOKEN") or cached_tokens.get("access_token") or ""
+    refresh_token = os.getenv("X_REFRESH_TOKEN") or cached_tokens.get("refresh_token")
+    client_id = os.getenv("X_CLIENT_ID")
+    client_secret = os.getenv("X_CLIENT_SECRET")
+    if cassette is not None:
+        transport = cassette.sync_transport("x", transport)
+        if cassette.replaying:
+            # Replayed responses do not check credentials.
+            access_token = access_token or "replay"
+
+    link_resolver: Optional[LinkResolver] = None
+    # Cassettes match requests by query and body, which can't tell shortlinks
+    # apart; recorded runs rely on the URL entities alone.
+    if config.x.links.resolve and cassette is None:
+        link_resolver = LinkResolver(
+            str(config.x.cache.path),
+            concurrency=config.x.links.concurrency,
+            timeout_seconds=config.x.links.timeout_seconds,
+            transport=links_transport,
+        )
+
+    def _fetch_with_token(token: str) -> List[BookmarkPost]:
+        x_client = XBookmarksClient(
+            base_url=os.getenv("X_API_BASE_URL", "https://api.x.com"),
+            access_token=token,
+            cache_path=str(config.x.cache.path),
+            transport=transport,
+        )
+        return x_client.fetch_bookmarks(
+            max_results=config.x.bookmarks_count,
+            stop_on_seen_streak=config.x.cache.stop_on_seen_streak,
+            resolve_depth=config.x.quote.resolve_depth,
+            max_cached_posts=config.x.cache.max_cached_posts,
+            enabled_cache=config.x.cache.enabled,
+            stats=stats,
+            link_resolver=link_resolver,
+            deadline=deadline,
+        )
+
+    try:
+        return _fetch_with_token(access_token)
+    except XBookmarksError as exc:
+        # Try one refresh cycle when auth fails.
+        if exc.status_code == 401 and refresh_token and client_id:
+            logger.warning("x_access_token_expired_try_refresh")
+            new_payload = refresh_access_token(
+                client_id=client_id,
+                refresh_token=refresh_token,
+                client_secret=client_secret,
+            )
+            save_token_payload(token_path, new_payload)
+            new_access_token = new_payload.get("access_token") or ""
+            return _fetch_with_token(new_access_token)
+        raise
+
+
+async def _fetch_x_bookmarks_within(timeout: float, *args: Any) -> List[BookmarkPost]:
+    """Run ``_fetch_x_bookmarks`` in a worker thread for at most ``timeout``.
+
+    The worker gets the same deadline and stops by itself before writing the
+    cache; on expiry this waits for it, so the cache fallback never reads
+    while a late fetch is still writing.
+    """
+    deadline = time.monotonic() + timeout
+    worker = asyncio.ensure_future(asyncio.to_thread(_fetch_x_bookmarks, *args, deadline))
+    try:
+        return await wait_with_timeout(asyncio.shield(worker), timeout)
+    except asyncio.TimeoutError:
+        await asyncio.wait({worker})
+        worker.exception()  # the worker's own deadline error; the timeout is reported
+        raise
+    except XDeadlineExceeded as exc:
+        raise asyncio.TimeoutError() from exc
+
+
+def _load_bookmarks_from_cache(
+    config: AgentConfig, preset: LoadedPreset, logger: RunLogger
+) -> List[BookmarkPost]:
+    if not config.x.cache.enabled:
+        return []
+    bookmarks = load_cached_bookmarks(
+        str(config.x.cache.path),
+        config.x.bookmarks_count,
+        keywords=preset.bookmarks.keywords,
+        authors=preset.bookmarks.authors,
+    )
+    if bookmarks:
+        logger.info(
+            "x_bookmarks_loaded_from_cache",
+            {"count": len(bookmarks)},
+        )
+    return bookmarks
+
+
+def _ranking_query(preset: LoadedPreset, template: ArticleTemplate) -> str:
+    parts = [preset.prompt, template.title_guidance]
+    for section in template.sections:
+        parts.extend([section.heading, section.intent, section.guidance])
+    return "\n".join(part for part in parts if part)
+
+
+def _rank_bookmarks_from_cache(
+    config: AgentConfig,
+    preset: LoadedPreset,
+    template: ArticleTemplate,
+    logger: RunLogger,
+) -> Tuple[List[BookmarkPost], Dict[str, Any]]:
+    ranking = config.x.ranking
+    bookmarks, stats = rank_cached_bookmarks(
+        str(config.x.cache.path),
+        _ranking_query(preset, template),
+        config.x.bookmarks_count,
+        half_life_days=ranking.recency_half_life_days,
+        recency_weight=ranking.recency_weight,
+        k1=ranking.k1,
+        b=ranking.b,
+        max_query_terms=ranking.max_query_terms,
+        keywords=preset.bookmarks.keywords,
+        authors=preset.bookmarks.authors,
+    )
+    summary = asdict(stats)
+    logger.info("x_bookmarks_ranked", {key: value for key, value in summary.items() if key != "top"})
+    return bookmarks, summary
+
+
+def _site_update_lines(updates: List[SiteUpdate]) -> List[str]:
+    lines: List[str] = []
+    for update in updates:
+        if not update.new_items:
+            continue
+        lines.append(f"- {update.site}")
+        lines.extend(f"  - {item.title} ({item.url})" for item in update.new_items)
+    return lines
+
+
+def _site_prefetch_summary(updates: List[SiteUpdate], seconds: float) -> Dict[str, Any]:
+    statuses = [update.status for update in updates]
+    return {
+        "seconds": seconds,
+        "sites": len(updates),
+        **{status: statuses.count(status) for status in sorted(set(statuses))},
+        "new_items": sum(len(update.new_items) for update in updates),
+        "by_site": {update.site: update.summary() for update in updates},
+    }
+
+
+async def _cancel_task(task: asyncio.Task) -> None:
+    if task.done():
+        return
+    task.cancel()
+    try:
+        await task
+    except BaseException as exc:  # noqa: BLE001 - the cancelled task's outcome is irrelevant
+        if not isinstance(exc, (Exception, asyncio.CancelledError)):
+            raise
+
+
 async def run_orchestrator(
     config: AgentConfig,
     preset: LoadedPreset,
     article_date: date,
+    cassette: Optional[Cassette] = None,
+    transports: Optional[HttpTransports] = None,
+    profile: Optional[str] = None,
 ) -> RunPaths:
     template = load_article_template(preset.template_path)
+    # Output templates are loaded up front so a bad path fails before research.
+    writer_outputs = _writer_outputs(config, preset, template)
     run_time = datetime.now(ZoneInfo(config.run.timezone))
     run_paths = build_run_paths(config.run.output_dir, article_date, None, run_time)
     ensure_dirs(run_paths)
     config.run.state_dir.mkdir(parents=True, exist_ok=True)
 
-    logger = get_logger(run_paths.log_file, config.logging)
+    logger = get_logger(run_paths.log_file, config.logging, run_paths.run_id)
+    exporter = get_exporter(config.metrics, config.run.state_dir)
+    clock = StageClock()
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        result = await _run_stages(
+            config,
+            preset,
+            article_date,
+            template,
+            writer_outputs,
+            run_paths,
+            logger,
+            clock,
+            cassette,
+            transports or HttpTransports(),
+            profile,
+        )
+        outcome = "success"
+        return result
+    finally:
+        if exporter is not None:
+            await BlockingCalls(config.event_loop.offload_blocking).run(
+                _record_metrics, exporter, preset, run_paths, clock, outcome, started, logger
+            )
+        logger.close()
+
+
+async def _run_stages(
+    config: AgentConfig,
+    preset: LoadedPreset,
+    article_date: date,
+    template: ArticleTemplate,
+    writer_outputs: List[WriterOutput],
+    run_paths: RunPaths,
+    logger: RunLogger,
+    clock: StageClock,
+    cassette: Optional[Cassette],
+    transports: HttpTransports,
+    profile: Optional[str],
+) -> RunPaths:
+    # The watchdog, MCP sessions and the pooled LLM client register their
+    # cleanup here, so they are released whether the run succeeds or raises.
+    async with AsyncExitStack() as cleanup:
+        return await _run_pipeline(
+            config,
+            preset,
+            article_date,
+            template,
+            writer_outputs,
+            run_paths,
+            logger,
+            clock,
+            cassette,
+            transports,
+            profile,
+            cleanup,
+        )
+
+
+async def _run_pipeline(
+    config: AgentConfig,
+    preset: LoadedPreset,
+    article_date: date,
+    template: ArticleTemplate,
+    writer_outputs: List[WriterOutput],
+    run_paths: RunPaths,
+    logger: RunLogger,
+    clock: StageClock,
+    cassette: Optional[Cassette],
+    transports: HttpTransports,
+    profile: Optional[str],
+    cleanup: AsyncExitStack,
+) -> RunPaths:
+    profiler = StageProfiler(profile, run_paths.run_dir)
+    blocking = BlockingCalls(config.event_loop.offload_blocking)
+    watchdog: Optional[LoopWatchdog] = None
+    if config.event_loop.watchdog:
+        watchdog = LoopWatchdog(config.event_loop, logger)
+        watchdog.start()
+        cleanup.push_async_callback(watchdog.stop)
+    deadline_shares = dict(config.run.deadline_shares)
+    if not config.verifier.enabled:
+        # Nothing to reserve for a stage that won't run.
+        deadline_shares.pop("verify", None)
+    deadline = RunDeadline(config.run.deadline_seconds, deadline_shares)
 
     x_failed = False
     mcp_failed = False
+    x_stats = XFetchStats()
+    x_cache_fallback: Optional[str] = None
+    bookmark_ranking: Optional[Dict[str, Any]] = None
 
     bookmarks: List[BookmarkPost] = []
-    if config.x.enabled:
-        try:
-            config.x.cache.path.parent.mkdir(parents=True, exist_ok=True)
-            token_path = token_file_path(config.run.state_dir)
-            cached_tokens = load_token_payload(token_path) or {}
-
-            access_token = os.getenv("X_USER_ACCESS_TOKEN") or cached_tokens.get("access_token") or ""
-            refresh_token = os.getenv("X_REFRESH_TOKEN") or cached_tokens.get("refresh_token")
-            client_id = os.getenv("X_CLIENT_ID")
-            client_secret = os.getenv("X_CLIENT_SECRET")
-
-            def _fetch_with_token(token: str) -> List[BookmarkPost]:
-                x_client = XBookmarksClient(
-                    base_url=os.getenv("X_API_BASE_URL", "https://api.x.com"),
-                    access_token=token,
-                    cache_path=str(config.x.cache.path),
-                )
-                return x_client.fetch_bookmarks(
-                    max_results=config.x.bookmarks_count,
-                    stop_on_seen_streak=config.x.cache.stop_on_seen_streak,
-                    resolve_depth=config.x.quote.resolve_depth,
-                    max_cached_posts=config.x.cache.max_cached_posts,
-                    enabled_cache=config.x.cache.enabled,
-                )
-
+    with clock.stage("x"), profiler.stage("x"):
+        if config.x.enabled:
             try:
-                bookmarks = _fetch_with_token(access_token)
-            except XBookmarksError as exc:
-                # Try one refresh cycle when auth fails.
-                if exc.status_code == 401 and refresh_token and client_id:
-                    logger.warning("x_access_token_expired_try_refresh")
-                    new_payload = refresh_access_token(
-                        client_id=client_id,
-                        refresh_token=refresh_token,
-                        client_secret=client_secret,
+                x_timeout = deadline.stage_timeout("x")
+                if x_timeout is None:
+                    bookmarks = await blocking.run(
+                        _fetch_x_bookmarks,
+                        config,
+                        logger,
+                        cassette,
+                        transports.x,
+                        x_stats,
+                        transports.links,
                     )
-                    save_token_payload(token_path, new_payload)
-                    new_access_token = new_payload.get("access_token") or ""
-                    bookmarks = _fetch_with_token(new_access_token)
                 else:
-                    raise
-            if not bookmarks and config.x.cache.enabled:
-                bookmarks = load_cached_bookmarks(
-                    str(config.x.cache.path),
-                    config.x.bookmarks_count,
-                )
-                if bookmarks:
-                    logger.info(
-                        "x_bookmarks_loaded_from_cache",
-                        {"count": len(bookmarks)},
+                    bookmarks = await _fetch_x_bookmarks_within(
+                        x_timeout,
+                        config,
+                        logger,
+                        cassette,
+                        transports.x,
+                        x_stats,
+                        transports.links,
                     )
-        except XBookmarksError as exc:
-            x_failed = True
-            logger.error("x_bookmarks_failed", {"error": str(exc)})
-            if config.x.cache.enabled:
-                bookmarks = load_cached_bookmarks(
-                    str(config.x.cache.path),
-                    config.x.bookmarks_count,
+                if not bookmarks:
+                    x_cache_fallback = "empty"
+                    bookmarks = await blocking.run(_load_bookmarks_from_cache, config, preset, logger)
+            except XBookmarksError as exc:
+                x_failed = True
+                x_cache_fallback = "error"
+                logger.error("x_bookmarks_failed", {"error": str(exc)})
+                bookmarks = await blocking.run(_load_bookmarks_from_cache, config, preset, logger)
+            except asyncio.TimeoutError:
+                x_failed = True
+                x_cache_fallback = "deadline"
+                deadline.record_overrun("x")
+                logger.error("x_bookmarks_deadline_exceeded", {"timeout_seconds": x_timeout})
+                bookmarks = await blocking.run(_load_bookmarks_from_cache, config, preset, logger)
+        else:
+            logger.info("x_bookmarks_disabled")
+        filtered = bool(preset.bookmarks.keywords or preset.bookmarks.authors)
+        from_cache = config.x.enabled and config.x.cache.enabled
+        if from_cache and config.x.ranking.enabled:
+            try:
+                ranked, bookmark_ranking = await blocking.run(
+                    _rank_bookmarks_from_cache, config, preset, template, logger
                 )
-                if bookmarks:
-                    logger.info(
-                        "x_bookmarks_loaded_from_cache",
-                        {"count": len(bookmarks)},
-                    )
-    else:
-        logger.info("x_bookmarks_disabled")
+                if ranked or filtered:
+                    bookmarks = ranked
+            except sqlite3.Error as exc:
+                logger.error("x_bookmarks_ranking_failed", {"error": str(exc)})
+        elif from_cache and filtered and x_cache_fallback is None:
+            # The API only returns the latest bookmarks; the preset's filter
+            # picks from the whole cache they were just merged into.
+            bookmarks = await blocking.run(_load_bookmarks_from_cache, config, preset, logger)
 
-    write_json(run_paths.bookmarks_json, _serialize_bookmarks(bookmarks))
+    novelty: Optional[NoveltyStore] = None
+    bookmarks_filtered = 0
+    if config.novelty.enabled:
+        novelty = NoveltyStore(
+            novelty_store_path(config.run.state_dir),
+            preset.name,
+            article_date,
+            config.novelty.window_days,
+        )
+        # Before clustering so bookmarks.json and run.json count what is used.
+        if config.novelty.filter_bookmarks:
+            seen_bookmarks = await blocking.run(novelty.recent, KIND_BOOKMARK)
+            bookmarks, bookmarks_filtered = filter_seen_bookmarks(bookmarks, set(seen_bookmarks))
+
+    bookmark_clusters: Dict[str, str] = {}
+    if config.x.clustering.enabled and bookmarks:
+        bookmark_clusters = await blocking.run(
+            assign_clusters,
+            bookmarks,
+            config.x.clustering.similarity_threshold,
+            config.x.clustering.max_posts,
+        )
+    await blocking.run(
+        write_json, run_paths.bookmarks_json, _serialize_bookmarks(bookmarks, bookmark_clusters)
+    )
+
+    # Daily sites are fetched while MCP servers connect; neither waits on the other.
+    sites_task: Optional[asyncio.Task] = None
+    site_store = SiteSnapshotStore(snapshot_store_path(config.run.state_dir), preset.name)
+    prefetch = config.sources.prefetch
+    if prefetch.enabled and config.sources.daily_sites and cassette is None:
+        sites_task = asyncio.create_task(
+            wait_with_timeout(
+                prefetch_daily_sites(
+                    config.sources.daily_sites,
+                    site_store,
+                    concurrency=prefetch.concurrency,
+                    timeout_seconds=prefetch.timeout_seconds,
+                    max_items_per_site=prefetch.max_items_per_site,
+                    transport=transports.sites,
+                ),
+                deadline.stage_timeout("sites"),
+            )
+        )
+        # Not left running if anything before its await below raises.
+        cleanup.push_async_callback(_cancel_task, sites_task)
 
     mcp_tools = []
     tool_names: List[str] = []
-    mcp_client = MCPResearchClient(config.mcp.servers)
-    try:
-        if not config.mcp.servers:
-            raise OrchestratorError("No MCP servers configured")
-        tools_bundle = await mcp_client.connect()
-        mcp_tools = tools_bundle.tools
-        tool_names = tools_bundle.tool_names
-        logger.info("mcp_tools_ready", {"tool_names": tool_names})
-    except Exception as exc:  # noqa: BLE001 - capture MCP failures
-        mcp_failed = True
-        logger.error("mcp_connect_failed", {"error": str(exc)})
-
-    run_metadata = _build_run_metadata(
+    mcp_failed_servers: Dict[str, str] = {}
+    mcp_schema_cache: Optional[Dict[str, int]] = None
+    mcp_health = await blocking.run(
+        load_health_store, config.run.state_dir, config.mcp.circuit_breaker
+    )
+    mcp_client = MCPResearchClient(
+        config.mcp.servers,
+        connect_timeout_seconds=config.mcp.connect_timeout_seconds,
+        schema_cache_dir=config.run.state_dir / "mcp_tool_cache" if config.mcp.tool_cache else None,
+        schema_cache_ttl_hours=config.mcp.tool_cache_ttl_hours,
+        lazy_stdio=config.mcp.lazy_stdio,
+        health=mcp_health,
+        blocking=blocking,
+    )
+    cleanup.push_async_callback(mcp_client.close)
+    with clock.stage("mcp"), profiler.stage("mcp"):
+        try:
+            if cassette is not None and cassette.replaying:
+                mcp_tools = cassette.mcp_tools()
+                tool_names = [tool.name for tool in mcp_tools]
+                logger.info("mcp_tools_replayed", {"tool_names": tool_names})
+            else:
+                if not config.mcp.servers:
+                    raise OrchestratorError("No MCP servers configured")
+                try:
+                    # Servers that connect in time are kept; only slow ones fail.
+                    tools_bundle = await mcp_client.connect(deadline.stage_timeout("mcp"))
+                finally:
+                    if mcp_client.cut_off_servers:
+                        deadline.record_overrun("mcp")
+                mcp_tools = tools_bundle.tools
+                tool_names = tools_bundle.tool_names
+                mcp_failed_servers = tools_bundle.failed_servers
+                if config.mcp.tool_cache:
+                    cached = len(tools_bundle.cached_servers)
+                    connected = len(config.mcp.servers) - len(mcp_failed_servers)
+                    mcp_schema_cache = {"hits": cached, "misses": max(0, connected - cached)}
+                if mcp_failed_servers:
+                    logger.warning("mcp_servers_failed", {"servers": mcp_failed_servers})
+                logger.info(
+                    "mcp_tools_ready",
+                    {"tool_names": tool_names, "cached_servers": tools_bundle.cached_servers},
+                )
+                if cassette is not None:
+                    mcp_tools = cassette.wrap_mcp_tools(mcp_tools)
+        except Exception as exc:  # noqa: BLE001 - capture MCP failures
+            mcp_failed = True
+            logger.error("mcp_connect_failed", {"error": str(exc)})
+
+    daily_sites = config.sources.daily_sites
+    site_updates: Optional[List[str]] = None
+    site_prefetch: Optional[Dict[str, Any]] = None
+    site_snapshots: List[SnapshotRow] = []
+    if sites_task is not None:
+        with clock.stage("sites"), profiler.stage("sites"):
+            try:
+                updates, site_snapshots, seconds = await sites_task
+            except asyncio.TimeoutError:
+                deadline.record_overrun("sites")
+                logger.error("daily_sites_deadline_exceeded")
+            except (httpx.HTTPError, sqlite3.Error) as exc:
+                logger.error("daily_sites_prefetch_failed", {"error": str(exc)})
+            else:
+                # Sites that couldn't be fetched are still left to the agent.
+                daily_sites = [update.site for update in updates if update.status == STATUS_ERROR]
+                site_updates = _site_update_lines(updates)
+                site_prefetch = _site_prefetch_summary(updates, seconds)
+                logger.info(
+                    "daily_sites_prefetched",
+                    {key: value for key, value in site_prefetch.items() if key != "by_site"},
+                )
+
+    run_metadata = await blocking.run(
+        _build_run_metadata,
         config,
         preset,
         run_paths,
@@ -283,32 +787,123 @@ async def run_orchestrator(
         len(bookmarks),
         tool_names,
     )
-    write_json(run_paths.run_json, run_metadata)
+    run_metadata["mcp_failed_servers"] = mcp_failed_servers
+    run_metadata["mcp_schema_cache"] = mcp_schema_cache
+    if config.x.enabled:
+        run_metadata["x_fetch"] = asdict(x_stats)
+        run_metadata["x_cache_fallback"] = x_cache_fallback
+    if bookmark_ranking is not None:
+        run_metadata["bookmark_ranking"] = bookmark_ranking
+    if site_prefetch is not None:
+        run_metadata["daily_sites"] = site_prefetch
+    if filtered and config.x.enabled:
+        run_metadata["bookmark_filter"] = {
+            "keywords": preset.bookmarks.keywords,
+            "authors": preset.bookmarks.authors,
+            "matched": len(bookmarks),
+        }
+    if bookmark_clusters:
+        run_metadata["bookmark_clusters"] = {
+            "bookmarks": len(bookmarks),
+            "clusters": len(set(bookmark_clusters.values())),
+        }
+    await blocking.run(write_json, run_paths.run_json, run_metadata)
+
+    prior: Optional[PriorFindings] = None
+    if config.reuse.enabled:
+        previous_run = await blocking.run(
+            find_previous_run, config.run.output_dir, preset.name, run_paths.run_id
+        )
+        if previous_run is not None:
+            prior = await blocking.run(
+                load_prior_findings,
+                previous_run,
+                article_date,
+                config.reuse.ttl_days,
+                config.reuse.max_findings,
+            )
+            run_metadata["reuse"] = prior.summary()
+            logger.info("previous_findings_loaded", prior.summary())
+
+    seen_urls: Set[str] = set()
+    covered: List[str] = []
+    if novelty is not None:
+        seen_urls = set(await blocking.run(novelty.recent, KIND_URL))
+        # Claims carried over from the previous run are listed as kept or to
+        # re-check; listing them as covered too would contradict that.
+        covered = covered_items(
+            await blocking.run(novelty.recent, KIND_CLAIM),
+            config.novelty.max_covered_items,
+            exclude=[finding["claim"] for finding in prior.fresh + prior.stale] if prior else (),
+        )
+        run_metadata["novelty"] = {
+            "window_days": config.novelty.window_days,
+            "bookmarks_filtered": bookmarks_filtered,
+            "seen_urls": len(seen_urls),
+            "covered_items": len(covered),
+        }
 
     research_prompt = build_research_prompt(
         language=config.prompts.language,
         source_priority=config.prompts.source_priority,
         preset_prompt=preset.prompt,
-        daily_sites=config.sources.daily_sites,
+        daily_sites=daily_sites,
         x_usage_policy=config.x.usage_policy,
         max_web_queries=config.run.max_web_queries,
         date_value=article_date,
+        already_covered=covered,
+        fresh_findings=[finding["claim"] for finding in prior.fresh] if prior else None,
+        stale_findings=[finding["claim"] for finding in prior.stale] if prior else None,
+        site_updates=site_updates,
     )
 
     openrouter = openrouter_settings()
+    llm_http_client: Optional[httpx.AsyncClient] = None
+    llm_transport = transports.llm
+    if cassette is not None:
+        llm_transport = cassette.async_transport("llm", llm_transport)
+    if llm_transport is not None:
+        llm_http_client = httpx.AsyncClient(
+            transport=llm_transport,
+            timeout=httpx.Timeout(600.0, connect=5.0),
+        )
+        cleanup.push_async_callback(llm_http_client.aclose)
+    if cassette is not None and cassette.replaying and not openrouter.get("api_key"):
+        openrouter["api_key"] = "replay"
     if not openrouter.get("api_key"):
         logger.warning("openrouter_api_key_missing")
 
     researcher_model = _build_chat_model(
-        config.models.researcher or config.models.main, openrouter
+        config.models.researcher or config.models.main, openrouter, llm_http_client
+    )
+
+    researcher_budget = StageBudget(
+        "researcher",
+        config.budgets.researcher,
+        config.budgets.tool_call_timeout_seconds,
+    )
+    writer_budgets = [
+        StageBudget(f"writer:{output.name}" if output.name else "writer", config.budgets.writer)
+        for output in writer_outputs
+    ]
+    verifier_budget = StageBudget("verifier", config.budgets.verifier)
+    stage_budgets = [researcher_budget, *writer_budgets]
+    if config.verifier.enabled:
+        stage_budgets.append(verifier_budget)
+
+    compactor = ToolOutputCompactor(
+        config.tool_output, run_paths.tool_outputs_dir, config.run.output_dir, blocking
     )
 
     backend = FilesystemBackend(root_dir=str(config.run.output_dir))
     researcher_agent = create_deep_agent(
         model=researcher_model,
-        tools=mcp_tools,
+        tools=researcher_budget.wrap_tools(compactor.wrap_tools(mcp_tools)),
         system_prompt=research_prompt,
         backend=backend,
+        # Checkpoints let a cut-off research stage be finalized from its partial state.
+        checkpointer=InMemorySaver(),
+        response_format=_research_response_format(config.research.output_mode),
     )
 
     research_input = {
@@ -318,67 +913,156 @@ async def run_orchestrator(
                     "Use the available tools to gather sources. "
                     "Output JSON only.\n\n"
                     "Bookmarks JSON:\n"
-                    f"{json.dumps(_serialize_bookmarks_for_prompt(bookmarks), ensure_ascii=False, separators=(',', ':'))}"
+                    f"{json.dumps(_serialize_bookmarks_for_prompt(bookmarks, bookmark_clusters), ensure_ascii=False, separators=(',', ':'))}"
                 )
             )
         ]
     }
 
     research_response = None
-    if not mcp_failed:
-        try:
-            research_response = await researcher_agent.ainvoke(
-                research_input,
-                config={
-                    "tags": ["research", preset.name],
-                    "metadata": {
-                        "run_id": run_paths.run_id,
-                        "preset": preset.name,
-                        "date": article_date.isoformat(),
-                        "tool_names": tool_names,
-                    },
-                },
-            )
-        except Exception as exc:  # noqa: BLE001
-            mcp_failed = True
-            logger.error("research_agent_failed", {"error": str(exc)})
-
     research_text = ""
-    parsed = None
-    if research_response:
-        research_text = _extract_agent_text(research_response)
-        parsed = _extract_json(research_text)
-    if parsed is None:
-        logger.warning("research_json_parse_failed")
-        parsed = {
-            "findings": [],
-            "sources": [],
-            "memo_markdown": research_text or "Research failed or returned no JSON.",
-            "missing_info": [],
-        }
+    research_agent_config = {
+        "tags": ["research", preset.name],
+        "metadata": {
+            "run_id": run_paths.run_id,
+            "preset": preset.name,
+            "date": article_date.isoformat(),
+            "tool_names": tool_names,
+        },
+        "callbacks": [researcher_budget.callback_handler()],
+        "configurable": {"thread_id": run_paths.run_id},
+    }
+    with clock.stage("research"), profiler.stage("research"):
+        if not mcp_failed:
+            try:
+                research_response = await researcher_budget.run(
+                    researcher_agent.ainvoke(research_input, config=research_agent_config),
+                    deadline.stage_timeout("research"),
+                )
+            except BudgetExceededError as exc:
+                logger.warning("research_budget_exceeded", {"reason": exc.reason})
+                if exc.reason == "deadline":
+                    deadline.record_overrun("research")
+                try:
+                    research_text = await _force_research_finalization(
+                        researcher_agent,
+                        researcher_model,
+                        research_prompt,
+                        research_input,
+                        research_agent_config,
+                        deadline.stage_timeout("finalize"),
+                    )
+                    run_metadata["research_finalized_early"] = exc.reason
+                    logger.info("research_forced_finalization", {"reason": exc.reason})
+                except Exception as finalize_exc:  # noqa: BLE001
+                    logger.error(
+                        "research_finalization_failed", {"error": str(finalize_exc)}
+                    )
+            except Exception as exc:  # noqa: BLE001
+                mcp_failed = True
+                logger.error("research_agent_failed", {"error": str(exc)})
 
-    sources = _normalize_sources(parsed.get("sources", []))
-    write_json(run_paths.sources_json, [asdict(source) for source in sources])
-    write_text(run_paths.research_md, parsed.get("memo_markdown", ""))
+        parsed = None
+        structured = _structured_response(research_response)
+        if structured is not None:
+            parsed = structured
+            run_metadata["research_json"] = {
+                **ExtractionResult(structured, "structured").summary(),
+                "reemitted": False,
+            }
+        elif research_response:
+            research_text = _extract_agent_text(research_response)
+        if parsed is None and research_text:
+            extraction = extract_research_json(research_text)
+            reemitted = False
+            if not extraction.ok:
+                logger.warning("research_json_unparseable", {"chars": len(research_text)})
+                try:
+                    reemitted = True
+                    extraction = extract_research_json(
+                        await _reemit_research_json(
+                            researcher_model,
+                            research_prompt,
+                            research_text,
+                            deadline.stage_timeout("finalize"),
+                        )
+                    )
+                except Exception as exc:  # noqa: BLE001
+                    logger.error("research_json_reemit_failed", {"error": str(exc)})
+            run_metadata["research_json"] = {**extraction.summary(), "reemitted": reemitted}
+            if extraction.ok:
+                parsed = extraction.data
+                if extraction.method != "direct" or extraction.dropped_items:
+                    logger.info("research_json_recovered", run_metadata["research_json"])
+        if parsed is None:
+            logger.warning("research_json_parse_failed")
+            parsed = {
+                "findings": [],
+                "sources": [],
+                "memo_markdown": research_text or "Research failed or returned no JSON.",
+                "missing_info": [],
+            }
+        else:
+            validation = validate_research_output(parsed)
+            parsed = validation.data
+            if validation.errors:
+                run_metadata["research_json"]["validation"] = validation.summary()
+                logger.warning("research_json_invalid_fields", validation.summary())
 
-    writer_prompt = build_writer_prompt(
-        language=config.prompts.language,
-        source_priority=config.prompts.source_priority,
-        preset_prompt=preset.prompt,
-        template=template,
-        date_value=article_date,
-        x_usage_policy=config.x.usage_policy,
-        x_failed=x_failed,
-        mcp_failed=mcp_failed,
-    )
+    if novelty is not None and config.novelty.drop_seen_findings and seen_urls:
+        parsed, findings_dropped = drop_seen_findings(parsed, seen_urls)
+        run_metadata["novelty"]["findings_dropped"] = findings_dropped
+        if findings_dropped:
+            logger.info("novelty_findings_dropped", {"count": findings_dropped})
 
-    writer_model = _build_chat_model(config.models.writer, openrouter)
-    writer_agent = create_deep_agent(
-        model=writer_model,
-        tools=[],
-        system_prompt=writer_prompt,
-        backend=backend,
-    )
+    if prior is not None:
+        parsed, carried = merge_prior_findings(parsed, prior)
+        run_metadata["reuse"]["carried_over"] = carried
+
+    if config.dedup.enabled and parsed.get("sources"):
+        parsed, run_metadata["dedup"] = dedupe_sources(
+            parsed, config.dedup.simhash_max_distance, config.dedup.min_tokens
+        )
+        if run_metadata["dedup"]["sources_out"] < run_metadata["dedup"]["sources_in"]:
+            logger.info("sources_deduplicated", run_metadata["dedup"])
+
+    if config.verifier.enabled and parsed.get("findings"):
+        verifier_model_id = config.models.verifier or config.models.main
+        verifier = ClaimVerifier(
+            _build_chat_model(verifier_model_id, openrouter, llm_http_client),
+            config.verifier.concurrency,
+            config.verifier.check_timeout_seconds,
+            callbacks=[verifier_budget.callback_handler()],
+            fetch_tool=next(
+                (tool for tool in mcp_tools if tool.name == config.verifier.fetch_tool), None
+            ),
+        )
+        verdict_cache = None
+        if config.verifier.cache:
+            verdict_cache = VerdictCache(
+                verdict_cache_path(config.run.state_dir), config.verifier.cache_ttl_days
+            )
+        with clock.stage("verify"), profiler.stage("verify"):
+            parsed, verification = await verify_findings(
+                parsed,
+                verifier,
+                verdict_cache,
+                verifier_model_id,
+                verifier_budget,
+                blocking,
+                config.verifier.max_checks,
+                config.verifier.drop_unsupported,
+                deadline.stage_timeout("verify"),
+            )
+        if verification["cut_off"] == "deadline":
+            deadline.record_overrun("verify")
+        run_metadata["verification"] = verification
+        logger.info("verification_completed", verification)
+
+    sources = _normalize_sources(parsed.get("sources", []))
+    await blocking.run(write_json, run_paths.sources_json, [asdict(source) for source in sources])
+    await blocking.run(write_json, run_paths.findings_json, parsed.get("findings", []))
+    await blocking.run(write_text, run_paths.research_md, parsed.get("memo_markdown", ""))
 
     writer_input = {
         "messages": [
@@ -388,48 +1072,285 @@ async def run_orchestrator(
                     "Findings JSON:\n"
                     f"{json.dumps(parsed, ensure_ascii=False, separators=(',', ':'))}\n\n"
                     "Bookmarks JSON:\n"
-                    f"{json.dumps(_serialize_bookmarks_for_prompt(bookmarks), ensure_ascii=False, separators=(',', ':'))}\n"
+                    f"{json.dumps(_serialize_bookmarks_for_prompt(bookmarks, bookmark_clusters), ensure_ascii=False, separators=(',', ':'))}\n"
                 )
             )
         ]
     }
 
-    article_markdown = ""
-    try:
-        writer_response = await writer_agent.ainvoke(
-            writer_input,
-            config={
-                "tags": ["writer", preset.name],
-                "metadata": {
-                    "run_id": run_paths.run_id,
-                    "preset": preset.name,
-                    "date": article_date.isoformat(),
+    async def _write(output: WriterOutput, budget: StageBudget, timeout: Optional[float]) -> str:
+        writer_prompt = build_writer_prompt(
+            language=output.language,
+            source_priority=config.prompts.source_priority,
+            preset_prompt=preset.prompt,
+            template=output.template,
+            date_value=article_date,
+            x_usage_policy=config.x.usage_policy,
+            x_failed=x_failed,
+            mcp_failed=mcp_failed,
+        )
+        writer_agent = create_deep_agent(
+            model=_build_chat_model(output.model, openrouter, llm_http_client),
+            tools=[],
+            system_prompt=writer_prompt,
+            backend=backend,
+        )
+        metadata = {
+            "run_id": run_paths.run_id,
+            "preset": preset.name,
+            "date": article_date.isoformat(),
+        }
+        if output.name:
+            metadata["output"] = output.name
+        writer_response = await budget.run(
+            writer_agent.ainvoke(
+                writer_input,
+                config={
+                    "tags": ["writer", preset.name, *([output.name] if output.name else [])],
+                    "metadata": metadata,
+                    "callbacks": [budget.callback_handler()],
                 },
-            },
+            ),
+            timeout,
+        )
+        return _extract_agent_text(writer_response)
+
+    # Every output is written from the same research, so the writers run side by side.
+    with clock.stage("writer"), profiler.stage("writer"):
+        writer_timeout = deadline.stage_timeout("writer")
+        writer_results = await asyncio.gather(
+            *(
+                _write(output, budget, writer_timeout)
+                for output, budget in zip(writer_outputs, writer_budgets)
+            ),
+            return_exceptions=True,
         )
-        article_markdown = _extract_agent_text(writer_response)
-    except Exception as exc:  # noqa: BLE001
-        logger.error("writer_agent_failed", {"error": str(exc)})
-        raise OrchestratorError("Writer agent failed") from exc
+    for result in writer_results:
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result  # cancellation, not a writer failure
+    writer_errors = {
+        output.name: result
+        for output, result in zip(writer_outputs, writer_results)
+        if isinstance(result, Exception)
+    }
+    for name, error in writer_errors.items():
+        logger.error(
+            "writer_agent_failed", {"error": str(error), **({"output": name} if name else {})}
+        )
+    if len(writer_errors) == len(writer_outputs):
+        run_metadata["finished_at"] = datetime.now(timezone.utc).isoformat()
+        run_metadata["budgets"] = _budgets_summary(*stage_budgets)
+        run_metadata["deadline"] = deadline.summary()
+        run_metadata["error"] = "writer_agent_failed"
+        run_metadata["x_failed"] = x_failed
+        run_metadata["mcp_failed"] = mcp_failed
+        run_metadata["stage_seconds"] = clock.seconds
+        _add_profile_summary(profiler, run_metadata)
+        run_metadata["event_loop"] = await _event_loop_summary(watchdog, blocking)
+        run_metadata["logging"] = logger.summary()
+        await blocking.run(_save_cassette, cassette, run_paths, run_metadata)
+        await blocking.run(write_json, run_paths.run_json, run_metadata)
+        raise OrchestratorError("Writer agent failed") from next(iter(writer_errors.values()))
+
+    article_paths: Dict[str, Path] = {}
+    for output, article_markdown in zip(writer_outputs, writer_results):
+        if output.name in writer_errors:
+            continue
+        article_title = _extract_title(article_markdown)
+        slug = slugify(article_title or "daily-research")
+        if output.name:
+            slug = f"{slug}-{slugify(output.name)}"
+        article_path = run_paths.article_dir / f"{slug}-{run_paths.run_suffix}.md"
+        await blocking.run(write_text, article_path, article_markdown)
+        article_paths[output.name] = article_path
+    # The first article written stands for the run (reuse, index, metrics).
+    article_path = next(iter(article_paths.values()))
 
-    article_title = _extract_title(article_markdown)
-    slug = slugify(article_title or "daily-research")
-    article_path = run_paths.article_dir / f"{slug}-{run_paths.run_suffix}.md"
-    write_text(article_path, article_markdown)
+    if novelty is not None:
+        run_metadata["novelty"]["recorded"] = await blocking.run(
+            novelty.record,
+            run_paths.run_id,
+            run_entries(
+                parsed,
+                [
+                    post
+                    for cluster in _prompt_clusters(bookmarks, bookmark_clusters)
+                    for post in cluster.members
+                ],
+            ),
+        )
+
+    if site_snapshots:
+        # Saved only now, so items a failed run never reported come up again.
+        try:
+            await blocking.run(site_store.save, site_snapshots)
+        except sqlite3.Error as exc:
+            logger.error("daily_sites_snapshot_failed", {"error": str(exc)})
 
     run_metadata["finished_at"] = datetime.now(timezone.utc).isoformat()
     run_metadata["article_path"] = str(article_path)
+    if preset.outputs:
+        run_metadata["outputs"] = {}
+        for output in writer_outputs:
+            entry: Dict[str, Any] = {
+                "language": output.language,
+                "model": output.model,
+                "template": output.template.name,
+                "article_path": None,
+            }
+            if output.name in article_paths:
+                entry["article_path"] = str(article_paths[output.name])
+            else:
+                entry["error"] = str(writer_errors[output.name])
+            run_metadata["outputs"][output.name] = entry
     run_metadata["x_failed"] = x_failed
     run_metadata["mcp_failed"] = mcp_failed
-    write_json(run_paths.run_json, run_metadata)
+    run_metadata["budgets"] = _budgets_summary(*stage_budgets)
+    run_metadata["deadline"] = deadline.summary()
+    run_metadata["tool_output"] = compactor.summary()
+    run_metadata["stage_seconds"] = clock.seconds
+    _add_profile_summary(profiler, run_metadata)
+    run_metadata["event_loop"] = await _event_loop_summary(watchdog, blocking)
+    run_metadata["logging"] = logger.summary()
+    await blocking.run(_save_cassette, cassette, run_paths, run_metadata)
+    await blocking.run(write_json, run_paths.run_json, run_metadata)
 
-    if mcp_client is not None:
-        await mcp_client.close()
+    if config.index.enabled:
+        try:
+            indexed = await blocking.run(
+                ResearchIndex(config.index.path).ingest_run, run_paths.run_dir
+            )
+            logger.info("research_index_updated", {"documents": indexed})
+        except sqlite3.Error as exc:
+            logger.error("research_index_failed", {"error": str(exc)})
 
-    logger.info("run_completed", {"article_path": str(article_path)})
+    logger.info(
+        "run_completed",
+        {"article_path": str(article_path), "articles": len(article_paths)},
+    )
     return run_paths
 
 
+async def _force_research_finalization(
+    agent: Any,
+    model: ChatOpenAI,
+    system_prompt: str,
+    research_input: Dict[str, Any],
+    agent_config: Dict[str, Any],
+    timeout: Optional[float],
+) -> str:
+    # Flatten the partial transcript into plain text so the extra turn does not
+    # depend on provider support for dangling tool calls.
+    state = await agent.aget_state(agent_config)
+    tool_results = [
+        f"[{message.name or 'tool'}]\n"
+        f"{_truncate_text(content_to_text(message.content), FINALIZE_TOOL_RESULT_MAX_CHARS)}"
+        for message in state.values.get("messages", [])
+        if isinstance(message, ToolMessage)
+    ]
+    messages = [
+        SystemMessage(content=system_prompt),
+        *research_input["messages"],
+        HumanMessage(
+            content=(
+                "Tool results gathered so far:\n\n"
+                + ("\n\n".join(tool_results) or "(none)")
+                + "\n\n"
+                + RESEARCH_FINALIZE_INSTRUCTION
+            )
+        ),
+    ]
+    response = await wait_with_timeout(
+        model.ainvoke(messages, config={"tags": ["research", "finalize"]}), timeout
+    )
+    return content_to_text(response.content)
+
+
+async def _event_loop_summary(
+    watchdog: Optional[LoopWatchdog], blocking: BlockingCalls
+) -> Dict[str, Any]:
+    if watchdog is not None:
+        await watchdog.stop()
+    return {
+        "watchdog": watchdog.summary() if watchdog is not None else None,
+        "blocking_calls": blocking.summary(),
+    }
+
+
+def _record_metrics(
+    exporter: MetricsExporter,
+    preset: LoadedPreset,
+    run_paths: RunPaths,
+    clock: StageClock,
+    outcome: str,
+    started: float,
+    logger: RunLogger,
+) -> None:
+    run_metadata: Dict[str, Any] = {}
+    if run_paths.run_json.exists():
+        run_metadata = json.loads(run_paths.run_json.read_text(encoding="utf-8"))
+    if outcome != "success" and run_metadata.get("error"):
+        outcome = run_metadata["error"]
+    stage_seconds = {**clock.seconds, "total": time.perf_counter() - started}
+    try:
+        exporter.record(preset.name, run_metadata, stage_seconds, outcome)
+    except OSError as exc:
+        logger.error("metrics_write_failed", {"error": str(exc)})
+
+
+def _add_profile_summary(profiler: StageProfiler, run_metadata: Dict[str, Any]) -> None:
+    summary = profiler.summary()
+    if summary is not None:
+        run_metadata["profile"] = summary
+
+
+async def _reemit_research_json(
+    model: ChatOpenAI,
+    system_prompt: str,
+    previous_output: str,
+    timeout: Optional[float],
+) -> str:
+    messages = [
+        SystemMessage(content=system_prompt),
+        HumanMessage(
+            content=(
+                "Previous answer:\n"
+                f"{_truncate_text(previous_output, REEMIT_PREVIOUS_MAX_CHARS)}\n\n"
+                f"{RESEARCH_REEMIT_INSTRUCTION}"
+            )
+        ),
+    ]
+    response = await wait_with_timeout(
+        model.ainvoke(messages, config={"tags": ["research", "reemit"]}), timeout
+    )
+    return content_to_text(response.content)
+
+
+def _save_cassette(
+    cassette: Optional[Cassette], run_paths: RunPaths, run_metadata: Dict[str, Any]
+) -> None:
+    if cassette is None:
+        return
+    summary = cassette.summary()
+    if not cassette.replaying:
+        cassette_path = run_paths.run_dir / CASSETTE_FILENAME
+        cassette.save(cassette_path)
+        summary["path"] = str(cassette_path)
+    run_metadata["cassette"] = summary
+
+
+def _budgets_summary(*budgets: StageBudget) -> Dict[str, Any]:
+    return {budget.stage: budget.summary() for budget in budgets}
+
+
+def _structured_response(response: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(response, dict):
+        structured = response.get("structured_response")
+        if isinstance(structured, dict):
+            return structured
+    return None
+
+
 def _extract_agent_text(response: Any) -> str:
     if isinstance(response, dict):
         messages = response.get("messages")
@@ -0,0 +1 @@
+"""Orchestrator stage helpers."""
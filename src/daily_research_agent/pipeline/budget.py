@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tools import BaseTool
+
+from daily_research_agent.config import StageBudgetConfig
+from daily_research_agent.integrations.mcp_client import CircuitOpenMessage, wrap_tool
+from daily_research_agent.pipeline.deadline import wait_with_timeout
+
+T = TypeVar("T")
+
+BUDGET_EXHAUSTED_MESSAGE = (
+    "Budget exhausted ({reason}). Do not call any more tools. "
+    "Finalize your answer now using only the information gathered so far."
+)
+TOOL_TIMEOUT_MESSAGE = (
+    "Tool call timed out after {seconds:g}s. "
+    "Continue with other sources or finalize with what you have."
+)
+
+
+class BudgetExceededError(RuntimeError):
+    def __init__(self, stage: str, reason: str) -> None:
+        super().__init__(f"{stage} stage exceeded its budget: {reason}")
+        self.stage = stage
+        self.reason = reason
+
+
+class _UsageCallbackHandler(BaseCallbackHandler):
+    raise_error = True
+
+    def __init__(self, budget: "StageBudget") -> None:
+        self._budget = budget
+
+    def on_chat_model_start(self, serialized: Any, messages: Any, **kwargs: Any) -> None:
+        self._budget.check_model_call()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        input_tokens = 0
+        output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    input_tokens += int(usage.get("input_tokens", 0))
+                    output_tokens += int(usage.get("output_tokens", 0))
+        if not input_tokens and not output_tokens:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            input_tokens = int(token_usage.get("prompt_tokens", 0))
+            output_tokens = int(token_usage.get("completion_tokens", 0))
+        self._budget.add_usage(input_tokens, output_tokens)
+
+
+class StageBudget:
+    """Tracks tool calls, tokens and wall-clock time for one agent stage.
+
+    Limits of 0 mean "unlimited". Once the tool or token limit is reached,
+    wrapped tools refuse further calls so the agent finalizes. Past the token
+    limit the agent gets one more model turn to do so; the wall-clock limit
+    cancels the stage outright.
+    """
+
+    def __init__(
+        self,
+        stage: str,
+        config: StageBudgetConfig,
+        tool_call_timeout_seconds: float = 0,
+    ) -> None:
+        self.stage = stage
+        self.config = config
+        self.tool_call_timeout_seconds = tool_call_timeout_seconds
+        self.tool_calls = 0
+        self.refused_tool_calls = 0
+        self.timed_out_tool_calls = 0
+        self.error_tool_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cutoffs: Dict[str, Dict[str, Any]] = {}
+        self._model_calls_over_token_limit = 0
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self._started is None:
+            return 0.0
+        end = self._finished if self._finished is not None else time.monotonic()
+        return end - self._started
+
+    def exhausted_reason(self) -> Optional[str]:
+        if self.config.max_tool_calls > 0 and self.tool_calls >= self.config.max_tool_calls:
+            return "max_tool_calls"
+        if self.config.max_tokens > 0 and self.total_tokens >= self.config.max_tokens:
+            return "max_tokens"
+        return None
+
+    def record_cutoff(self, kind: str, **detail: Any) -> None:
+        entry = self.cutoffs.get(kind)
+        if entry is None:
+            self.cutoffs[kind] = {
+                "count": 1,
+                "first_at_seconds": round(self.elapsed_seconds, 3),
+                **detail,
+            }
+        else:
+            entry["count"] += 1
+            entry.update(detail)
+
+    def check_model_call(self) -> None:
+        if self.config.max_tokens <= 0 or self.total_tokens < self.config.max_tokens:
+            return
+        self._model_calls_over_token_limit += 1
+        if self._model_calls_over_token_limit > 1:
+            self.record_cutoff("max_tokens_hard", tokens=self.total_tokens)
+            raise BudgetExceededError(self.stage, "max_tokens")
+
+    def add_usage(self, input_tokens: int, output_tokens: int) -> None:
+        before = self.total_tokens
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        limit = self.config.max_tokens
+        if limit > 0 and before < limit <= self.total_tokens:
+            self.record_cutoff("max_tokens", tokens=self.total_tokens)
+
+    def callback_handler(self) -> BaseCallbackHandler:
+        return _UsageCallbackHandler(self)
+
+    def wrap_tools(self, tools: List[BaseTool]) -> List[BaseTool]:
+        return [wrap_tool(tool, self._call_tool) for tool in tools]
+
+    async def _call_tool(self, tool: BaseTool, arguments: Dict[str, Any]) -> Any:
+        reason = self.exhausted_reason()
+        if reason is not None:
+            self.refused_tool_calls += 1
+            self.record_cutoff("tool_call_refused", reason=reason, tool=tool.name)
+            return BUDGET_EXHAUSTED_MESSAGE.format(reason=reason)
+
+        self.tool_calls += 1
+        timeout = self.tool_call_timeout_seconds
+        try:
+            if timeout <= 0:
+                result = await tool.ainvoke(arguments)
+            else:
+                try:
+                    result = await wait_with_timeout(tool.ainvoke(arguments), timeout)
+                except asyncio.TimeoutError:
+                    self.timed_out_tool_calls += 1
+                    self.record_cutoff("tool_call_timeout", tool=tool.name, seconds=timeout)
+                    return TOOL_TIMEOUT_MESSAGE.format(seconds=timeout)
+        except Exception:
+            self.error_tool_calls += 1
+            raise
+        if isinstance(result, CircuitOpenMessage):
+            self.error_tool_calls += 1
+        return result
+
+    async def run(
+        self,
+        awaitable: Awaitable[T],
+        deadline_seconds: Optional[float] = None,
+    ) -> T:
+        """Await ``awaitable`` under the stage's wall-clock limit.
+
+        ``deadline_seconds`` is the time left for this stage under the run
+        deadline (``None`` when there is none); the tighter limit applies.
+        """
+        limit = self.config.max_seconds
+        reason = "max_seconds"
+        if deadline_seconds is not None and (limit <= 0 or deadline_seconds < limit):
+            limit = deadline_seconds
+            reason = "deadline"
+        self._started = time.monotonic()
+        try:
+            if limit <= 0 and deadline_seconds is None:
+                return await awaitable
+            try:
+                return await wait_with_timeout(awaitable, limit)
+            except asyncio.TimeoutError as exc:
+                self.record_cutoff(reason, seconds=round(limit, 3))
+                raise BudgetExceededError(self.stage, reason) from exc
+        finally:
+            self._finished = time.monotonic()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "limits": {
+                "max_tool_calls": self.config.max_tool_calls,
+                "max_tokens": self.config.max_tokens,
+                "max_seconds": self.config.max_seconds,
+                "tool_call_timeout_seconds": self.tool_call_timeout_seconds,
+            },
+            "tool_calls": self.tool_calls,
+            "refused_tool_calls": self.refused_tool_calls,
+            "timed_out_tool_calls": self.timed_out_tool_calls,
+            "error_tool_calls": self.error_tool_calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "cutoffs": self.cutoffs,
+        }
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+import math
+from typing import Dict, List
+
+from daily_research_agent.domain.models import BookmarkPost
+from daily_research_agent.integrations.bookmark_ranking import bm25_tokens
+from daily_research_agent.pipeline.dedup import UnionFind
+
+# Posts with fewer terms ("wow", "must read") only cluster via shared references.
+MIN_TERMS = 3
+
+
+@dataclass
+class BookmarkCluster:
+    id: str
+    representative: BookmarkPost
+    members: List[BookmarkPost] = field(default_factory=list)
+
+    @property
+    def other_urls(self) -> List[str]:
+        return [post.url for post in self.members if post.id != self.representative.id]
+
+
+def _post_tokens(post: BookmarkPost) -> List[str]:
+    # Quoted posts usually carry the announcement itself, so they count too.
+    parts = [post.text, *(ref.text for ref in post.referenced_posts)]
+    return bm25_tokens(" ".join(parts))
+
+
+def _tfidf_vectors(documents: List[List[str]]) -> List[Dict[str, float]]:
+    df = Counter(term for tokens in documents for term in set(tokens))
+    total = len(documents)
+    vectors = []
+    for tokens in documents:
+        weights = {
+            term: (1 + math.log(count)) * math.log(1 + total / df[term])
+            for term, count in Counter(tokens).items()
+        }
+        norm = math.sqrt(sum(value * value for value in weights.values())) or 1.0
+        vectors.append({term: value / norm for term, value in weights.items()})
+    return vectors
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(term, 0.0) for term, value in a.items())
+
+
+def assign_clusters(
+    bookmarks: List[BookmarkPost], threshold: float = 0.4, max_posts: int = 200
+) -> Dict[str, str]:
+    """Map each post id to a cluster id (``c1``, ``c2`` ... in list order).
+
+    Posts join a cluster when their TF-IDF cosine similarity reaches
+    ``threshold`` or when they reference the same post; clusters are the
+    transitive closure of those links. Only the first ``max_posts`` posts
+    (0 = all) are compared by text, and only with posts sharing a term, so
+    a large selection doesn't cost a pairwise pass over every bookmark;
+    later posts still join a cluster through a shared reference.
+    """
+    compared = len(bookmarks) if max_posts <= 0 else min(max_posts, len(bookmarks))
+    documents = [_post_tokens(post) for post in bookmarks[:compared]]
+    vectors = _tfidf_vectors(documents)
+    union = UnionFind(len(bookmarks))
+    referenced: Dict[str, int] = {}
+    for index, post in enumerate(bookmarks):
+        for ref in post.referenced_posts:
+            if ref.id in referenced:
+                union.union(referenced[ref.id], index)
+            else:
+                referenced[ref.id] = index
+
+    postings: Dict[str, List[int]] = {}
+    for index, vector in enumerate(vectors):
+        if len(vector) < MIN_TERMS:
+            continue
+        candidates = {other for term in vector for other in postings.get(term, ())}
+        for other in candidates:
+            if _cosine(vector, vectors[other]) >= threshold:
+                union.union(other, index)
+        for term in vector:
+            postings.setdefault(term, []).append(index)
+
+    labels: Dict[int, str] = {}
+    assignments: Dict[str, str] = {}
+    for index, post in enumerate(bookmarks):
+        root = union.find(index)
+        if root not in labels:
+            labels[root] = f"c{len(labels) + 1}"
+        assignments[post.id] = labels[root]
+    return assignments
+
+
+def group_clusters(
+    bookmarks: List[BookmarkPost], assignments: Dict[str, str]
+) -> List[BookmarkCluster]:
+    """Clusters in list order; each is represented by its first member.
+
+    Posts without an assignment form their own cluster, so filtering the
+    list after assignment never loses a post.
+    """
+    clusters: Dict[str, BookmarkCluster] = {}
+    for post in bookmarks:
+        cluster_id = assignments.get(post.id, post.id)
+        cluster = clusters.get(cluster_id)
+        if cluster is None:
+            cluster = clusters[cluster_id] = BookmarkCluster(cluster_id, post)
+        cluster.members.append(post)
+    return list(clusters.values())
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langchain_core.tools import BaseTool
+
+from daily_research_agent.artifacts.paths import slugify
+from daily_research_agent.artifacts.writer import write_text
+from daily_research_agent.config import ToolOutputConfig
+from daily_research_agent.integrations.mcp_client import content_to_text, wrap_tool
+from daily_research_agent.pipeline.event_loop import BlockingCalls
+
+_URL_RE = re.compile(r"https?://[^\s\"'<>()\[\]]+")
+MAX_SUMMARY_URLS = 10
+
+
+def _truncate_bytes(text: str, max_bytes: int) -> str:
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode("utf-8", errors="ignore")
+
+
+def _unique_urls(text: str, limit: int) -> List[str]:
+    urls: List[str] = []
+    seen = set()
+    for match in _URL_RE.finditer(text):
+        url = match.group(0).rstrip(".,;:")
+        if url in seen:
+            continue
+        seen.add(url)
+        urls.append(url)
+        if len(urls) >= limit:
+            break
+    return urls
+
+
+class ToolOutputCompactor:
+    """Caps MCP tool results before they enter the agent's message history.
+
+    Oversized results are written to ``spill_dir`` and replaced with a preview,
+    the URLs they mention and a path the agent can open with ``read_file``.
+    ``backend_root`` is the FilesystemBackend root so the path is the one the
+    agent's file tools resolve.
+    """
+
+    def __init__(
+        self,
+        config: ToolOutputConfig,
+        spill_dir: Path,
+        backend_root: Path,
+        blocking: Optional[BlockingCalls] = None,
+    ) -> None:
+        self.config = config
+        self.spill_dir = spill_dir
+        self.backend_root = backend_root
+        self.blocking = blocking or BlockingCalls(offload=False)
+        self.calls = 0
+        self.compacted = 0
+        self.original_bytes = 0
+        self.returned_bytes = 0
+
+    def wrap_tools(self, tools: List[BaseTool]) -> List[BaseTool]:
+        if self.config.max_bytes <= 0:
+            return tools
+        return [wrap_tool(tool, self._call_tool) for tool in tools]
+
+    async def _call_tool(self, tool: BaseTool, arguments: Dict[str, Any]) -> Any:
+        result = await tool.ainvoke(arguments)
+        self.calls += 1
+        text = content_to_text(result)
+        size = len(text.encode("utf-8"))
+        self.original_bytes += size
+        if size <= self.config.max_bytes:
+            self.returned_bytes += size
+            return result
+
+        self.compacted += 1
+        compact = await self._compact(tool.name, text, size)
+        self.returned_bytes += len(compact.encode("utf-8"))
+        return compact
+
+    async def _compact(self, tool_name: str, text: str, size: int) -> str:
+        footer: List[str] = []
+        urls = _unique_urls(text, MAX_SUMMARY_URLS)
+        if urls:
+            footer.append("URLs in the full result:")
+            footer.extend(f"- {url}" for url in urls)
+        if self.config.spill:
+            path = self.spill_dir / f"{self.calls:04d}-{slugify(tool_name)}.txt"
+            await self.blocking.run(write_text, path, text)
+            virtual_path = "/" + path.relative_to(self.backend_root).as_posix()
+            footer.append(f"Full result saved to {virtual_path} (use read_file to see more).")
+        header = f"[{tool_name} result truncated from {size} bytes]"
+        footer_text = "\n".join(footer)
+        # The preview gets whatever is left once the header and footer fit.
+        room = self.config.max_bytes - len(header.encode("utf-8")) - len(footer_text.encode("utf-8")) - 2
+        preview = _truncate_bytes(text, max(0, min(self.config.preview_bytes, room)))
+        compact = "\n".join(part for part in (header, preview, footer_text) if part)
+        return _truncate_bytes(compact, self.config.max_bytes)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "max_bytes": self.config.max_bytes,
+            "calls": self.calls,
+            "compacted": self.compacted,
+            "original_bytes": self.original_bytes,
+            "returned_bytes": self.returned_bytes,
+        }
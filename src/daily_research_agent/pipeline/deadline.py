@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Stages that run after the researcher and therefore keep their share reserved
+# while earlier stages are running.
+_RESERVED_STAGES = ("finalize", "verify", "writer")
+
+
+class RunDeadline:
+    """Splits a run-level time budget across stages.
+
+    ``x`` and ``mcp`` get a fixed share, ``research`` gets the remainder, and
+    ``finalize``/``verify``/``writer`` always keep their reserved share even
+    when earlier stages overran. A total of 0 disables the deadline.
+    """
+
+    def __init__(self, total_seconds: float, shares: Dict[str, float]) -> None:
+        self.total_seconds = total_seconds
+        self.shares = shares
+        self.assigned: Dict[str, float] = {}
+        self.overruns: List[str] = []
+        self._started = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.total_seconds > 0
+
+    def remaining(self) -> float:
+        return self.total_seconds - (time.monotonic() - self._started)
+
+    def _reserve_after(self, stage: str) -> float:
+        if stage in _RESERVED_STAGES:
+            later = _RESERVED_STAGES[_RESERVED_STAGES.index(stage) + 1 :]
+        else:
+            later = _RESERVED_STAGES
+        return sum(self.total_seconds * self.shares.get(name, 0.0) for name in later)
+
+    def stage_timeout(self, stage: str) -> Optional[float]:
+        if not self.enabled:
+            return None
+        remaining = self.remaining()
+        reserve = self._reserve_after(stage)
+        available = max(0.0, remaining - reserve)
+        if stage in _RESERVED_STAGES:
+            timeout = max(available, self.total_seconds * self.shares.get(stage, 0.0))
+        elif stage in self.shares:
+            timeout = min(self.total_seconds * self.shares[stage], available)
+        else:
+            timeout = available
+        self.assigned[stage] = round(timeout, 3)
+        return timeout
+
+    def record_overrun(self, stage: str) -> None:
+        self.overruns.append(stage)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "deadline_seconds": self.total_seconds,
+            "assigned_seconds": self.assigned,
+            "overruns": self.overruns,
+            "remaining_seconds": round(self.remaining(), 3) if self.enabled else None,
+        }
+
+
+async def wait_with_timeout(awaitable: Awaitable[T], timeout: Optional[float]) -> T:
+    """Like ``asyncio.wait_for`` but always raises ``TimeoutError`` on expiry.
+
+    Cancelling MCP stdio sessions can surface as an ``ExceptionGroup`` from
+    their task groups instead of ``CancelledError``; ``wait_for`` would then
+    leak that error rather than report the timeout.
+    """
+    if timeout is None:
+        return await awaitable
+    task = asyncio.ensure_future(awaitable)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=max(timeout, 0.0))
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    if task in done:
+        return task.result()
+    task.cancel()
+    try:
+        await task
+    except BaseException as exc:  # noqa: BLE001 - the cancelled task's outcome is irrelevant
+        if not isinstance(exc, (Exception, asyncio.CancelledError)):
+            raise
+    raise asyncio.TimeoutError()
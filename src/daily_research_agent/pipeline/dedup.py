@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+# Query parameters that only track the click, never select content.
+TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "ref_src",
+        "ref_url",
+        "referrer",
+        "spm",
+        "cmpid",
+        "ncid",
+        "sr_share",
+        "smid",
+        "amp",
+        "outputtype",
+    }
+)
+TRACKING_PREFIXES = ("utm_", "__twitter", "_hs", "mkt_", "pk_", "vero_")
+_MIRROR_PREFIXES = ("m.", "mobile.", "amp.")
+# Sites whose m./mobile./amp. hosts serve the same pages as the main host.
+# Elsewhere such a subdomain can be a different site, so it is kept.
+_MIRRORED_HOSTS = frozenset(
+    {
+        "bbc.co.uk",
+        "cnn.com",
+        "facebook.com",
+        "reddit.com",
+        "theguardian.com",
+        "twitter.com",
+        "x.com",
+        "youtube.com",
+    }
+)
+_AMP_CACHE_RE = re.compile(r"^/(?:c/)?(?:s/)?(?P<rest>.+)$")
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]")
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so tracking, AMP and host variants compare equal.
+
+    Lowercases scheme and host, drops ``www.`` (and ``m.``/``mobile.``/``amp.``
+    on known mirrored sites), default ports, fragments, tracking parameters
+    and a trailing ``/amp`` or ``.amp.html``, unwraps Google/ampproject AMP
+    cache URLs, and sorts the remaining query.
+    """
+    raw = url.strip()
+    parts = urlsplit(raw)
+    if not parts.scheme or not parts.netloc:
+        return raw
+    host = (parts.hostname or "").lower()
+    path = parts.path
+
+    unwrapped = _unwrap_amp_cache(host, path)
+    if unwrapped is not None:
+        return canonicalize_url(unwrapped)
+
+    if host.startswith("www.") and host.count(".") > 1:
+        host = host[len("www.") :]
+    for prefix in _MIRROR_PREFIXES:
+        if host.startswith(prefix) and host[len(prefix) :] in _MIRRORED_HOSTS:
+            host = host[len(prefix) :]
+            break
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and not (
+        (parts.scheme == "http" and port == 80) or (parts.scheme == "https" and port == 443)
+    ):
+        host = f"{host}:{port}"
+
+    path = re.sub(r"/{2,}", "/", path)
+    path = re.sub(r"/amp(?:\.html)?/?$", "", path)
+    path = re.sub(r"\.amp(\.html?)$", r"\1", path)
+    if path.endswith("/index.html") or path.endswith("/index.htm"):
+        path = path[: path.rfind("/") + 1]
+    if len(path) > 1:
+        path = path.rstrip("/")
+    if not path:
+        path = "/"
+
+    query = _content_params(parts.query)
+    scheme = "https" if parts.scheme in ("http", "https") else parts.scheme
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+def strip_tracking_params(url: str) -> str:
+    """Drop tracking query parameters, leaving the rest of the URL as written."""
+    raw = url.strip()
+    parts = urlsplit(raw)
+    if not parts.query:
+        return raw
+    query = _content_params(parts.query)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _content_params(query: str) -> List[Tuple[str, str]]:
+    return [
+        (key, value)
+        for key, value in parse_qsl(query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+
+
+def _unwrap_amp_cache(host: str, path: str) -> Optional[str]:
+    if host.endswith(".cdn.ampproject.org") or (
+        (host == "google.com" or host.endswith(".google.com")) and path.startswith("/amp/")
+    ):
+        rest = path[len("/amp") :] if path.startswith("/amp/") else path
+        match = _AMP_CACHE_RE.match(rest)
+        if match:
+            secure = "/s/" in rest[:5]
+            return f"{'https' if secure else 'http'}://{unquote(match.group('rest'))}"
+    return None
+
+
+def text_tokens(text: str) -> List[str]:
+    """Lowercased ASCII words plus single CJK characters."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def simhash(tokens: List[str], shingle_size: int = SHINGLE_SIZE) -> int:
+    if len(tokens) < shingle_size:
+        shingles = [" ".join(tokens)] if tokens else []
+    else:
+        shingles = [
+            " ".join(tokens[i : i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)
+        ]
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class UnionFind:
+    """Disjoint sets over ``range(size)``; the lowest index represents a set."""
+
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # The earlier entry stays the representative.
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def _near_duplicate_pairs(
+    signatures: List[Optional[int]], max_distance: int
+) -> List[Tuple[int, int]]:
+    # Split signatures into max_distance + 1 bands: two signatures within the
+    # distance must agree exactly on at least one band.
+    bands = max_distance + 1
+    width = SIMHASH_BITS // bands
+    buckets: Dict[Tuple[int, int], List[int]] = {}
+    pairs = set()
+    for index, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        for band in range(bands):
+            key = (band, signature >> (band * width) & ((1 << width) - 1))
+            for other in buckets.get(key, []):
+                if hamming(signature, signatures[other]) <= max_distance:  # type: ignore[arg-type]
+                    pairs.add((other, index))
+            buckets.setdefault(key, []).append(index)
+    return sorted(pairs)
+
+
+def _merge_source(target: Dict[str, Any], other: Dict[str, Any]) -> None:
+    for key, value in other.items():
+        if key in ("url", "mirrors"):
+            continue
+        if not target.get(key) and value:
+            target[key] = value
+    if other.get("snippet") and len(other["snippet"]) > len(target.get("snippet") or ""):
+        target["snippet"] = other["snippet"]
+
+
+def dedupe_sources(
+    parsed: Dict[str, Any], max_distance: int = 3, min_tokens: int = 8
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Collapse duplicate sources and point findings at the survivors.
+
+    Sources are first grouped by canonical URL, then near-duplicate groups
+    (SimHash of title and snippet within ``max_distance`` bits) are merged.
+    The canonical URL is only the grouping key: each group keeps its first
+    entry under the URL it was cited with (tracking parameters removed),
+    filled in with any metadata the others had; the URLs of merged copies are
+    listed under ``mirrors``.
+    """
+    raw_sources = parsed.get("sources", [])
+    groups: Dict[str, Dict[str, Any]] = {}
+    order: List[str] = []
+    url_variants = 0
+    for source in raw_sources:
+        canonical = canonicalize_url(source["url"])
+        if canonical in groups:
+            url_variants += 1
+            _merge_source(groups[canonical], source)
+            continue
+        groups[canonical] = {**source, "url": strip_tracking_params(source["url"])}
+        order.append(canonical)
+
+    signatures: List[Optional[int]] = []
+    for canonical in order:
+        source = groups[canonical]
+        tokens = text_tokens(f"{source.get('title') or ''} {source.get('snippet') or ''}")
+        signatures.append(simhash(tokens) if len(tokens) >= min_tokens else None)
+
+    union = UnionFind(len(order))
+    for a, b in _near_duplicate_pairs(signatures, max_distance):
+        union.union(a, b)
+
+    sources: List[Dict[str, Any]] = []
+    representative: Dict[str, str] = {}
+    for index, canonical in enumerate(order):
+        root = order[union.find(index)]
+        representative[canonical] = root
+        if root == canonical:
+            sources.append(groups[canonical])
+            continue
+        target = groups[root]
+        _merge_source(target, groups[canonical])
+        target.setdefault("mirrors", []).append(groups[canonical]["url"])
+
+    def _resolve(url: str) -> str:
+        canonical = canonicalize_url(url)
+        if canonical not in representative:
+            return url
+        return groups[representative[canonical]]["url"]
+
+    findings = []
+    for finding in parsed.get("findings", []):
+        refs: List[str] = []
+        for url in finding.get("sources", []):
+            resolved = _resolve(url)
+            if resolved not in refs:
+                refs.append(resolved)
+        findings.append({**finding, "sources": refs})
+
+    summary = {
+        "sources_in": len(raw_sources),
+        "sources_out": len(sources),
+        "url_variants": url_variants,
+        "near_duplicates": len(order) - len(sources),
+    }
+    return {**parsed, "sources": sources, "findings": findings}, summary
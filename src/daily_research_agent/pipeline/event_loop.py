@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar
+
+from daily_research_agent.config import EventLoopConfig
+from daily_research_agent.logging import RunLogger
+
+T = TypeVar("T")
+
+MAX_STACK_FRAMES = 30
+MAX_STACK_SAMPLES = 20
+LAG_WINDOW = 10_000
+
+
+class LoopWatchdog:
+    """Measures event-loop lag and samples the loop's stack when it stalls.
+
+    A heartbeat task records how late each ``sleep(interval)`` wakes up. A
+    separate thread watches the heartbeat; once it is older than the threshold,
+    the loop thread is blocked right now, so its current stack is logged once
+    per stall.
+    """
+
+    def __init__(self, config: EventLoopConfig, logger: RunLogger) -> None:
+        self.threshold = config.lag_threshold_ms / 1000
+        self.interval = config.check_interval_ms / 1000
+        self.logger = logger
+        self.lags: Deque[float] = deque(maxlen=LAG_WINDOW)
+        self.max_lag = 0.0
+        self.blocked_events = 0
+        self.samples: List[Dict[str, Any]] = []
+        self._heartbeat = time.monotonic()
+        self._started = self._heartbeat
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = self._started = time.monotonic()
+        self._task = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    async def _beat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            self._heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        reported = False
+        while not self._stop.wait(self.interval):
+            if self._task is not None and self._task.done():
+                # The loop went away without stop(); nothing left to watch.
+                return
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            if stalled < self.threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            reported = True
+            self.blocked_events += 1
+            stack = self._loop_stack()
+            if len(self.samples) < MAX_STACK_SAMPLES:
+                self.samples.append(
+                    {
+                        "at_seconds": round(time.monotonic() - self._started, 3),
+                        "stalled_ms": round(stalled * 1000, 1),
+                        "stack": stack,
+                    }
+                )
+            self.logger.warning(
+                "event_loop_blocked",
+                {"stalled_ms": round(stalled * 1000, 1), "stack": stack},
+            )
+
+    def _loop_stack(self) -> str:
+        frame = sys._current_frames().get(self._loop_thread_id or 0)
+        if frame is None:
+            return ""
+        return "".join(traceback.format_stack(frame)[-MAX_STACK_FRAMES:])
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.lags)
+        p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))] if ordered else 0.0
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "p99_lag_ms": round(p99 * 1000, 1),
+            "blocked_events": self.blocked_events,
+            "stack_samples": self.samples,
+        }
+
+
+class BlockingCalls:
+    """Runs known blocking operations inline or in the default thread pool.
+
+    Inline calls are timed per operation so the run metadata shows how long
+    the loop spent blocked on them.
+    """
+
+    def __init__(self, offload: bool) -> None:
+        self.offload = offload
+        self.ops: Dict[str, Dict[str, Any]] = {}
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        started = time.perf_counter()
+        try:
+            if self.offload:
+                return await asyncio.to_thread(func, *args, **kwargs)
+            return func(*args, **kwargs)
+        finally:
+            name = getattr(func, "__qualname__", repr(func))
+            stats = self.ops.setdefault(name, {"calls": 0, "seconds": 0.0})
+            stats["calls"] += 1
+            stats["seconds"] += time.perf_counter() - started
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "offload": self.offload,
+            "ops": {
+                name: {"calls": stats["calls"], "seconds": round(stats["seconds"], 3)}
+                for name, stats in self.ops.items()
+            },
+        }
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+RESEARCH_KEYS = ("findings", "sources", "memo_markdown", "missing_info")
+# Upper bound on truncation points tried while repairing, newest first.
+MAX_REPAIR_ATTEMPTS = 200
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*\n(.*?)(?:\n```|\Z)", re.DOTALL)
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+@dataclass
+class ExtractionResult:
+    data: Optional[Dict[str, Any]]
+    # structured | direct | fenced | embedded | repaired | failed
+    method: str
+    dropped_items: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+    def summary(self) -> Dict[str, Any]:
+        return {"method": self.method, "dropped_items": self.dropped_items}
+
+
+def extract_research_json(text: str) -> ExtractionResult:
+    """Pull the research JSON object out of free-form model output.
+
+    Tries, in order: the whole text, fenced code blocks, the first complete
+    object embedded in prose, and finally a repair of truncated output that cuts
+    back to the last complete element and closes the open containers.
+    Findings and sources that don't have the expected shape are dropped
+    instead of failing the whole document.
+    """
+    raw = text.strip()
+    if not raw:
+        return ExtractionResult(None, "failed")
+
+    data = _loads_object(raw)
+    if data is not None:
+        return _salvage(data, "direct")
+
+    for block in _FENCE_RE.findall(raw):
+        data = _loads_object(block.strip())
+        if data is not None:
+            return _salvage(data, "fenced")
+
+    data = _first_embedded_object(raw)
+    if data is not None:
+        return _salvage(data, "embedded")
+
+    start = _research_object_start(raw)
+    if start is not None:
+        data = repair_truncated_json(raw[start:])
+        if data is not None:
+            return _salvage(data, "repaired")
+    return ExtractionResult(None, "failed")
+
+
+def _loads_object(text: str) -> Optional[Dict[str, Any]]:
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _first_embedded_object(text: str) -> Optional[Dict[str, Any]]:
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"\{", text):
+        try:
+            value, _ = decoder.raw_decode(text, match.start())
+        except json.JSONDecodeError:
+            continue
+        # Findings carry their own "sources" key, so that one alone doesn't count.
+        if isinstance(value, dict) and any(key in value for key in RESEARCH_KEYS if key != "sources"):
+            return value
+    return None
+
+
+def _research_object_start(text: str) -> Optional[int]:
+    # Prefer the brace that opens the object holding the research keys.
+    key_match = re.search(r'"(?:findings|sources|memo_markdown|missing_info)"\s*:', text)
+    if key_match:
+        start = text.rfind("{", 0, key_match.start())
+        if start != -1:
+            return start
+    start = text.find("{")
+    return start if start != -1 else None
+
+
+def _scan(text: str) -> Iterator[Tuple[int, List[str], bool]]:
+    """Yield (position, open-container stack, in_string) after each character."""
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(char)
+        elif char in "}]":
+            if stack:
+                stack.pop()
+        yield index + 1, stack, in_string
+
+
+def repair_truncated_json(text: str) -> Optional[Dict[str, Any]]:
+    """Close a truncated JSON object, dropping the trailing partial element.
+
+    Only cuts after a top-level member or a complete item of a top-level
+    array are tried: a half-written claim or URL, or a finding missing its
+    later keys or some of its sources, is dropped rather than closed off and
+    passed along as if whole.
+    """
+    cut_points: List[Tuple[int, str]] = []
+    for position, stack, in_string in _scan(text):
+        char = text[position - 1]
+        if not stack and position > 1 and not in_string:
+            return _loads_object(text[:position])
+        if in_string or not stack or not (char == "," or char in "}]"):
+            continue
+        # Cutting any deeper (e.g. inside findings[i].sources) would keep a
+        # partial finding.
+        if len(stack) == 1 or (len(stack) == 2 and stack[-1] == "["):
+            closers = "".join(_CLOSERS[c] for c in reversed(stack))
+            cut = position - 1 if char == "," else position
+            cut_points.append((cut, closers))
+    for cut, closers in reversed(cut_points[-MAX_REPAIR_ATTEMPTS:]):
+        data = _loads_object(text[:cut].rstrip().rstrip(",") + closers)
+        if data is not None:
+            return data
+    return None
+
+
+def _salvage(data: Dict[str, Any], method: str) -> ExtractionResult:
+    dropped: Dict[str, int] = {}
+
+    findings = []
+    for item in _as_list(data.get("findings")):
+        if isinstance(item, dict) and isinstance(item.get("claim"), str) and item["claim"].strip():
+            findings.append(item)
+        else:
+            dropped["findings"] = dropped.get("findings", 0) + 1
+
+    sources = []
+    for item in _as_list(data.get("sources")):
+        if isinstance(item, dict) and isinstance(item.get("url"), str) and item["url"].strip():
+            sources.append(item)
+        elif isinstance(item, str) and item.startswith("http"):
+            sources.append({"url": item, "title": ""})
+        else:
+            dropped["sources"] = dropped.get("sources", 0) + 1
+
+    memo = data.get("memo_markdown")
+    cleaned = {
+        **data,
+        "findings": findings,
+        "sources": sources,
+        "memo_markdown": memo if isinstance(memo, str) else "",
+        "missing_info": [str(item) for item in _as_list(data.get("missing_info"))],
+    }
+    return ExtractionResult(cleaned, method, dropped)
+
+
+def _as_list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else []
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+import sqlite3
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from daily_research_agent.domain.models import BookmarkPost
+from daily_research_agent.pipeline.dedup import canonicalize_url
+from daily_research_agent.pipeline.verifier import claim_hash
+
+KIND_URL = "url"
+KIND_CLAIM = "claim"
+KIND_BOOKMARK = "bookmark"
+
+
+def novelty_store_path(state_dir: Path) -> Path:
+    return state_dir / "novelty.sqlite"
+
+
+class NoveltyStore:
+    """What each preset already reported: source URLs, claims and bookmarks.
+
+    Entries are keyed per preset by canonical URL, claim hash or bookmark id
+    and remember the latest article date they appeared on; the window is
+    counted back from the article date, so reruns of old dates behave the
+    same as they did originally.
+    """
+
+    def __init__(self, path: Path, preset: str, article_date: date, window_days: int) -> None:
+        self.path = path
+        self.preset = preset
+        self.article_date = article_date
+        self.since = (article_date - timedelta(days=window_days)).isoformat()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen (
+                preset TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                label TEXT,
+                last_date TEXT NOT NULL,
+                run_id TEXT,
+                PRIMARY KEY (preset, kind, key)
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS seen_recent ON seen (preset, kind, last_date)")
+        return conn
+
+    def recent(self, kind: str) -> Dict[str, str]:
+        """key -> label for entries seen inside the window, newest first.
+
+        Entries from the article date itself are excluded so a same-day rerun
+        starts from the same state as the first run of the day.
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT key, label FROM seen WHERE preset = ? AND kind = ? "
+                "AND last_date >= ? AND last_date < ? ORDER BY last_date DESC",
+                (self.preset, kind, self.since, self.article_date.isoformat()),
+            ).fetchall()
+        finally:
+            conn.close()
+        return dict(rows)
+
+    def record(self, run_id: str, entries: Iterable[Tuple[str, str, str]]) -> int:
+        rows = [
+            (self.preset, kind, key, label, self.article_date.isoformat(), run_id)
+            for kind, key, label in entries
+        ]
+        conn = self._connect()
+        try:
+            with conn:
+                # Never move an entry's date backwards when an older date is rerun.
+                conn.executemany(
+                    "INSERT INTO seen VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (preset, kind, key) DO UPDATE SET "
+                    "label = excluded.label, run_id = excluded.run_id, "
+                    "last_date = max(last_date, excluded.last_date)",
+                    rows,
+                )
+        finally:
+            conn.close()
+        return len(rows)
+
+
+def filter_seen_bookmarks(
+    bookmarks: List[BookmarkPost], seen_ids: Set[str]
+) -> Tuple[List[BookmarkPost], int]:
+    kept = [post for post in bookmarks if post.id not in seen_ids]
+    return kept, len(bookmarks) - len(kept)
+
+
+def covered_items(
+    seen_claims: Dict[str, str], max_items: int, exclude: Iterable[str] = ()
+) -> List[str]:
+    """Labels of recently reported claims, minus the ``exclude`` claim texts."""
+    excluded = {claim_hash(claim) for claim in exclude}
+    return [label for key, label in seen_claims.items() if label and key not in excluded][
+        :max_items
+    ]
+
+
+def drop_seen_findings(
+    parsed: Dict[str, Any], seen_urls: Set[str]
+) -> Tuple[Dict[str, Any], int]:
+    """Drop findings whose every cited source was already reported.
+
+    Findings without sources are kept; there is nothing to compare.
+    """
+    kept = []
+    for finding in parsed.get("findings", []):
+        refs = {canonicalize_url(url) for url in finding.get("sources", [])}
+        if refs and refs <= seen_urls:
+            continue
+        kept.append(finding)
+    dropped = len(parsed.get("findings", [])) - len(kept)
+    return {**parsed, "findings": kept}, dropped
+
+
+def run_entries(
+    parsed: Dict[str, Any], bookmarks: List[BookmarkPost]
+) -> List[Tuple[str, str, str]]:
+    """Store entries for what a run reported: cited sources, claims, bookmarks."""
+    titles = {source["url"]: source.get("title") or "" for source in parsed.get("sources", [])}
+    entries: List[Tuple[str, str, str]] = []
+    cited: Set[str] = set()
+    for finding in parsed.get("findings", []):
+        entries.append((KIND_CLAIM, claim_hash(finding["claim"]), finding["claim"]))
+        for url in finding.get("sources", []):
+            canonical = canonicalize_url(url)
+            if canonical not in cited:
+                cited.add(canonical)
+                entries.append((KIND_URL, canonical, titles.get(url, "")))
+    for post in bookmarks:
+        entries.append((KIND_BOOKMARK, post.id, post.url))
+    return entries
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import io
+from pathlib import Path
+import pstats
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional
+
+PROFILE_MODES = ("cpu", "mem", "all")
+TOP_ENTRIES = 25
+SUMMARY_ENTRIES = 10
+TRACEMALLOC_FRAMES = 10
+
+
+class StageProfiler:
+    """Per-stage cProfile and tracemalloc capture for ``run --profile``.
+
+    cProfile sees every task on the event loop while a stage is open, so the
+    numbers are only attributable to the stage in single-run processes. When
+    ``mode`` is None, ``stage()`` returns a null context and nothing is traced
+    or written.
+    """
+
+    def __init__(self, mode: Optional[str], output_dir: Path) -> None:
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Unsupported profile mode: {mode} (expected one of {PROFILE_MODES})")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None
+
+    @property
+    def cpu(self) -> bool:
+        return self.mode in ("cpu", "all")
+
+    @property
+    def mem(self) -> bool:
+        return self.mode in ("mem", "all")
+
+    def stage(self, name: str) -> contextlib.AbstractContextManager[None]:
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._profile(name)
+
+    @contextlib.contextmanager
+    def _profile(self, name: str) -> Iterator[None]:
+        entry: Dict[str, Any] = {}
+        profiler = self._start_cpu(entry) if self.cpu else None
+        started_tracing = False
+        baseline = None
+        if self.mem:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.take_snapshot()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry["wall_seconds"] = round(time.perf_counter() - started, 3)
+            if profiler is not None:
+                profiler.disable()
+            # Snapshot before writing the CPU report so its allocations don't show up.
+            if baseline is not None:
+                entry["mem"] = self._write_mem(name, baseline)
+                if started_tracing:
+                    tracemalloc.stop()
+            if profiler is not None:
+                entry["cpu"] = self._write_cpu(name, profiler)
+            self.stages[name] = entry
+
+    @staticmethod
+    def _start_cpu(entry: Dict[str, Any]) -> Optional[cProfile.Profile]:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as exc:
+            # Another profiler (e.g. a concurrent run) already owns the thread.
+            entry["cpu_skipped"] = str(exc)
+            return None
+        return profiler
+
+    def _write_cpu(self, name: str, profiler: cProfile.Profile) -> Dict[str, Any]:
+        path = self.output_dir / f"profile-{name}.pstats"
+        profiler.dump_stats(str(path))
+        stats = pstats.Stats(profiler)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(TOP_ENTRIES)
+        (self.output_dir / f"profile-{name}-cpu.txt").write_text(report.getvalue(), encoding="utf-8")
+
+        top: List[Dict[str, Any]] = []
+        ranked = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        for (filename, lineno, func), (_, ncalls, tottime, cumtime, _) in ranked[:SUMMARY_ENTRIES]:
+            top.append(
+                {
+                    "function": f"{filename}:{lineno}({func})",
+                    "calls": ncalls,
+                    "self_seconds": round(tottime, 4),
+                    "cumulative_seconds": round(cumtime, 4),
+                }
+            )
+        return {
+            "pstats": path.name,
+            "total_calls": stats.total_calls,
+            "total_seconds": round(stats.total_tt, 3),
+            "top_self_time": top,
+        }
+
+    def _write_mem(self, name: str, baseline: tracemalloc.Snapshot) -> Dict[str, Any]:
+        _, peak = tracemalloc.get_traced_memory()
+        ignore = (tracemalloc.Filter(False, tracemalloc.__file__),)
+        snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+        diff = snapshot.compare_to(baseline.filter_traces(ignore), "lineno")
+        path = self.output_dir / f"profile-{name}-alloc.txt"
+        lines = [f"peak traced: {peak} bytes", f"top {TOP_ENTRIES} allocation deltas by line:", ""]
+        lines.extend(str(stat) for stat in diff[:TOP_ENTRIES])
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return {
+            "report": path.name,
+            "peak_bytes": peak,
+            "net_bytes": sum(stat.size_diff for stat in diff),
+            "top_allocations": [
+                {
+                    "location": str(stat.traceback[0]),
+                    "size_diff_bytes": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in diff[:SUMMARY_ENTRIES]
+            ],
+        }
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        return {"mode": self.mode, "stages": self.stages}
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from daily_research_agent.pipeline.verifier import claim_hash
+
+
+@dataclass
+class PriorFindings:
+    run_id: str
+    fresh: List[Dict[str, Any]] = field(default_factory=list)
+    stale: List[Dict[str, Any]] = field(default_factory=list)
+    sources: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, Any]:
+        return {"run_id": self.run_id, "fresh": len(self.fresh), "stale": len(self.stale)}
+
+
+def parse_published_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value.strip()[:10])
+    except ValueError:
+        return None
+
+
+def find_previous_run(output_dir: Path, preset: str, current_run_id: str) -> Optional[Path]:
+    """Latest earlier run of ``preset`` that produced an article.
+
+    Run directory names start with the article date and time, so walking them
+    in reverse order visits the newest runs first.
+    """
+    runs_dir = output_dir / "runs"
+    if not runs_dir.exists():
+        return None
+    for run_dir in sorted(runs_dir.iterdir(), reverse=True):
+        if run_dir.name >= current_run_id or not (run_dir / "findings.json").exists():
+            continue
+        try:
+            meta = json.loads((run_dir / "run.json").read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        if meta.get("preset") == preset and meta.get("article_path"):
+            return run_dir
+    return None
+
+
+def load_prior_findings(
+    run_dir: Path, article_date: date, ttl_days: float, max_findings: int
+) -> PriorFindings:
+    """Split a previous run's findings into fresh and stale ones.
+
+    A finding is fresh while its newest cited source was published within
+    ``ttl_days`` of the article date; undated sources count as stale.
+    """
+    findings = json.loads((run_dir / "findings.json").read_text(encoding="utf-8"))
+    sources_path = run_dir / "sources.json"
+    sources = json.loads(sources_path.read_text(encoding="utf-8")) if sources_path.exists() else []
+    by_url = {source["url"]: source for source in sources if source.get("url")}
+    cutoff = article_date - timedelta(days=ttl_days)
+
+    prior = PriorFindings(run_id=run_dir.name)
+    for finding in findings[:max_findings] if max_findings > 0 else findings:
+        published = [
+            parse_published_date(by_url.get(url, {}).get("published_at"))
+            for url in finding.get("sources", [])
+        ]
+        newest = max((value for value in published if value is not None), default=None)
+        if newest is not None and newest >= cutoff:
+            prior.fresh.append(finding)
+            for url in finding.get("sources", []):
+                if url in by_url:
+                    prior.sources[url] = by_url[url]
+        else:
+            prior.stale.append(finding)
+    return prior
+
+
+def merge_prior_findings(
+    parsed: Dict[str, Any], prior: PriorFindings
+) -> Tuple[Dict[str, Any], int]:
+    """Carry fresh prior findings over unless the researcher restated them."""
+    claims = {claim_hash(finding["claim"]) for finding in parsed.get("findings", [])}
+    carried = [
+        {**finding, "reused_from": prior.run_id}
+        for finding in prior.fresh
+        if claim_hash(finding["claim"]) not in claims
+    ]
+    known_urls = {source["url"] for source in parsed.get("sources", [])}
+    extra_sources = [source for url, source in prior.sources.items() if url not in known_urls]
+    merged = {
+        **parsed,
+        "findings": [*parsed.get("findings", []), *carried],
+        "sources": [*parsed.get("sources", []), *extra_sources],
+    }
+    return merged, len(carried)
@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import hashlib
+import json
+from pathlib import Path
+import re
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.tools import BaseTool
+from langchain_openai import ChatOpenAI
+
+from daily_research_agent.integrations.mcp_client import content_to_text
+from daily_research_agent.pipeline.budget import BudgetExceededError, StageBudget
+from daily_research_agent.pipeline.deadline import wait_with_timeout
+from daily_research_agent.pipeline.event_loop import BlockingCalls
+
+VERDICTS = ("supported", "partial", "unsupported", "unclear")
+CONFIDENCE_ORDER = ("low", "medium", "high")
+SNIPPET_MAX_CHARS = 1500
+PAGE_MAX_CHARS = 8000
+
+VERIFIER_SYSTEM_PROMPT = (
+    "You are the Verifier agent. Decide whether the cited source supports the claim, "
+    "based on the page content fetched from the source URL. The title and snippet were "
+    "reported by the researcher and are not evidence on their own. Answer with one JSON object: "
+    '{"verdict": "supported" | "partial" | "unsupported" | "unclear", "rationale": "<one sentence>"}. '
+    "Use unclear when the page content is missing or not enough to decide."
+)
+
+_VERDICT_RE = re.compile(r"\b(unsupported|partial|supported|unclear)\b", re.IGNORECASE)
+
+CheckKey = Tuple[str, str]
+
+
+def verdict_cache_path(state_dir: Path) -> Path:
+    return state_dir / "verifier_cache.sqlite"
+
+
+def claim_hash(claim: str) -> str:
+    normalized = " ".join(claim.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Verdict:
+    verdict: str
+    rationale: str
+    cached: bool = False
+    # False when the page couldn't be fetched; such verdicts aren't cached.
+    grounded: bool = True
+
+
+@dataclass(frozen=True)
+class ClaimCheck:
+    claim: str
+    evidence: str
+    source: Dict[str, Any]
+
+
+class VerdictCache:
+    """Verdicts keyed by (claim hash, source URL) per model, shared by all presets."""
+
+    def __init__(self, path: Path, ttl_days: float) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        with conn:
+            columns = conn.execute("PRAGMA table_info(verdicts)").fetchall()
+            # Older caches were keyed without the model; carry their rows over.
+            legacy = any(name == "model" and not pk for _, name, _, _, _, pk in columns)
+            if legacy:
+                conn.execute("ALTER TABLE verdicts RENAME TO verdicts_legacy")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS verdicts (
+                    claim_hash TEXT NOT NULL,
+                    source_url TEXT NOT NULL,
+                    verdict TEXT NOT NULL,
+                    rationale TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    checked_at REAL NOT NULL,
+                    PRIMARY KEY (claim_hash, source_url, model)
+                )
+                """
+            )
+            if legacy:
+                conn.execute("INSERT OR IGNORE INTO verdicts SELECT * FROM verdicts_legacy")
+                conn.execute("DROP TABLE verdicts_legacy")
+        return conn
+
+    def get_many(self, keys: List[CheckKey], model: str) -> Dict[CheckKey, Verdict]:
+        if not keys:
+            return {}
+        cutoff = time.time() - self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        found: Dict[CheckKey, Verdict] = {}
+        conn = self._connect()
+        try:
+            for key in keys:
+                row = conn.execute(
+                    "SELECT verdict, rationale FROM verdicts "
+                    "WHERE claim_hash = ? AND source_url = ? AND model = ? AND checked_at >= ?",
+                    (*key, model, cutoff),
+                ).fetchone()
+                if row:
+                    found[key] = Verdict(row[0], row[1], cached=True)
+        finally:
+            conn.close()
+        return found
+
+    def put_many(self, verdicts: Dict[CheckKey, Verdict], model: str) -> None:
+        if not verdicts:
+            return
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (key[0], key[1], verdict.verdict, verdict.rationale, model, now)
+                        for key, verdict in verdicts.items()
+                        if verdict.grounded
+                    ],
+                )
+        finally:
+            conn.close()
+
+
+def parse_verdict(text: str) -> Verdict:
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"\{", text):
+        try:
+            value, _ = decoder.raw_decode(text, match.start())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict) and str(value.get("verdict", "")).lower() in VERDICTS:
+            return Verdict(str(value["verdict"]).lower(), str(value.get("rationale", "")))
+    keyword = _VERDICT_RE.search(text)
+    if keyword:
+        return Verdict(keyword.group(1).lower(), text.strip()[:300])
+    return Verdict("unclear", "Verifier answer could not be parsed.")
+
+
+class ClaimVerifier:
+    """Checks (claim, source) pairs with one model call each, concurrently.
+
+    Each cited page is fetched once with ``fetch_tool`` (an MCP fetch tool)
+    and shared by every claim citing it. Finished verdicts land in
+    ``results`` as they complete, so a stage that is cut off by its deadline
+    still keeps everything checked so far.
+    """
+
+    def __init__(
+        self,
+        model: ChatOpenAI,
+        concurrency: int,
+        check_timeout_seconds: float,
+        callbacks: Optional[List[BaseCallbackHandler]] = None,
+        fetch_tool: Optional[BaseTool] = None,
+    ) -> None:
+        self.model = model
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.check_timeout_seconds = check_timeout_seconds
+        self.callbacks = callbacks or []
+        self.fetch_tool = fetch_tool
+        self.results: Dict[CheckKey, Verdict] = {}
+        self.errors = 0
+        # None marks a page there was no fetch tool for.
+        self.pages: Dict[str, "Optional[asyncio.Task[Optional[str]]]"] = {}
+
+    async def check_all(self, checks: Dict[CheckKey, ClaimCheck]) -> None:
+        try:
+            await asyncio.gather(*(self._check(key, check) for key, check in checks.items()))
+        finally:
+            for task in self.pages.values():
+                if task is not None:
+                    task.cancel()
+
+    def page_stats(self) -> Dict[str, int]:
+        fetched = sum(
+            1
+            for task in self.pages.values()
+            if task is not None
+            and task.done()
+            and not task.cancelled()
+            and task.result() is not None
+        )
+        return {"fetched": fetched, "missing": len(self.pages) - fetched}
+
+    async def _page(self, url: str, timeout: Optional[float]) -> Optional[str]:
+        if url not in self.pages:
+            self.pages[url] = (
+                asyncio.ensure_future(_fetch_page(self.fetch_tool, url, timeout))
+                if self.fetch_tool is not None
+                else None
+            )
+        task = self.pages[url]
+        return await asyncio.shield(task) if task is not None else None
+
+    async def _check(self, key: CheckKey, check: ClaimCheck) -> None:
+        async with self.semaphore:
+            timeout = self.check_timeout_seconds if self.check_timeout_seconds > 0 else None
+            page = await self._page(key[1], timeout)
+            messages = [
+                SystemMessage(content=VERIFIER_SYSTEM_PROMPT),
+                HumanMessage(content=_check_prompt(check, page)),
+            ]
+            try:
+                response = await wait_with_timeout(
+                    self.model.ainvoke(
+                        messages, config={"tags": ["verifier"], "callbacks": self.callbacks}
+                    ),
+                    timeout,
+                )
+            except Exception:  # noqa: BLE001 - a failed check leaves the pair unverified
+                self.errors += 1
+                return
+        verdict = parse_verdict(content_to_text(response.content))
+        verdict.grounded = page is not None
+        self.results[key] = verdict
+
+
+async def _fetch_page(tool: BaseTool, url: str, timeout: Optional[float]) -> Optional[str]:
+    try:
+        result = await wait_with_timeout(tool.ainvoke({"url": url}), timeout)
+    except Exception:  # noqa: BLE001 - an unreachable page leaves the check ungrounded
+        return None
+    text = content_to_text(result).strip()
+    return text[:PAGE_MAX_CHARS] or None
+
+
+def _check_prompt(check: ClaimCheck, page: Optional[str]) -> str:
+    source = check.source
+    snippet = (source.get("snippet") or "")[:SNIPPET_MAX_CHARS]
+    return "\n".join(
+        [
+            f"Claim: {check.claim}",
+            f"Researcher's evidence: {check.evidence or '(none)'}",
+            f"Source URL: {source.get('url')}",
+            f"Source title: {source.get('title') or '(unknown)'}",
+            f"Publisher: {source.get('publisher') or '(unknown)'}",
+            f"Published at: {source.get('published_at') or '(unknown)'}",
+            f"Snippet: {snippet or '(none)'}",
+            "",
+            "Page content:",
+            page or "(could not be fetched)",
+        ]
+    )
+
+
+def plan_checks(
+    findings: List[Dict[str, Any]], sources: List[Dict[str, Any]], max_checks: int
+) -> Dict[CheckKey, ClaimCheck]:
+    """One check per distinct (claim, cited source) pair, in finding order.
+
+    Citations that don't match a known source have nothing to check against
+    and are skipped.
+    """
+    by_url = {source["url"]: source for source in sources}
+    checks: Dict[CheckKey, ClaimCheck] = {}
+    for finding in findings:
+        digest = claim_hash(finding["claim"])
+        for url in finding.get("sources", []):
+            source = by_url.get(url)
+            if source is None or (digest, url) in checks:
+                continue
+            if max_checks > 0 and len(checks) >= max_checks:
+                return checks
+            checks[(digest, url)] = ClaimCheck(finding["claim"], finding.get("evidence", ""), source)
+    return checks
+
+
+def _cap_confidence(confidence: str, ceiling: str) -> str:
+    if CONFIDENCE_ORDER.index(confidence) > CONFIDENCE_ORDER.index(ceiling):
+        return ceiling
+    return confidence
+
+
+def _finding_status(verdicts: List[str]) -> str:
+    if not verdicts:
+        return "unverified"
+    for status in ("supported", "partial", "unsupported"):
+        if status in verdicts:
+            return status
+    return "unclear"
+
+
+def apply_verdicts(
+    findings: List[Dict[str, Any]],
+    verdicts: Dict[CheckKey, Verdict],
+    drop_unsupported: bool,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Annotate findings with a verification status and adjust confidence.
+
+    A finding counts as supported if any cited source supports it. Partial or
+    unclear support caps confidence at medium; no support sets it to low (or
+    drops the finding). Unverified findings are left as they are.
+    """
+    kept: List[Dict[str, Any]] = []
+    stats = {"downgraded": 0, "dropped": 0}
+    for finding in findings:
+        digest = claim_hash(finding["claim"])
+        found = [
+            verdicts[(digest, url)].verdict
+            for url in finding.get("sources", [])
+            if (digest, url) in verdicts
+        ]
+        status = _finding_status(found)
+        stats[status] = stats.get(status, 0) + 1
+        confidence = finding.get("confidence", "low")
+        if confidence not in CONFIDENCE_ORDER:
+            confidence = "low"
+        if status == "unsupported":
+            if drop_unsupported:
+                stats["dropped"] += 1
+                continue
+            adjusted = "low"
+        elif status in ("partial", "unclear"):
+            adjusted = _cap_confidence(confidence, "medium")
+        else:
+            adjusted = confidence
+        if adjusted != confidence:
+            stats["downgraded"] += 1
+        kept.append({**finding, "confidence": adjusted, "verification": status})
+    return kept, stats
+
+
+async def verify_findings(
+    parsed: Dict[str, Any],
+    verifier: ClaimVerifier,
+    cache: Optional[VerdictCache],
+    model_id: str,
+    budget: StageBudget,
+    blocking: BlockingCalls,
+    max_checks: int,
+    drop_unsupported: bool,
+    timeout: Optional[float],
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Verify research findings; returns the updated research data and a summary."""
+    started = time.perf_counter()
+    checks = plan_checks(parsed.get("findings", []), parsed.get("sources", []), max_checks)
+    cached: Dict[CheckKey, Verdict] = {}
+    if cache is not None:
+        cached = await blocking.run(cache.get_many, list(checks), model_id)
+    pending = {key: check for key, check in checks.items() if key not in cached}
+
+    cut_off: Optional[str] = None
+    if pending:
+        try:
+            await budget.run(verifier.check_all(pending), timeout)
+        except BudgetExceededError as exc:
+            cut_off = exc.reason
+    fresh = dict(verifier.results)
+    if cache is not None:
+        await blocking.run(cache.put_many, fresh, model_id)
+
+    findings, stats = apply_verdicts(
+        parsed.get("findings", []), {**cached, **fresh}, drop_unsupported
+    )
+    summary = {
+        "model": model_id,
+        "checks": len(checks),
+        "cache_hits": len(cached),
+        "model_calls": len(fresh) + verifier.errors,
+        "errors": verifier.errors,
+        "unchecked": len(pending) - len(fresh) - verifier.errors,
+        "pages": verifier.page_stats(),
+        "cut_off": cut_off,
+        "findings": stats,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    return {**parsed, "findings": findings}, summary